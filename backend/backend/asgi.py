@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+# Serve the read API from the async views (content/async_views.py).
+os.environ.setdefault("DJANGO_ROOT_URLCONF", "backend.asgi_urls")
 
 application = get_asgi_application()
@@ -0,0 +1,27 @@
+"""
+URL configuration used under ASGI (see ``backend/asgi.py``).
+
+Same routes as ``backend.urls``, with the read API served by the async views
+in ``content.async_views``.
+"""
+from django.conf import settings
+from django.conf.urls.static import static
+from django.contrib import admin
+from django.urls import include, path
+
+from content.async_views import AsyncPortfolioContentView
+from content.views import metrics_view
+
+urlpatterns = [
+    path("admin/", admin.site.urls),
+    path(
+        "api/portfolio/",
+        AsyncPortfolioContentView.as_view(),
+        name="portfolio-content",
+    ),
+    path("metrics", metrics_view, name="metrics"),
+    path("api/", include("content.async_urls")),
+]
+
+if settings.DEBUG:
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
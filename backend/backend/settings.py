@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,17 +44,19 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "content.instrumentation.RequestInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "content.profiling.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
-ROOT_URLCONF = "backend.urls"
+ROOT_URLCONF = os.environ.get("DJANGO_ROOT_URLCONF", "backend.urls")
 
 TEMPLATES = [
     {
@@ -83,6 +86,70 @@ DATABASES = {
     }
 }
 
+# Applied to every new SQLite connection by content.db.configure_sqlite.
+# WAL lets readers in other gunicorn workers proceed while a contact message
+# is written; cache_size is in KiB when negative.
+SQLITE_PRODUCTION_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -32000,
+    "temp_store": "MEMORY",
+}
+SQLITE_PRAGMAS = {}
+
+# Retries for writes made through content.writes.serialized_write when another
+# process holds the SQLite write lock: exponential backoff with full jitter.
+DATABASE_WRITE_ATTEMPTS = 5
+DATABASE_WRITE_BACKOFF = 0.05
+DATABASE_WRITE_BACKOFF_MAX = 1.0
+
+DATABASE_PROFILE = os.environ.get("DJANGO_DATABASE_PROFILE", "default")
+if DATABASE_PROFILE == "production":
+    SQLITE_PRAGMAS = SQLITE_PRODUCTION_PRAGMAS
+    DATABASES["default"].update(
+        {
+            "CONN_MAX_AGE": int(os.environ.get("DJANGO_CONN_MAX_AGE", "600")),
+            "CONN_HEALTH_CHECKS": True,
+            # Take the write lock up front so busy_timeout applies instead of
+            # a deferred transaction failing on lock upgrade.
+            "OPTIONS": {"transaction_mode": "IMMEDIATE"},
+        }
+    )
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# "file" (the default) and "redis" are shared by every gunicorn worker, so
+# snapshot invalidations and the contact rate-limit log reach all of them.
+# locmem is per process: only for a single process such as runserver.
+# "redis" needs the `redis` package.
+
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+CACHE_BACKEND = os.environ.get("DJANGO_CACHE_BACKEND", "file")
+CACHE_DEFAULT_LOCATIONS = {
+    "locmem": "portfolio",
+    "file": str(BASE_DIR / "cache"),
+    "redis": "redis://127.0.0.1:6379/1",
+}
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        "LOCATION": os.environ.get(
+            "DJANGO_CACHE_LOCATION", CACHE_DEFAULT_LOCATIONS[CACHE_BACKEND]
+        ),
+        "KEY_PREFIX": "ananthu",
+        "TIMEOUT": 60 * 60 * 24 * 7,
+        "OPTIONS": {"MAX_ENTRIES": 5000} if CACHE_BACKEND != "redis" else {},
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -124,6 +191,19 @@ STATIC_ROOT = BASE_DIR / "static"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Uploads are stored under the hash of their content (content/storage.py), so
+# /media/ URLs never change meaning and nginx can cache them for a year.
+STORAGES = {
+    "default": {"BACKEND": "content.storage.ContentAddressedStorage"},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+    },
+}
+# Internal nginx location aliasing MEDIA_ROOT (see deploy/nginx.conf). When
+# set, downloads such as resumes are handed to nginx with X-Accel-Redirect;
+# unset, Django streams them itself.
+MEDIA_ACCEL_REDIRECT_PREFIX = os.environ.get("DJANGO_MEDIA_ACCEL_PREFIX") or None
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -136,6 +216,109 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
+    # Opt-in: lists are only paginated when ?limit= or ?cursor= is given.
+    "DEFAULT_PAGINATION_CLASS": "content.pagination.KeysetPagination",
 }
 
 CORS_ALLOW_ALL_ORIGINS = True
+
+# "fast" renders read endpoints from .values() (content/fast_serializers.py);
+# "drf" falls back to the ModelSerializers.
+CONTENT_SERIALIZER_ENGINE = os.environ.get("CONTENT_SERIALIZER_ENGINE", "fast")
+
+# Contact form limiter: CacheSlidingWindowLimiter keeps a per-IP log in the
+# shared cache; DatabaseRateLimiter counts stored messages on every request and
+# so needs CONTACT_INGESTION=sync (spooled messages are stored too late).
+# The cache limiter relies on the shared cache backend above.
+CONTACT_RATE_LIMITER = os.environ.get(
+    "CONTACT_RATE_LIMITER", "content.ratelimit.CacheSlidingWindowLimiter"
+)
+# Held while a cache limiter reads, checks and rewrites a log (all workers on
+# one host lock the same file).
+RATE_LIMIT_LOCK_FILE = BASE_DIR / "cache" / "ratelimit.lock"
+
+# "sync" writes contact submissions in the request; "spool" queues them on disk
+# for `manage.py process_contact_spool` to insert in batches and mail as a
+# digest, so it is only set where that worker runs (deploy/gunicorn.service).
+CONTACT_INGESTION = os.environ.get("CONTACT_INGESTION", "sync")
+CONTACT_SPOOL_DIR = BASE_DIR / "spool" / "contact"
+CONTACT_NOTIFICATION_EMAILS = [
+    address.strip()
+    for address in os.environ.get("CONTACT_NOTIFICATION_EMAILS", "").split(",")
+    if address.strip()
+]
+EMAIL_BACKEND = os.environ.get(
+    "DJANGO_EMAIL_BACKEND", "django.core.mail.backends.console.EmailBackend"
+)
+DEFAULT_FROM_EMAIL = os.environ.get(
+    "DJANGO_DEFAULT_FROM_EMAIL", "hello@ananthu.online"
+)
+
+# Static publish of the /api/portfolio/ payload (see build_portfolio_snapshot).
+# PORTFOLIO_PUBLIC_URL is the origin of the absolute media URLs in the cached
+# and published payload. Unset, requests use the host they came in on, and
+# publishing or warming the cache (no request) refuses to run.
+PORTFOLIO_PUBLIC_URL = os.environ.get("PORTFOLIO_PUBLIC_URL") or None
+PORTFOLIO_SNAPSHOT_ROOT = STATIC_ROOT / "api"
+PORTFOLIO_SNAPSHOT_AUTOPUBLISH = (
+    os.environ.get("PORTFOLIO_SNAPSHOT_AUTOPUBLISH", "False").lower() == "true"
+)
+
+# Request instrumentation (content/instrumentation.py): Server-Timing header for
+# local connections and signed-in staff, and one JSON line per request on the
+# "content.requests" logger for everyone.
+SERVER_TIMING_HEADER = (
+    os.environ.get("DJANGO_SERVER_TIMING", "True").lower() == "true"
+)
+
+# Operational metrics (content/metrics.py) served at /metrics. Point
+# DJANGO_METRICS_DIR at a directory shared by the gunicorn workers and the
+# contact worker to aggregate them; unset, each process reports its own.
+METRICS_DIR = os.environ.get("DJANGO_METRICS_DIR") or None
+METRICS_FLUSH_INTERVAL = 1.0
+
+# Staff-only request profiling (content/profiling.py): ?profile=1 on a GET to
+# the API returns a cProfile report. Limits are per PROFILING_WINDOW seconds.
+PROFILING_ENABLED = os.environ.get("DJANGO_PROFILING", "True").lower() == "true"
+PROFILING_DIR = os.environ.get("DJANGO_PROFILING_DIR") or None
+PROFILING_USER_LIMIT = int(os.environ.get("DJANGO_PROFILING_USER_LIMIT", "5"))
+PROFILING_SITE_LIMIT = int(os.environ.get("DJANGO_PROFILING_SITE_LIMIT", "20"))
+PROFILING_WINDOW = 3600
+
+# Slow-query log (content/slowlog.py): queries over SLOW_QUERY_MS are written
+# with their EXPLAIN plan to SLOW_QUERY_LOG; 0 turns the wrapper off. The file
+# is shared by every worker and rotated by logrotate, not by the handler.
+SLOW_QUERY_MS = float(os.environ.get("DJANGO_SLOW_QUERY_MS", "100"))
+SLOW_QUERY_LOG = os.environ.get("DJANGO_SLOW_QUERY_LOG") or str(
+    BASE_DIR / "logs" / "slow-queries.log"
+)
+# Bound parameters hold emails, session keys and password hashes; by default
+# only their type and length are logged.
+SLOW_QUERY_LOG_PARAMS = (
+    os.environ.get("DJANGO_SLOW_QUERY_LOG_PARAMS", "False").lower() == "true"
+)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+        "slow_queries": {
+            "class": "content.slowlog.SlowQueryFileHandler",
+            "filename": SLOW_QUERY_LOG,
+            "delay": True,
+        },
+    },
+    "loggers": {
+        "content.requests": {
+            "handlers": ["console"],
+            "level": os.environ.get("DJANGO_REQUEST_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+        "content.slow_queries": {
+            "handlers": ["slow_queries"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+    },
+}
@@ -19,11 +19,12 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
-from content.views import PortfolioContentAPIView
+from content.views import PortfolioContentAPIView, metrics_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/portfolio/", PortfolioContentAPIView.as_view(), name="portfolio-content"),
+    path("metrics", metrics_view, name="metrics"),
     path("api/", include("content.urls")),
 ]
 
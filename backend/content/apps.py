@@ -1,6 +1,25 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class ContentConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "content"
+
+    def ready(self):
+        from . import db, instrumentation, ratelimit, signals, slowlog  # noqa: F401
+
+        # Fail at startup rather than on the first contact submission.
+        ratelimit.get_contact_rate_limiter_class()
+
+        connection_created.connect(
+            db.configure_sqlite, dispatch_uid="content.db.configure_sqlite"
+        )
+        connection_created.connect(
+            instrumentation.install_query_recorder,
+            dispatch_uid="content.instrumentation.install_query_recorder",
+        )
+        connection_created.connect(
+            slowlog.install_slow_query_log,
+            dispatch_uid="content.slowlog.install_slow_query_log",
+        )
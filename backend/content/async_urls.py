@@ -0,0 +1,68 @@
+from django.urls import path
+
+from . import async_views, serializers, views
+from .urls import router
+
+urlpatterns = [
+    # The DefaultRouter's browsable root, which the sync urls get for free.
+    path("", router.get_api_root_view(), name="api-root"),
+    path(
+        "site-settings/",
+        async_views.AsyncSectionView.as_view(
+            section="site", serializer_class=serializers.SiteSettingsSerializer
+        ),
+        name="site-settings",
+    ),
+    path(
+        "about/",
+        async_views.AsyncSectionView.as_view(
+            section="about", serializer_class=serializers.AboutSectionSerializer
+        ),
+        name="about",
+    ),
+    path(
+        "footer/",
+        async_views.AsyncSectionView.as_view(
+            section="footer", serializer_class=serializers.FooterSerializer
+        ),
+        name="footer",
+    ),
+    path(
+        "contact-messages/",
+        views.ContactMessageAPIView.as_view(),
+        name="contact-messages",
+    ),
+    path(
+        "resumes/<str:resume_type>/download/",
+        views.ResumeDownloadView.as_view(),
+        name="resume-download-latest",
+    ),
+    path(
+        "resumes/<str:resume_type>/download/<str:digest>/",
+        views.ResumeDownloadView.as_view(),
+        name="resume-download",
+    ),
+    path(
+        "projects/<int:pk>/gallery/",
+        async_views.AsyncProjectGalleryView.as_view(),
+        name="projects-gallery",
+    ),
+]
+
+for prefix, (section, viewset) in async_views.RESOURCES.items():
+    urlpatterns += [
+        path(
+            f"{prefix}/",
+            async_views.AsyncSectionView.as_view(
+                section=section, viewset=viewset
+            ),
+            name=f"{prefix}-list",
+        ),
+        path(
+            f"{prefix}/<int:pk>/",
+            async_views.AsyncDetailView.as_view(
+                section=section, viewset=viewset
+            ),
+            name=f"{prefix}-detail",
+        ),
+    ]
@@ -0,0 +1,166 @@
+"""
+Async read API served when the project runs under ASGI.
+
+Responses are identical to the DRF views when the request's Host matches
+``PORTFOLIO_PUBLIC_URL`` (or it is unset): cached list fragments build media
+URLs from that setting rather than from the Host header. Pages and details
+are rendered by the sync viewset's serializers under the same
+``CONTENT_SERIALIZER_ENGINE``.
+Cache hits (the common case) are served entirely on the event loop through
+the async cache API; only cache misses and the validator query hop to a
+worker thread.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views import View
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import JSONRenderer
+
+from . import (
+    compression,
+    fast_serializers,
+    models,
+    serializers,
+    snapshots,
+    viewsets,
+)
+from .conditional import aconditional_response, set_validators
+from .pagination import KeysetPagination
+
+
+def _json_response(data, status=200):
+    return HttpResponse(
+        JSONRenderer().render(data), content_type="application/json", status=status
+    )
+
+
+class AsyncPortfolioContentView(View):
+    async def get(self, request):
+        try:
+            sections = snapshots.parse_sections(request.GET.get("sections"))
+        except ValueError as exc:
+            return _json_response({"detail": str(exc)}, status=400)
+        not_modified, etag, last_modified = await aconditional_response(
+            request, snapshots.get_models_for_sections(sections)
+        )
+        if not_modified is not None:
+            return set_validators(
+                not_modified, etag, last_modified, vary=compression.VARY
+            )
+        variants = await snapshots.aget_portfolio_variants(sections, request)
+        response = compression.encoded_response(request, variants)
+        return set_validators(response, etag, last_modified)
+
+
+def _serializer(fast_serializer, serializer_class):
+    """``serialize(rows, request)`` under the engine the sync viewsets use."""
+
+    def serialize(rows, request):
+        return viewsets.serialize_many(rows, request, fast_serializer, serializer_class)
+
+    return serialize
+
+
+def _viewset_serializer(viewset):
+    return _serializer(viewset.fast_serializer, viewset.serializer_class)
+
+
+async def _paginated_response(request, queryset, serialize):
+    """Build a keyset page in a worker thread; pages bypass the fragment cache."""
+    paginator = KeysetPagination()
+
+    def build():
+        page = paginator.paginate_queryset(queryset, request)
+        return paginator.get_paginated_data(serialize(page, request))
+
+    try:
+        return _json_response(await sync_to_async(build)())
+    except NotFound as exc:
+        return _json_response({"detail": exc.detail}, status=404)
+
+
+class AsyncSectionView(View):
+    """List or singleton endpoint backed by the cached section fragment."""
+
+    section = None
+    # Lists only: the sync viewset whose queryset and serializers pages use.
+    viewset = None
+    # Singletons only: its empty output stands in for a missing row, as in DRF.
+    serializer_class = None
+
+    async def get(self, request):
+        not_modified, etag, last_modified = await aconditional_response(
+            request, snapshots.SECTIONS[self.section]
+        )
+        if not_modified is not None:
+            return set_validators(not_modified, etag, last_modified)
+        if self.viewset is not None and KeysetPagination().is_requested(request):
+            response = await _paginated_response(
+                request,
+                self.viewset.queryset.all(),
+                _viewset_serializer(self.viewset),
+            )
+            return set_validators(response, etag, last_modified)
+        fragment = await snapshots.aget_section_fragment(self.section, request)
+        if fragment == b"null" and self.serializer_class is not None:
+            fragment = JSONRenderer().render(self.serializer_class(None).data)
+        response = HttpResponse(fragment, content_type="application/json")
+        return set_validators(response, etag, last_modified)
+
+
+class AsyncDetailView(View):
+    section = None
+    viewset = None
+
+    async def get(self, request, pk):
+        not_modified, etag, last_modified = await aconditional_response(
+            request, snapshots.SECTIONS[self.section]
+        )
+        if not_modified is not None:
+            return set_validators(not_modified, etag, last_modified)
+        queryset = self.viewset.queryset.filter(pk=pk)
+        serialize = _viewset_serializer(self.viewset)
+        # One query: a separate existence check could race a delete.
+        rows = await sync_to_async(serialize)(queryset, request)
+        if not rows:
+            name = queryset.model._meta.object_name
+            return _json_response(
+                {"detail": f"No {name} matches the given query."}, status=404
+            )
+        return set_validators(_json_response(rows[0]), etag, last_modified)
+
+
+class AsyncProjectGalleryView(View):
+    async def get(self, request, pk):
+        not_modified, etag, last_modified = await aconditional_response(
+            request, snapshots.SECTIONS["projects"]
+        )
+        if not_modified is not None:
+            return set_validators(not_modified, etag, last_modified)
+        if not await models.Project.objects.filter(pk=pk).aexists():
+            return _json_response(
+                {"detail": "No Project matches the given query."}, status=404
+            )
+        queryset = models.ProjectImage.objects.filter(project_id=pk)
+        serialize = _serializer(
+            fast_serializers.serialize_project_images,
+            serializers.ProjectImageSerializer,
+        )
+        if KeysetPagination().is_requested(request):
+            response = await _paginated_response(request, queryset, serialize)
+        else:
+            rows = await sync_to_async(serialize)(queryset, request)
+            response = _json_response(rows)
+        return set_validators(response, etag, last_modified)
+
+
+# Router resource -> (section, viewset), mirroring content/urls.py.
+RESOURCES = {
+    "navigation": ("navigation", viewsets.NavigationLinkViewSet),
+    "projects": ("projects", viewsets.ProjectViewSet),
+    "skills": ("skills", viewsets.SkillCategoryViewSet),
+    "testimonials": ("testimonials", viewsets.TestimonialViewSet),
+    "social": ("social_links", viewsets.SocialLinkViewSet),
+    "resumes": ("resumes", viewsets.ResumeViewSet),
+}
@@ -0,0 +1,8 @@
+"""
+In-process benchmarks for the content API.
+
+``dataset`` seeds synthetic content of a configurable size and ``api`` drives
+every endpoint through the Django test client against an isolated database,
+reporting latency percentiles, queries per request and serialization time as
+JSON (see ``manage.py benchmark_api``).
+"""
@@ -0,0 +1,259 @@
+import contextlib
+import logging
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, RequestFactory, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from content import snapshots
+from content.urls import router
+
+from .dataset import seed_dataset
+
+PERCENTILES = (50, 90, 95, 99)
+SINGLETON_URL_NAMES = ("site-settings", "about", "footer")
+
+
+@contextlib.contextmanager
+def isolated_database(path=None):
+    """
+    Run against a throwaway SQLite file (or ``path``) created like the test
+    runner does, so benchmarks never touch real content or media. ``path`` is
+    deleted afterwards, so it must not exist yet.
+    """
+    directory = None
+    if path is not None and os.path.exists(path):
+        raise FileExistsError(
+            f"{path} already exists; the benchmark database is created and "
+            "deleted, so point it at a new file."
+        )
+    if path is None:
+        directory = tempfile.mkdtemp(prefix="content-benchmark-")
+        path = os.path.join(directory, "benchmark.sqlite3")
+    old_name = connection.settings_dict["NAME"]
+    connection.settings_dict.setdefault("TEST", {})["NAME"] = str(path)
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield path
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        if directory:
+            # WAL mode leaves -wal/-shm siblings next to the database file.
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def _silenced(logger_name):
+    logger = logging.getLogger(logger_name)
+    disabled, logger.disabled = logger.disabled, True
+    try:
+        yield
+    finally:
+        logger.disabled = disabled
+
+
+@contextlib.contextmanager
+def isolated_environment():
+    """
+    Private locmem cache, spool and metrics so shared production state is
+    untouched, without a request log line per benchmarked request or
+    slow-query log entries for the throwaway database.
+    """
+    with _silenced("content.requests"), tempfile.TemporaryDirectory(
+        prefix="content-benchmark-spool-"
+    ) as spool_dir:
+        with override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                    "LOCATION": "content-benchmark",
+                }
+            },
+            CONTACT_SPOOL_DIR=spool_dir,
+            METRICS_DIR=None,
+            SLOW_QUERY_MS=0,
+        ):
+            yield
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+def summarize(samples) -> dict:
+    ordered = sorted(samples)
+    summary = {
+        "count": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "min": ordered[0],
+        "max": ordered[-1],
+    }
+    for percentile in PERCENTILES:
+        index = min(len(ordered) - 1, round(percentile / 100 * (len(ordered) - 1)))
+        summary[f"p{percentile}"] = ordered[index]
+    return summary
+
+
+def get_endpoints() -> dict:
+    """Name -> URL for the aggregate, every router route and the singletons."""
+    endpoints = {"portfolio-content": reverse("portfolio-content")}
+    for _, viewset, basename in router.registry:
+        endpoints[f"{basename}-list"] = reverse(f"{basename}-list")
+        pk = viewset.queryset.order_by("pk").values_list("pk", flat=True).first()
+        if pk is not None:
+            endpoints[f"{basename}-detail"] = reverse(
+                f"{basename}-detail", kwargs={"pk": pk}
+            )
+    for name in SINGLETON_URL_NAMES:
+        endpoints[name] = reverse(name)
+    return endpoints
+
+
+def _measure(client, method, url, requests, cold, data_factory=None) -> dict:
+    latencies, queries, db_time, statuses, sizes = [], [], [], {}, []
+    for index in range(requests):
+        if cold:
+            cache.clear()
+        counter = QueryCounter()
+        kwargs = data_factory(index) if data_factory else {}
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            response = getattr(client, method)(url, **kwargs)
+            latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(counter.count)
+        db_time.append(counter.duration * 1000)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        sizes.append(len(response.content))
+    return {
+        "latency_ms": summarize(latencies),
+        "queries": summarize(queries),
+        "db_time_ms": summarize(db_time),
+        "status_codes": {str(code): count for code, count in statuses.items()},
+        "bytes": summarize(sizes),
+    }
+
+
+def measure_serialization(repeat) -> dict:
+    """Time building and rendering each aggregate section, bypassing caches."""
+    request = RequestFactory().get("/api/portfolio/")
+    renderer = JSONRenderer()
+    results = {}
+    for engine in ("drf", "fast"):
+        results[engine] = {}
+        for name in snapshots.SECTIONS:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                payload = snapshots.build_portfolio_payload(
+                    request, engine=engine, sections=[name]
+                )
+                renderer.render(payload)
+                timings.append((time.perf_counter() - start) * 1000)
+            results[engine][name] = summarize(timings)
+    return results
+
+
+def differing_sections() -> list:
+    """Sections the drf and fast engines render differently."""
+    request = RequestFactory().get("/api/portfolio/")
+    renderer = JSONRenderer()
+    differing = []
+    for name in snapshots.SECTIONS:
+        drf, fast = (
+            renderer.render(
+                snapshots.build_portfolio_payload(
+                    request, engine=engine, sections=[name]
+                )
+            )
+            for engine in ("drf", "fast")
+        )
+        if drf != fast:
+            differing.append(name)
+    return differing
+
+
+def run_api_benchmark(
+    projects=100,
+    contact_messages=1000,
+    requests=50,
+    modes=("warm", "cold"),
+    db_path=None,
+) -> dict:
+    with isolated_environment(), isolated_database(db_path):
+        dataset = seed_dataset(projects=projects, contact_messages=contact_messages)
+        client = Client()
+        endpoints = get_endpoints()
+        results = {}
+        for mode in modes:
+            cold = mode == "cold"
+            results[mode] = {}
+            for name, url in endpoints.items():
+                if not cold:
+                    client.get(url)
+                results[mode][name] = _measure(client, "get", url, requests, cold)
+            results[mode]["contact-messages"] = _measure(
+                client,
+                "post",
+                reverse("contact-messages"),
+                requests,
+                cold,
+                data_factory=lambda index: {
+                    "data": {
+                        "name": "Benchmark",
+                        "email": "benchmark@example.com",
+                        "project": "Load test",
+                        "message": "Hello from the benchmark.",
+                    },
+                    "REMOTE_ADDR": f"192.0.{index // 256 % 256}.{index % 256}",
+                },
+            )
+        serialization = measure_serialization(max(requests // 5, 3))
+
+    return {
+        "meta": {
+            "created_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "serializer_engine": settings.CONTENT_SERIALIZER_ENGINE,
+            "contact_ingestion": settings.CONTACT_INGESTION,
+            "requests_per_endpoint": requests,
+            "dataset": dataset,
+        },
+        "endpoints": results,
+        "serialization_ms": serialization,
+    }
+
+
+def compare(baseline: dict, current: dict, metric="p95") -> list:
+    """Rows of ``(mode, endpoint, baseline, current, change)`` for latency."""
+    rows = []
+    for mode, endpoints in current["endpoints"].items():
+        for name, result in endpoints.items():
+            before = baseline.get("endpoints", {}).get(mode, {}).get(name)
+            if before is None:
+                continue
+            old = before["latency_ms"][metric]
+            new = result["latency_ms"][metric]
+            rows.append((mode, name, old, new, (new - old) / old if old else 0.0))
+    return rows
@@ -0,0 +1,222 @@
+import datetime
+import io
+import random
+import zlib
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageDraw
+
+from content import models
+
+TECH_NAMES = (
+    "React",
+    "Django",
+    "PostgreSQL",
+    "Redis",
+    "Three.js",
+    "TypeScript",
+    "Rust",
+    "Kubernetes",
+    "GraphQL",
+    "Tailwind CSS",
+)
+
+# Marks the projects, skill categories (subtitle) and testimonials
+# (author_role) seed_collections creates.
+SYNTHETIC_SUBTITLE = "Synthetic"
+
+
+def _placeholder_name(kind, index) -> str:
+    extension = "png" if kind == "skill" else "jpg"
+    return f"synthetic/{kind}-{index}.{extension}"
+
+
+def generate_image(index, size=(1200, 800)) -> bytes:
+    """A deterministic gradient JPEG, so seeding never needs the network."""
+    rng = random.Random(index)
+    start = tuple(rng.randrange(256) for _ in range(3))
+    end = tuple(rng.randrange(256) for _ in range(3))
+    width, height = size
+    image = Image.new("RGB", size)
+    draw = ImageDraw.Draw(image)
+    for x in range(width):
+        ratio = x / max(width - 1, 1)
+        color = tuple(round(a + (b - a) * ratio) for a, b in zip(start, end))
+        draw.line([(x, 0), (x, height)], fill=color)
+    draw.ellipse(
+        [width // 4, height // 4, width * 3 // 4, height * 3 // 4],
+        outline=(255, 255, 255),
+        width=max(width // 100, 1),
+    )
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def write_image_pool(count, size=(1200, 800), prefix="synthetic") -> list:
+    """Save ``count`` generated images to media storage; returns their names."""
+    return [
+        default_storage.save(
+            f"{prefix}/synthetic-{index}.jpg",
+            ContentFile(generate_image(index, size)),
+        )
+        for index in range(count)
+    ]
+
+
+def pool_image_names(pool):
+    """``image_name`` callback cycling through names from ``write_image_pool``."""
+    def image_name(kind, index):
+        return pool[zlib.crc32(f"{kind}-{index}".encode()) % len(pool)]
+
+    return image_name
+
+
+def seed_singletons() -> None:
+    models.SiteSettings.objects.create(
+        brand_name="benchmark", hero_description="Synthetic hero copy. " * 10
+    )
+    about = models.AboutSection.objects.create(
+        heading="About", description="Synthetic about copy. " * 20
+    )
+    models.AboutHighlight.objects.bulk_create(
+        models.AboutHighlight(
+            section=about,
+            title=f"Highlight {order}",
+            description="Synthetic highlight",
+            icon_name="Zap",
+            order=order,
+        )
+        for order in range(4)
+    )
+    models.Footer.objects.create(text="Benchmark footer", tagline="Synthetic")
+    models.NavigationLink.objects.bulk_create(
+        models.NavigationLink(label=f"Link {order}", target=f"s{order}", order=order)
+        for order in range(6)
+    )
+    models.SocialLink.objects.bulk_create(
+        models.SocialLink(
+            label=f"Social {order}",
+            url=f"https://example.com/{order}",
+            icon_name="Github",
+            order=order,
+        )
+        for order in range(4)
+    )
+    models.Resume.objects.bulk_create(
+        models.Resume(resume_type=resume_type, file=f"resumes/{resume_type}.pdf")
+        for resume_type, _ in models.Resume.TYPE_CHOICES
+    )
+
+
+def seed_collections(
+    projects=100,
+    contact_messages=0,
+    gallery_size=3,
+    skills_per_category=20,
+    image_name=_placeholder_name,
+) -> dict:
+    """
+    Bulk-create projects (with tech and galleries), skills, testimonials and
+    contact messages sized around ``projects``.
+
+    ``image_name(kind, index)`` returns the storage name for each image
+    field; by default names are synthetic and no files exist. Contact
+    messages are spread over the last 48 hours, five per IP. Returns the
+    number of rows created per model.
+    """
+    offset = models.Project.objects.count()
+    project_rows = models.Project.objects.bulk_create(
+        models.Project(
+            title=f"Synthetic project {offset + index}",
+            subtitle=SYNTHETIC_SUBTITLE,
+            description="Lorem ipsum dolor sit amet. " * 20,
+            cover_image=image_name("project", index),
+            order=offset + index,
+        )
+        for index in range(projects)
+    )
+    tech = models.ProjectTech.objects.bulk_create(
+        models.ProjectTech(project=project, name=name, order=order)
+        for project in project_rows
+        for order, name in enumerate(TECH_NAMES[:5])
+    )
+    gallery = models.ProjectImage.objects.bulk_create(
+        models.ProjectImage(
+            project=project,
+            image=image_name("gallery", project.pk * gallery_size + index),
+            caption=f"Gallery image {index}",
+        )
+        for project in project_rows
+        for index in range(gallery_size)
+    )
+    offset = models.SkillCategory.objects.count()
+    categories = models.SkillCategory.objects.bulk_create(
+        models.SkillCategory(
+            title=f"Category {offset + index}",
+            subtitle=SYNTHETIC_SUBTITLE,
+            order=offset + index,
+        )
+        for index in range(max(projects // 20, 1))
+    )
+    skills = models.SkillItem.objects.bulk_create(
+        models.SkillItem(
+            category=category,
+            name=f"Skill {order}",
+            description="Synthetic skill description.",
+            logo=image_name("skill", category.pk * skills_per_category + order),
+            order=order,
+        )
+        for category in categories
+        for order in range(skills_per_category)
+    )
+    offset = models.Testimonial.objects.count()
+    testimonials = models.Testimonial.objects.bulk_create(
+        models.Testimonial(
+            author_name=f"Client {offset + index}",
+            author_role=SYNTHETIC_SUBTITLE,
+            quote="Great work. " * 10,
+            avatar=image_name("testimonial", index),
+            order=offset + index,
+        )
+        for index in range(projects)
+    )
+    messages = models.ContactMessage.objects.bulk_create(
+        models.ContactMessage(
+            name=f"Visitor {index}",
+            email=f"visitor{index}@example.com",
+            project="Synthetic enquiry",
+            message="Hello! " * 20,
+            ip_address=f"10.{index // 5 // 65536 % 256}."
+            f"{index // 5 // 256 % 256}.{index // 5 % 256}",
+        )
+        for index in range(contact_messages)
+    )
+    if messages:
+        # auto_now_add stamps "now"; spread them so windowed queries have work to do.
+        now = timezone.now()
+        rng = random.Random(contact_messages)
+        for message in messages:
+            message.created_at = now - datetime.timedelta(
+                seconds=rng.randrange(48 * 60 * 60)
+            )
+        models.ContactMessage.objects.bulk_update(
+            messages, ["created_at"], batch_size=500
+        )
+    return {
+        "projects": len(project_rows),
+        "project_tech": len(tech),
+        "project_images": len(gallery),
+        "skill_categories": len(categories),
+        "skill_items": len(skills),
+        "testimonials": len(testimonials),
+        "contact_messages": len(messages),
+    }
+
+
+def seed_dataset(projects=100, contact_messages=0) -> dict:
+    """Singletons plus ``seed_collections`` for a self-contained dataset."""
+    seed_singletons()
+    return seed_collections(projects=projects, contact_messages=contact_messages)
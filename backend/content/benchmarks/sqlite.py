@@ -0,0 +1,144 @@
+"""
+Concurrent read/write benchmark for the SQLite connection profiles.
+
+Reader processes stand in for gunicorn workers rebuilding the portfolio
+payload on a cache miss while writer processes insert contact messages into
+the same database file. Each profile runs against its own freshly seeded
+file because ``journal_mode`` persists in the database.
+"""
+
+import multiprocessing
+import time
+
+from django.conf import settings
+from django.db import OperationalError, connection, connections
+from django.test import override_settings
+
+from content import models, snapshots
+from content.conditional import get_content_state
+
+from .api import isolated_database, isolated_environment, summarize
+from .dataset import seed_dataset
+
+PROFILES = {
+    # Rollback journal, library defaults and a new connection per request.
+    "default": {"pragmas": {}, "persistent": False, "options": {}},
+    "production": {
+        "pragmas": settings.SQLITE_PRODUCTION_PRAGMAS,
+        "persistent": True,
+        "options": {"transaction_mode": "IMMEDIATE"},
+    },
+}
+
+
+def _configure(profile):
+    override_settings(SQLITE_PRAGMAS=profile["pragmas"]).enable()
+    connection.settings_dict["OPTIONS"] = dict(profile["options"])
+
+
+def _read_worker(profile, duration, results):
+    _configure(profile)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            get_content_state(snapshots.PORTFOLIO_MODELS)
+            snapshots.build_portfolio_payload(None, engine="fast")
+        except OperationalError:
+            errors += 1
+        else:
+            latencies.append((time.perf_counter() - start) * 1000)
+        if not profile["persistent"]:
+            connection.close()
+    results.put(("read", latencies, errors))
+
+
+def _write_worker(profile, duration, interval, worker, results):
+    _configure(profile)
+    latencies, errors, index = [], 0, 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            models.ContactMessage.objects.create(
+                name="Benchmark",
+                email="benchmark@example.com",
+                project="Load test",
+                message="Hello from the benchmark.",
+                ip_address=f"198.51.{worker}.{index % 256}",
+            )
+        except OperationalError:
+            errors += 1
+        else:
+            latencies.append((time.perf_counter() - start) * 1000)
+        index += 1
+        if not profile["persistent"]:
+            connection.close()
+        time.sleep(interval)
+    results.put(("write", latencies, errors))
+
+
+def _run_profile(profile, readers, writers, duration, interval) -> dict:
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    # Children must open their own connections, never share the parent's.
+    connections.close_all()
+    processes = [
+        context.Process(target=_read_worker, args=(profile, duration, results))
+        for _ in range(readers)
+    ] + [
+        context.Process(
+            target=_write_worker, args=(profile, duration, interval, worker, results)
+        )
+        for worker in range(writers)
+    ]
+    for process in processes:
+        process.start()
+    collected = {"read": ([], 0), "write": ([], 0)}
+    for _ in processes:
+        kind, latencies, errors = results.get()
+        samples, total_errors = collected[kind]
+        collected[kind] = (samples + latencies, total_errors + errors)
+    for process in processes:
+        process.join()
+
+    summary = {}
+    for kind, (latencies, errors) in collected.items():
+        summary[kind] = {
+            "ok": len(latencies),
+            "errors": errors,
+            "per_second": len(latencies) / duration,
+            "latency_ms": summarize(latencies) if latencies else None,
+        }
+    return summary
+
+
+def run_sqlite_benchmark(
+    projects=100,
+    readers=3,
+    writers=1,
+    duration=5.0,
+    write_interval=0.005,
+    profiles=tuple(PROFILES),
+) -> dict:
+    results = {}
+    for name in profiles:
+        with isolated_environment(), isolated_database():
+            with override_settings(SQLITE_PRAGMAS=PROFILES[name]["pragmas"]):
+                connection.close()  # Reopen with this profile's pragmas.
+                seed_dataset(projects=projects)
+                connections.close_all()
+                results[name] = _run_profile(
+                    PROFILES[name], readers, writers, duration, write_interval
+                )
+    return {
+        "meta": {
+            "projects": projects,
+            "readers": readers,
+            "writers": writers,
+            "duration_s": duration,
+            "write_interval_s": write_interval,
+        },
+        "profiles": results,
+    }
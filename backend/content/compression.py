@@ -0,0 +1,78 @@
+import gzip
+
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+IDENTITY = "identity"
+# Sent on every negotiated response, 304s included, even when only the
+# identity body exists: the next version of the payload may be compressed.
+VARY = ("Accept-Encoding",)
+MIN_COMPRESS_LENGTH = 200
+# Quality 11 costs hundreds of milliseconds on the full payload, too much for
+# a cache miss inside a request; it is kept for warmup and published files.
+BROTLI_QUALITY = 5
+BROTLI_QUALITY_BEST = 11
+
+
+def compress_variants(content: bytes, best=False) -> dict:
+    """
+    Return ``{encoding: body}`` for every encoding worth storing.
+
+    Called once when a response is cached so that serving it never
+    compresses again; ``best`` is for work done outside a request.
+    """
+    variants = {IDENTITY: content}
+    if len(content) < MIN_COMPRESS_LENGTH:
+        return variants
+    variants["gzip"] = gzip.compress(content, compresslevel=9, mtime=0)
+    if brotli is not None:
+        quality = BROTLI_QUALITY_BEST if best else BROTLI_QUALITY
+        variants["br"] = brotli.compress(content, quality=quality)
+    return variants
+
+
+def parse_accept_encoding(header: str) -> dict:
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate_encoding(request, variants: dict) -> str:
+    accepted = parse_accept_encoding(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = IDENTITY, 0.0
+    # Preference order on ties: smallest encoding first.
+    for encoding in ("br", "gzip"):
+        if encoding not in variants:
+            continue
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def encoded_response(request, variants: dict, content_type="application/json"):
+    encoding = negotiate_encoding(request, variants)
+    response = HttpResponse(variants[encoding], content_type=content_type)
+    if encoding != IDENTITY:
+        response.headers["Content-Encoding"] = encoding
+    patch_vary_headers(response, VARY)
+    return response
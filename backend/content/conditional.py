@@ -0,0 +1,136 @@
+import datetime
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
+from django.views.decorators.http import condition
+
+SAFE_METHODS = ("GET", "HEAD")
+
+
+def get_content_state(model_classes) -> tuple:
+    """
+    Return ``(count, max updated_at)`` for each model in one UNION ALL query.
+
+    Counts are part of the state so that deleting a row (which leaves
+    ``MAX(updated_at)`` untouched) still produces a new validator.
+    """
+    quote = connection.ops.quote_name
+    sql = " UNION ALL ".join(
+        "SELECT COUNT(*), MAX({column}) FROM {table}".format(
+            column=quote(model._meta.get_field("updated_at").column),
+            table=quote(model._meta.db_table),
+        )
+        for model in model_classes
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        rows = cursor.fetchall()
+    return tuple((count, _to_datetime(updated)) for count, updated in rows)
+
+
+def _to_datetime(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, datetime.timezone.utc)
+    return value
+
+
+def state_etag(request, state) -> str:
+    digest = hashlib.sha1(repr((request.build_absolute_uri(), state)).encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def state_last_modified(state):
+    timestamps = [updated for _, updated in state if updated]
+    return max(timestamps) if timestamps else None
+
+
+async def aconditional_response(request, model_classes):
+    """
+    Async counterpart of ``condition()`` for the async read views.
+
+    Returns ``(not_modified_response_or_None, etag, last_modified)``; pass
+    the latter two to ``set_validators`` on the real response.
+    """
+    state = await sync_to_async(get_content_state)(model_classes)
+    etag = state_etag(request, state)
+    last_modified = state_last_modified(state)
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    return response, etag, last_modified
+
+
+def set_validators(response, etag, last_modified, vary=()):
+    """
+    Add the validators to ``response``, and the ``Vary`` header fields the
+    full response would carry, which a 304 has to repeat (RFC 9110 15.4.5).
+    """
+    patch_vary_headers(response, vary)
+    response.headers.setdefault("ETag", etag)
+    if last_modified:
+        response.headers.setdefault(
+            "Last-Modified", http_date(last_modified.timestamp())
+        )
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Answer ``If-None-Match``/``If-Modified-Since`` before the view runs.
+
+    Views list the models their response is built from in
+    ``conditional_models`` (or override ``get_conditional_models``); the
+    validator is derived from their row counts and latest ``updated_at``.
+    """
+
+    conditional_models: tuple = ()
+    # Vary fields of the full response, repeated on a 304.
+    conditional_vary: tuple = ()
+
+    def get_conditional_models(self, request) -> tuple:
+        return self.conditional_models
+
+    def dispatch(self, request, *args, **kwargs):
+        view = condition(
+            etag_func=self._get_etag,
+            last_modified_func=self._get_last_modified,
+        )(super().dispatch)
+        response = view(request, *args, **kwargs)
+        if response.status_code == 304:
+            patch_vary_headers(response, self.conditional_vary)
+        return response
+
+    def _get_content_state(self, request):
+        if not hasattr(request, "_content_state"):
+            model_classes = self.get_conditional_models(request)
+            request._content_state = (
+                get_content_state(model_classes) if model_classes else None
+            )
+        return request._content_state
+
+    def _get_etag(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return None
+        state = self._get_content_state(request)
+        if state is None:
+            return None
+        return state_etag(request, state)
+
+    def _get_last_modified(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return None
+        state = self._get_content_state(request)
+        if state is None:
+            return None
+        return state_last_modified(state)
@@ -0,0 +1,173 @@
+"""
+File downloads that go through Django for their logic but not their bytes.
+
+Files are described once (``file_meta``: source name, SHA-256 and size) so
+download URLs can carry the content digest and be cached for a year. With
+``MEDIA_ACCEL_REDIRECT_PREFIX`` set, ``serve_file`` answers with an
+``X-Accel-Redirect`` and nginx sends the file (Range requests included);
+otherwise Django streams it, honouring a single byte range, which is enough
+for browsers' PDF viewers in development.
+"""
+
+import hashlib
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+
+CHUNK_SIZE = 64 * 1024
+DIGEST_LENGTH = 16
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class UnsatisfiableRange(ValueError):
+    pass
+
+
+def describe_file(fieldfile) -> dict:
+    digest = hashlib.sha256()
+    size = 0
+    with fieldfile.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return {"source": fieldfile.name, "sha256": digest.hexdigest(), "size": size}
+
+
+def refresh_file_meta(instance, field_name="file") -> dict:
+    """
+    Describe ``field_name`` again if its file changed since the last run.
+
+    Returns the ``<field>_meta`` values that changed so the caller can persist
+    them with ``QuerySet.update()``.
+    """
+    fieldfile = getattr(instance, field_name)
+    target = f"{field_name}_meta"
+    current = getattr(instance, target) or {}
+    name = fieldfile.name or ""
+    if current.get("source", "") == name:
+        return {}
+    meta = {}
+    if name:
+        try:
+            meta = describe_file(fieldfile)
+        except OSError:
+            meta = {"source": name}
+    setattr(instance, target, meta)
+    return {target: meta}
+
+
+def short_digest(meta):
+    sha256 = (meta or {}).get("sha256")
+    return sha256[:DIGEST_LENGTH] if sha256 else None
+
+
+def resume_url(resume_type, meta, request=None) -> str:
+    """Versioned download URL, or the redirecting one until the file is hashed."""
+    digest = short_digest(meta)
+    if digest:
+        url = reverse(
+            "resume-download", kwargs={"resume_type": resume_type, "digest": digest}
+        )
+    else:
+        url = reverse("resume-download-latest", kwargs={"resume_type": resume_type})
+    return request.build_absolute_uri(url) if request else url
+
+
+def parse_range(header, size):
+    """
+    ``(start, end)`` (inclusive) for a single ``bytes=`` range, ``None`` when
+    the header should be ignored and the whole file sent.
+    """
+    match = _RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first == "":
+        length = int(last)
+        if length == 0:
+            raise UnsatisfiableRange(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size:
+        raise UnsatisfiableRange(header)
+    if end < start:
+        return None
+    return start, end
+
+
+def is_first_request(request) -> bool:
+    """False for the follow-up Range requests a viewer makes mid-download."""
+    header = request.headers.get("Range", "")
+    return not header or header.replace(" ", "").startswith("bytes=0-")
+
+
+def _stream(fieldfile, start, length):
+    with fieldfile.open("rb") as handle:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def serve_file(request, fieldfile, meta, filename, content_type, cache_control):
+    etag = f'"{meta["sha256"]}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        response["ETag"] = etag
+        response["Cache-Control"] = cache_control
+        return response
+
+    disposition = f'inline; filename="{filename}"'
+    if settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        # nginx keeps Content-Type, Content-Disposition and Cache-Control from
+        # this response and handles Range itself.
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(
+            fieldfile.name
+        )
+    else:
+        response = _local_response(request, fieldfile, meta, etag, content_type)
+        response["Accept-Ranges"] = "bytes"
+        response["ETag"] = etag
+    response["Content-Disposition"] = disposition
+    response["Cache-Control"] = cache_control
+    return response
+
+
+def _local_response(request, fieldfile, meta, etag, content_type):
+    size = meta["size"]
+    header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if header and (if_range is None or if_range == etag):
+        try:
+            byte_range = parse_range(header, size)
+        except UnsatisfiableRange:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+        if byte_range is not None:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _stream(fieldfile, start, end - start + 1),
+                status=206,
+                content_type=content_type,
+            )
+            response["Content-Length"] = str(end - start + 1)
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+            return response
+    return FileResponse(
+        fieldfile.open("rb"),
+        content_type=content_type,
+        filename=posixpath.basename(fieldfile.name),
+    )
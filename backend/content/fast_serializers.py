@@ -0,0 +1,224 @@
+"""
+Read-only serialization built on ``.values()`` and plain dicts.
+
+Each function mirrors the matching serializer in ``serializers.py`` field for
+field and key for key, so the rendered JSON is byte-identical; they skip
+field construction, ``SerializerMethodField`` dispatch and model
+instantiation. Keep both in sync when a serializer changes.
+"""
+
+from collections import defaultdict
+
+from . import downloads, images, models
+
+
+def _file_url(model, field_name, name, request):
+    if not name:
+        return None
+    url = model._meta.get_field(field_name).storage.url(name)
+    return request.build_absolute_uri(url) if request else url
+
+
+def _image(row, model, field_name, request):
+    """Resolve ``field_name`` and its renditions in ``row`` in place."""
+    storage = model._meta.get_field(field_name).storage
+    renditions = row.pop(images.renditions_field(field_name))
+    row[field_name] = _file_url(model, field_name, row[field_name], request)
+    row[f"{field_name}_srcset"] = images.build_srcset(storage, renditions, request)
+    row[f"{field_name}_meta"] = images.build_meta(renditions)
+
+
+def _group_by(rows, key) -> dict:
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[row.pop(key)].append(row)
+    return grouped
+
+
+def _values(queryset, *fields):
+    return queryset.prefetch_related(None).values(*fields)
+
+
+def serialize_navigation_links(queryset=None, request=None) -> list:
+    if queryset is None:
+        queryset = models.NavigationLink.objects.all()
+    return list(_values(queryset, "label", "target", "is_external", "order"))
+
+
+SITE_SETTINGS_FIELDS = (
+    "brand_name",
+    "brand_subtitle",
+    "hero_heading",
+    "hero_highlight",
+    "hero_subheading",
+    "hero_description",
+    "primary_cta_label",
+    "primary_cta_action",
+    "primary_cta_target",
+    "secondary_cta_label",
+    "secondary_cta_action",
+    "secondary_cta_target",
+    "whatsapp_link",
+    "calendly_link",
+    "contact_email",
+    "contact_phone",
+)
+
+
+def serialize_site_settings(request=None):
+    return models.SiteSettings.objects.values(*SITE_SETTINGS_FIELDS).first()
+
+
+def serialize_about_section(request=None):
+    row = models.AboutSection.objects.values(
+        "id",
+        "heading",
+        "subtitle",
+        "description",
+        "highlight_quote",
+        "highlight_caption",
+        "profile_image",
+        "profile_image_renditions",
+    ).first()
+    if row is None:
+        return None
+    section_id = row.pop("id")
+    _image(row, models.AboutSection, "profile_image", request)
+    row["highlights"] = list(
+        models.AboutHighlight.objects.filter(section_id=section_id).values(
+            "title", "description", "icon_name", "order"
+        )
+    )
+    return row
+
+
+def serialize_skill_categories(queryset=None, request=None) -> list:
+    if queryset is None:
+        queryset = models.SkillCategory.objects.all()
+    categories = list(
+        _values(queryset, "id", "title", "subtitle", "highlight", "order")
+    )
+    ids = [category["id"] for category in categories]
+    skills = _group_by(
+        models.SkillItem.objects.filter(category_id__in=ids).values(
+            "category_id",
+            "name",
+            "description",
+            "logo",
+            "logo_renditions",
+            "logo_url",
+            "order",
+        )
+        if ids
+        else (),
+        "category_id",
+    )
+    for category in categories:
+        category_skills = skills.get(category.pop("id"), [])
+        for skill in category_skills:
+            _image(skill, models.SkillItem, "logo", request)
+            skill["logo_url"] = skill.pop("logo_url")
+            skill["order"] = skill.pop("order")
+        category["skills"] = category_skills
+    return categories
+
+
+PROJECT_FIELDS = (
+    "title",
+    "subtitle",
+    "description",
+    "cover_image",
+    "cover_image_renditions",
+    "gradient_start",
+    "gradient_end",
+    "live_url",
+    "code_url",
+    "order",
+)
+
+
+def serialize_projects(queryset=None, request=None) -> list:
+    if queryset is None:
+        queryset = models.Project.objects.all()
+    projects = list(_values(queryset, "id", *PROJECT_FIELDS))
+    ids = [project["id"] for project in projects]
+    if ids:
+        tech = _group_by(
+            models.ProjectTech.objects.filter(project_id__in=ids).values(
+                "project_id", "name", "order"
+            ),
+            "project_id",
+        )
+        gallery = _group_by(
+            models.ProjectImage.objects.filter(project_id__in=ids).values(
+                "project_id", "image", "image_renditions", "caption"
+            ),
+            "project_id",
+        )
+    else:
+        tech, gallery = {}, {}
+    for project in projects:
+        project_id = project.pop("id")
+        _image(project, models.Project, "cover_image", request)
+        # Keep the serializer's key order: the srcset follows cover_image.
+        for field_name in PROJECT_FIELDS[5:]:
+            project[field_name] = project.pop(field_name)
+        gallery_images = gallery.get(project_id, [])
+        for image in gallery_images:
+            _image(image, models.ProjectImage, "image", request)
+            image["caption"] = image.pop("caption")
+        project["tech"] = tech.get(project_id, [])
+        project["gallery"] = gallery_images
+    return projects
+
+
+def serialize_project_images(queryset, request=None) -> list:
+    images = list(_values(queryset, "image", "image_renditions", "caption"))
+    for image in images:
+        _image(image, models.ProjectImage, "image", request)
+        image["caption"] = image.pop("caption")
+    return images
+
+
+def serialize_testimonials(queryset=None, request=None) -> list:
+    if queryset is None:
+        queryset = models.Testimonial.objects.all()
+    testimonials = list(
+        _values(
+            queryset,
+            "author_name",
+            "author_role",
+            "quote",
+            "avatar",
+            "avatar_renditions",
+            "order",
+        )
+    )
+    for testimonial in testimonials:
+        _image(testimonial, models.Testimonial, "avatar", request)
+        testimonial["order"] = testimonial.pop("order")
+    return testimonials
+
+
+def serialize_social_links(queryset=None, request=None) -> list:
+    if queryset is None:
+        queryset = models.SocialLink.objects.all()
+    return list(_values(queryset, "label", "url", "icon_name", "order"))
+
+
+def serialize_footer(request=None):
+    return models.Footer.objects.values("text", "tagline").first()
+
+
+def serialize_resumes(queryset=None, request=None) -> list:
+    if queryset is None:
+        queryset = models.Resume.objects.all()
+    return [
+        {
+            "resume_type": resume["resume_type"],
+            "file": downloads.resume_url(
+                resume["resume_type"], resume["file_meta"], request
+            ),
+        }
+        for resume in _values(queryset, "resume_type", "file_meta")
+    ]
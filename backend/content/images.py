@@ -0,0 +1,205 @@
+"""
+Responsive derivatives for uploaded images.
+
+Every image field listed in ``IMAGE_FIELDS`` has a sibling
+``<field>_renditions`` JSONField. When a new file is saved, resized copies
+are written per format and width and their storage names recorded there,
+together with the intrinsic size, dominant colour and a tiny inline
+placeholder. The API exposes them as ``<field>_srcset`` and ``<field>_meta``.
+"""
+
+import base64
+import io
+import posixpath
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, features
+
+from . import models
+
+DERIVATIVE_WIDTHS = (480, 960, 1600)
+DERIVATIVE_FORMATS = {
+    # format -> (Pillow format, extension, save options)
+    "avif": ("AVIF", "avif", {"quality": 55}),
+    "webp": ("WEBP", "webp", {"quality": 78, "method": 6}),
+    "jpeg": ("JPEG", "jpg", {"quality": 80, "optimize": True, "progressive": True}),
+}
+DERIVATIVE_PREFIX = "derivatives"
+PLACEHOLDER_SIZE = 16
+
+IMAGE_FIELDS = {
+    models.AboutSection: ("profile_image",),
+    models.SkillItem: ("logo",),
+    models.Project: ("cover_image",),
+    models.ProjectImage: ("image",),
+    models.Testimonial: ("avatar",),
+}
+
+
+def renditions_field(field_name: str) -> str:
+    return f"{field_name}_renditions"
+
+
+def _available_formats():
+    for name, spec in DERIVATIVE_FORMATS.items():
+        if name == "jpeg" or features.check(name):
+            yield name, spec
+
+
+def _target_widths(width: int) -> list:
+    largest = min(width, DERIVATIVE_WIDTHS[-1])
+    return [target for target in DERIVATIVE_WIDTHS if target < largest] + [largest]
+
+
+def _dominant_color(image) -> str:
+    sample = image.convert("RGB")
+    sample.thumbnail((64, 64))
+    quantized = sample.quantize(colors=8)
+    _, index = max(quantized.getcolors())
+    palette = quantized.getpalette()
+    red, green, blue = palette[index * 3 : index * 3 + 3]
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def _placeholder(image) -> str:
+    thumbnail = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    thumbnail.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+    buffer = io.BytesIO()
+    if features.check("webp"):
+        thumbnail.save(buffer, format="WEBP", quality=40)
+        mime = "image/webp"
+    else:  # pragma: no cover - Pillow without libwebp
+        thumbnail.save(buffer, format="PNG", optimize=True)
+        mime = "image/png"
+    return f"data:{mime};base64,{base64.b64encode(buffer.getvalue()).decode()}"
+
+
+def generate_renditions(fieldfile) -> dict:
+    """Write derivatives of ``fieldfile`` to its storage and describe them."""
+    storage = fieldfile.storage
+    with fieldfile.open("rb") as handle:
+        source = ImageOps.exif_transpose(Image.open(handle))
+        source.load()
+
+    stem = posixpath.splitext(fieldfile.name)[0]
+    formats = {}
+    for name, (pil_format, extension, options) in _available_formats():
+        image = source
+        if pil_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        elif image.mode not in ("RGB", "RGBA", "L"):
+            image = image.convert("RGBA")
+        entries = []
+        for width in _target_widths(source.width):
+            height = max(round(source.height * width / source.width), 1)
+            resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(buffer, format=pil_format, **options)
+            saved = storage.save(
+                f"{DERIVATIVE_PREFIX}/{stem}-{width}w.{extension}",
+                ContentFile(buffer.getvalue()),
+            )
+            entries.append({"width": width, "name": saved})
+        formats[name] = entries
+    return {
+        "source": fieldfile.name,
+        "formats": formats,
+        "width": source.width,
+        "height": source.height,
+        "color": _dominant_color(source),
+        "placeholder": _placeholder(source),
+    }
+
+
+def delete_renditions(storage, renditions: dict) -> None:
+    for entries in (renditions or {}).get("formats", {}).values():
+        for entry in entries:
+            storage.delete(entry["name"])
+
+
+def build_srcset(storage, renditions, request=None):
+    """Return ``{format: "url 480w, url 960w"}`` or ``None``."""
+    if not renditions or not renditions.get("formats"):
+        return None
+    srcset = {}
+    for name, entries in renditions["formats"].items():
+        candidates = []
+        for entry in entries:
+            url = storage.url(entry["name"])
+            if request:
+                url = request.build_absolute_uri(url)
+            candidates.append(f"{url} {entry['width']}w")
+        srcset[name] = ", ".join(candidates)
+    return srcset
+
+
+def build_meta(renditions):
+    """Return intrinsic size, dominant colour and placeholder, or ``None``."""
+    if not renditions or "width" not in renditions:
+        return None
+    return {
+        "width": renditions["width"],
+        "height": renditions["height"],
+        "color": renditions["color"],
+        "placeholder": renditions["placeholder"],
+    }
+
+
+def shared_renditions(name):
+    """
+    Return the renditions another row already built for the file ``name``.
+
+    Content-addressed storage lets many rows point at one file, and the
+    derivatives of that file are the same for all of them.
+    """
+    for model, field_names in IMAGE_FIELDS.items():
+        for field_name in field_names:
+            target = renditions_field(field_name)
+            renditions = (
+                model._default_manager.filter(**{f"{target}__source": name})
+                .values_list(target, flat=True)
+                .first()
+            )
+            if renditions:
+                return renditions
+    return None
+
+
+def refresh_renditions(instance, force=False, rebuilt=None) -> dict:
+    """
+    Regenerate derivatives for fields whose file changed since the last run
+    (or for every field when ``force`` is set). Derivatives another row
+    already has for the same file are reused; under ``force`` only those in
+    ``rebuilt`` (source name -> renditions), which collects what this run
+    generated so each shared file is encoded once.
+
+    Returns the ``<field>_renditions`` values that changed so the caller can
+    persist them with ``QuerySet.update()``. Derivatives of a replaced file,
+    or replaced by ``force``, are left for ``content.media``, as another row
+    may share them.
+    """
+    if rebuilt is None:
+        rebuilt = {}
+    changes = {}
+    for field_name in IMAGE_FIELDS.get(type(instance), ()):
+        fieldfile = getattr(instance, field_name)
+        target = renditions_field(field_name)
+        current = getattr(instance, target) or {}
+        name = fieldfile.name or ""
+        if current.get("source", "") == name and not (force and name):
+            continue
+        renditions = rebuilt.get(name, {}) if name else {}
+        if name and not renditions and not force:
+            renditions = shared_renditions(name) or {}
+        if name and not renditions:
+            try:
+                renditions = generate_renditions(fieldfile)
+            except (OSError, ValueError, Image.DecompressionBombError):
+                # Unreadable, oversized or unsupported upload: remember it so it
+                # is not retried on every save. This runs after the commit, so
+                # raising would turn a saved edit into a 500.
+                renditions = {"source": name, "formats": {}}
+            rebuilt[name] = renditions
+        setattr(instance, target, renditions)
+        changes[target] = renditions
+    return changes
@@ -0,0 +1,243 @@
+"""
+Per-request timings for the ``Server-Timing`` header and the request log.
+
+``RequestInstrumentationMiddleware`` opens a ``RequestTimings`` for every
+request in a context variable, so code below it (``sync_to_async`` threads
+included) can add to it: database queries through the execute wrapper that
+``install_query_recorder`` puts on each connection, cache lookups through
+``record_cache`` and timed blocks through ``span``.
+"""
+
+import contextlib
+import contextvars
+import json
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import metrics
+
+logger = logging.getLogger("content.requests")
+
+_current = contextvars.ContextVar("content_request_timings", default=None)
+
+LOOPBACK_ADDRESSES = {"127.0.0.1", "::1"}
+
+
+class RequestTimings:
+    def __init__(self, request=None):
+        self.request = request
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.spans = {}
+
+    def add_span(self, name, seconds) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        metrics = [
+            f"total;dur={self.duration * 1000:.1f}",
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.db_queries} queries"',
+        ]
+        metrics += [
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.spans.items()
+        ]
+        if self.cache_hits or self.cache_misses:
+            metrics.append(
+                f'cache;desc="{self.cache_hits} hit, {self.cache_misses} miss"'
+            )
+        return ", ".join(metrics)
+
+    def as_log_record(self, request, response) -> dict:
+        match = getattr(request, "resolver_match", None)
+        return {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "duration_ms": round(self.duration * 1000, 2),
+            "db_queries": self.db_queries,
+            "db_ms": round(self.db_time * 1000, 2),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "spans_ms": {
+                name: round(seconds * 1000, 2) for name, seconds in self.spans.items()
+            },
+        }
+
+
+def is_local_request(request) -> bool:
+    """A direct connection from the host itself, never one nginx forwarded."""
+    return (
+        request.META.get("REMOTE_ADDR") in LOOPBACK_ADDRESSES
+        and "HTTP_X_FORWARDED_FOR" not in request.META
+    )
+
+
+def is_staff(user) -> bool:
+    return user is not None and user.is_active and user.is_staff
+
+
+def current():
+    return _current.get()
+
+
+def current_view():
+    """URL name (or path) of the request being served, ``None`` outside one."""
+    timings = _current.get()
+    if timings is None or timings.request is None:
+        return None
+    match = getattr(timings.request, "resolver_match", None)
+    return (match.view_name if match else None) or timings.request.path
+
+
+@contextlib.contextmanager
+def span(name, exclude_db=False):
+    """
+    Add the time spent in the block to the current request's ``name``, less
+    the time its queries took when ``exclude_db`` is set (``db`` already
+    reports that).
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    db_start = timings.db_time
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if exclude_db:
+            elapsed -= timings.db_time - db_start
+        timings.add_span(name, max(elapsed, 0.0))
+
+
+@contextlib.contextmanager
+def untracked():
+    """
+    Leave queries issued from inside another query's execute wrapper (the
+    slow-query log's EXPLAIN) out of the current request. ``record_query``
+    times the outer statement around the block, so its time is taken back
+    out of ``db_time`` too.
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    token = _current.set(None)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _current.reset(token)
+        timings.db_time -= time.perf_counter() - start
+
+
+def record_cache(hit, count=1) -> None:
+    timings = _current.get()
+    if timings is None:
+        return
+    if hit:
+        timings.cache_hits += count
+    else:
+        timings.cache_misses += count
+
+
+def record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db_time += time.perf_counter() - start
+        timings.db_queries += 1
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """``connection_created`` receiver; wrappers outlive reconnects."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def record_metrics(request, response, timings) -> None:
+    """Feed one finished request into ``content.metrics``, keyed by URL name."""
+    match = getattr(request, "resolver_match", None)
+    view = (match.view_name if match else None) or "unmatched"
+    metrics.increment(
+        "http_requests_total",
+        view=view,
+        method=request.method,
+        status=response.status_code,
+    )
+    metrics.observe("http_request_duration_seconds", timings.duration, view=view)
+    metrics.increment("http_request_db_queries_total", timings.db_queries, view=view)
+    if timings.cache_hits:
+        metrics.increment("cache_lookups_total", timings.cache_hits, result="hit")
+    if timings.cache_misses:
+        metrics.increment("cache_lookups_total", timings.cache_misses, result="miss")
+    metrics.flush()
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Time each request and report it in ``content.metrics`` and as one JSON
+    line on the ``content.requests`` logger. ``Server-Timing`` (when
+    ``SERVER_TIMING_HEADER`` is on) is only sent to local connections and
+    signed-in staff, as query counts and cache behaviour are internal detail.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings(request)
+        token = _current.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        show = settings.SERVER_TIMING_HEADER and (
+            is_local_request(request) or is_staff(getattr(request, "user", None))
+        )
+        return self._finish(request, response, timings, show)
+
+    async def __acall__(self, request):
+        timings = RequestTimings(request)
+        token = _current.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        show = settings.SERVER_TIMING_HEADER and is_local_request(request)
+        if settings.SERVER_TIMING_HEADER and not show and hasattr(request, "auser"):
+            show = is_staff(await request.auser())
+        return self._finish(request, response, timings, show)
+
+    def _finish(self, request, response, timings, show_timing):
+        timings.finish()
+        request.timings = timings
+        record_metrics(request, response, timings)
+        if show_timing:
+            response["Server-Timing"] = timings.server_timing()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(timings.as_log_record(request, response)))
+        return response
@@ -0,0 +1,83 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from content.benchmarks import api
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every content API endpoint in-process against a throwaway "
+        "database and write the results as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--projects", type=int, default=100, help="Synthetic projects to seed"
+        )
+        parser.add_argument(
+            "--contact-messages",
+            type=int,
+            default=1000,
+            help="Existing contact messages to seed",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=50, help="Requests per endpoint and mode"
+        )
+        parser.add_argument(
+            "--mode",
+            action="append",
+            choices=["warm", "cold"],
+            help="warm (cache primed) and/or cold (cache cleared per request)",
+        )
+        parser.add_argument(
+            "--db-path",
+            default=None,
+            help=(
+                "New SQLite file for the benchmark database, created and deleted "
+                "by the run; an existing file is refused (default: temporary)"
+            ),
+        )
+        parser.add_argument(
+            "--output", default="benchmark-api.json", help="Where to write results"
+        )
+        parser.add_argument(
+            "--compare", default=None, help="Earlier results file to diff p95 against"
+        )
+
+    def handle(self, *args, **options):
+        if options["db_path"] and Path(options["db_path"]).exists():
+            raise CommandError(
+                f"{options['db_path']} already exists and would be deleted; "
+                "pass a path that does not exist yet."
+            )
+        results = api.run_api_benchmark(
+            projects=options["projects"],
+            contact_messages=options["contact_messages"],
+            requests=options["requests"],
+            modes=tuple(options["mode"] or ("warm", "cold")),
+            db_path=options["db_path"],
+        )
+        Path(options["output"]).write_text(json.dumps(results, indent=2))
+
+        for mode, endpoints in results["endpoints"].items():
+            self.stdout.write(f"\n{mode}")
+            for name, result in endpoints.items():
+                latency = result["latency_ms"]
+                self.stdout.write(
+                    f"  {name:<22} p50 {latency['p50']:8.2f} ms  "
+                    f"p95 {latency['p95']:8.2f} ms  "
+                    f"queries {result['queries']['p50']:>4}"
+                )
+
+        if options["compare"]:
+            baseline = json.loads(Path(options["compare"]).read_text())
+            self.stdout.write(f"\np95 vs {options['compare']}")
+            for mode, name, old, new, change in api.compare(baseline, results):
+                self.stdout.write(
+                    f"  {mode:<5} {name:<22} {old:8.2f} -> {new:8.2f} ms "
+                    f"({change:+.0%})"
+                )
+
+        self.stdout.write(self.style.SUCCESS(f"\nResults written to {options['output']}"))
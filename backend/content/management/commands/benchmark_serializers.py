@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from content.benchmarks import api
+from content.benchmarks.dataset import seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the DRF and fast serialization engines on the /api/portfolio/ "
+        "payload using a synthetic dataset in a throwaway database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--projects", type=int, default=500, help="Synthetic projects to create"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=10, help="Timed runs per engine"
+        )
+
+    def handle(self, *args, **options):
+        with api.isolated_environment(), api.isolated_database():
+            seed_dataset(projects=options["projects"])
+            self._run(options["repeat"])
+
+    def _run(self, repeat):
+        # Median per section, summed: the cost of rendering the full payload.
+        medians = {
+            engine: sum(summary["p50"] for summary in sections.values())
+            for engine, sections in api.measure_serialization(repeat).items()
+        }
+        for engine, median in medians.items():
+            self.stdout.write(f"{engine:>4}: median {median:.1f} ms")
+
+        differing = api.differing_sections()
+        if differing:
+            raise CommandError(
+                "Fast engine output differs from the DRF serializers: "
+                f"{', '.join(differing)}."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Identical output; fast engine is "
+                f"{medians['drf'] / medians['fast']:.1f}x faster."
+            )
+        )
@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from content.benchmarks import sqlite
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare SQLite connection profiles with concurrent reader and writer "
+        "processes against throwaway databases."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--projects", type=int, default=100, help="Synthetic projects to seed"
+        )
+        parser.add_argument(
+            "--readers", type=int, default=3, help="Reader processes (workers)"
+        )
+        parser.add_argument(
+            "--writers", type=int, default=1, help="Contact message writer processes"
+        )
+        parser.add_argument(
+            "--duration", type=float, default=5.0, help="Seconds per profile"
+        )
+        parser.add_argument(
+            "--write-interval",
+            type=float,
+            default=0.005,
+            help="Pause between writes in each writer, in seconds",
+        )
+        parser.add_argument(
+            "--profile",
+            action="append",
+            choices=sorted(sqlite.PROFILES),
+            help="Profiles to run (default: all)",
+        )
+        parser.add_argument(
+            "--output", default=None, help="Also write the results as JSON here"
+        )
+
+    def handle(self, *args, **options):
+        results = sqlite.run_sqlite_benchmark(
+            projects=options["projects"],
+            readers=options["readers"],
+            writers=options["writers"],
+            duration=options["duration"],
+            write_interval=options["write_interval"],
+            profiles=tuple(options["profile"] or sqlite.PROFILES),
+        )
+        if options["output"]:
+            Path(options["output"]).write_text(json.dumps(results, indent=2))
+
+        for name, result in results["profiles"].items():
+            self.stdout.write(f"\n{name}")
+            for kind, summary in result.items():
+                latency = summary["latency_ms"] or {"p50": 0.0, "p95": 0.0}
+                self.stdout.write(
+                    f"  {kind:<5} {summary['per_second']:8.1f}/s  "
+                    f"p50 {latency['p50']:8.2f} ms  p95 {latency['p95']:8.2f} ms  "
+                    f"errors {summary['errors']}"
+                )
@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from content import images, media, snapshots
+
+
+class Command(BaseCommand):
+    help = "Generate responsive derivatives and placeholders for existing images."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuild derivatives even for images that already have them",
+        )
+
+    def handle(self, *args, **options):
+        changed = False
+        # Shared across rows and models: a file several rows use is encoded once.
+        rebuilt = {}
+        replaced = {}  # storage -> renditions the updates replaced
+        for model in images.IMAGE_FIELDS:
+            updated = 0
+            # A fixed list rather than .iterator(): rows are updated while looping.
+            for pk in list(model.objects.values_list("pk", flat=True)):
+                instance = model.objects.filter(pk=pk).first()
+                if instance is None:
+                    continue
+                previous = {
+                    field_name: getattr(instance, images.renditions_field(field_name))
+                    for field_name in images.IMAGE_FIELDS[model]
+                }
+                changes = images.refresh_renditions(
+                    instance, force=options["force"], rebuilt=rebuilt
+                )
+                if changes:
+                    model.objects.filter(pk=pk).update(
+                        **changes, updated_at=timezone.now()
+                    )
+                    updated += 1
+                    for field_name, renditions in previous.items():
+                        if images.renditions_field(field_name) in changes:
+                            storage = getattr(instance, field_name).storage
+                            replaced.setdefault(storage, []).append(renditions)
+            if updated:
+                snapshots.bump_section_versions(model)
+                changed = True
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {updated} updated")
+
+        # Only once every row points at its new derivatives: rows sharing a
+        # file shared the old ones too.
+        removed = sum(
+            len(media.release_renditions(storage, renditions_list))
+            for storage, renditions_list in replaced.items()
+        )
+        if removed:
+            self.stdout.write(f"Removed {removed} unused derivative(s)")
+
+        # The updates skip post_save, so refresh the published file once.
+        if settings.PORTFOLIO_SNAPSHOT_AUTOPUBLISH and changed:
+            path = snapshots.publish_portfolio_snapshot()
+            self.stdout.write(f"Published {path}")
+        self.stdout.write(self.style.SUCCESS("Image renditions are up to date."))
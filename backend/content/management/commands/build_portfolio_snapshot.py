@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from content import snapshots
+
+
+class Command(BaseCommand):
+    help = "Render the /api/portfolio/ payload to a static JSON file for nginx."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output-dir",
+            default=None,
+            help=f"Directory to write into (default: {settings.PORTFOLIO_SNAPSHOT_ROOT})",
+        )
+        parser.add_argument(
+            "--base-url",
+            default=None,
+            help="Public origin used for absolute media URLs "
+            "(default: PORTFOLIO_PUBLIC_URL, which must then be set)",
+        )
+        parser.add_argument(
+            "--keep",
+            type=int,
+            default=3,
+            help="Number of hashed snapshots to keep around for in-flight clients",
+        )
+
+    def handle(self, *args, **options):
+        path = snapshots.publish_portfolio_snapshot(
+            output_dir=options["output_dir"],
+            base_url=options["base_url"],
+            keep=options["keep"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Portfolio snapshot written to {path}"))
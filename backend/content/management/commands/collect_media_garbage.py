@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from content import media
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete media files no row references. With --rehash, first move files "
+        "uploaded before content-addressed storage to their hashed names."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rehash",
+            action="store_true",
+            help="Rename legacy uploads to content-hashed names first",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=3600,
+            help="Keep unreferenced files modified within this many seconds",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List what would change without touching anything",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        if options["rehash"]:
+            for old_name, new_name in media.rehash_files(dry_run=dry_run):
+                if new_name is None:
+                    self.stdout.write(self.style.WARNING(f"Unreadable: {old_name}"))
+                else:
+                    self.stdout.write(f"{old_name} -> {new_name}")
+
+        removed = media.collect_garbage(min_age=options["min_age"], dry_run=dry_run)
+        for name in removed:
+            self.stdout.write(f"{'Would delete' if dry_run else 'Deleted'} {name}")
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(removed)} unreferenced file(s) collected.")
+        )
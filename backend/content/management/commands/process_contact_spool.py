@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError
+
+from content import metrics, spool
+
+
+class Command(BaseCommand):
+    help = "Insert spooled contact submissions in batches and mail a digest."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the spool once and exit instead of polling",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep between polls when the spool is empty",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=100, help="Messages per insert"
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            # Every pass, not just at startup: another worker may have died
+            # holding a claim while this one keeps running.
+            requeued = spool.requeue_stale()
+            if requeued:
+                self.stdout.write(f"Requeued {requeued} interrupted submission(s).")
+            pending = []
+            while True:
+                try:
+                    batch = spool.ingest_batch(options["batch_size"])
+                except OperationalError as exc:
+                    self.stdout.write(
+                        self.style.WARNING(f"Unable to store contact messages: {exc}")
+                    )
+                    break
+                if not batch:
+                    break
+                pending.extend(batch)
+            if pending:
+                self.stdout.write(f"Stored {len(pending)} contact message(s).")
+                try:
+                    spool.send_digest(pending)
+                except Exception as exc:  # pragma: no cover - SMTP failures
+                    self.stdout.write(
+                        self.style.WARNING(f"Unable to send contact digest: {exc}")
+                    )
+            # Publish the db_write_* counters next to the web workers'.
+            metrics.flush(force=bool(options["once"]))
+            if options["once"]:
+                break
+            time.sleep(options["interval"])
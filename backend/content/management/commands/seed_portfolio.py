@@ -1,10 +1,20 @@
+import hashlib
+import os
+import tempfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.request import urlopen
+
+from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.management.base import BaseCommand
 from django.db import transaction
-from urllib.request import urlopen
+from django.utils import timezone
 from django.utils.text import slugify
 
-from content import models
+from content import models, snapshots
+from content.benchmarks import dataset
 
 
 SITE_SETTINGS_DATA = {
@@ -341,100 +351,301 @@ class Command(BaseCommand):
             action="store_true",
             help="Delete existing portfolio content before seeding",
         )
+        parser.add_argument(
+            "--offline",
+            action="store_true",
+            help="Generate placeholder images locally instead of downloading them",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="Concurrent image downloads",
+        )
+        parser.add_argument(
+            "--asset-cache",
+            default=str(settings.BASE_DIR / "cache" / "seed-assets"),
+            help="Directory caching downloaded images by URL hash",
+        )
+        parser.add_argument(
+            "--scale",
+            type=int,
+            default=0,
+            metavar="N",
+            help=(
+                "Also generate N synthetic projects with galleries, N testimonials, "
+                "N/20 skill categories and N*10 contact messages (implies --offline)"
+            ),
+        )
+        parser.add_argument(
+            "--image-pool",
+            type=int,
+            default=24,
+            help="Distinct generated images shared by the --scale records",
+        )
 
-    @transaction.atomic
     def handle(self, *args, **options):
-        if options.get("reset"):
-            self.stdout.write("Resetting portfolio content…")
-            models.NavigationLink.objects.all().delete()
-            models.AboutHighlight.objects.all().delete()
-            models.AboutSection.objects.all().delete()
-            models.SkillItem.objects.all().delete()
-            models.SkillCategory.objects.all().delete()
-            models.ProjectTech.objects.all().delete()
-            models.ProjectImage.objects.all().delete()
-            models.Project.objects.all().delete()
-            models.Testimonial.objects.all().delete()
-            models.SocialLink.objects.all().delete()
-            models.Resume.objects.all().delete()
-            models.Footer.objects.all().delete()
-            models.SiteSettings.objects.all().delete()
-
-        site_settings, _ = models.SiteSettings.objects.get_or_create(defaults=SITE_SETTINGS_DATA)
-        for field, value in SITE_SETTINGS_DATA.items():
-            setattr(site_settings, field, value)
-        site_settings.save()
-
-        for link in NAVIGATION_LINKS:
-            models.NavigationLink.objects.update_or_create(
-                label=link["label"], defaults=link
+        scale = options.get("scale") or 0
+        self.offline = options.get("offline") or scale > 0
+        self.asset_cache = Path(options["asset_cache"])
+        self.workers = max(options["workers"], 1)
+        self.changed = set()
+
+        with transaction.atomic():
+            if options.get("reset"):
+                self.stdout.write("Resetting portfolio content…")
+                self._reset()
+            about_section, projects = self._sync_content()
+        self._sync_images(about_section, projects, force=options.get("reset"))
+        self._sync_resumes()
+
+        # bulk_create and bulk_update skip post_save, so invalidate here.
+        for model in self.changed:
+            snapshots.bump_section_versions(model)
+
+        scaled = scale > 0 and self._seed_scale(scale, options["image_pool"])
+
+        # The saves above skip the post_save publish, so refresh the file once.
+        if settings.PORTFOLIO_SNAPSHOT_AUTOPUBLISH and (self.changed or scaled):
+            path = snapshots.publish_portfolio_snapshot()
+            self.stdout.write(f"Published {path}")
+
+        self.stdout.write(self.style.SUCCESS("Portfolio content seeded successfully."))
+
+    def _reset(self):
+        models.NavigationLink.objects.all().delete()
+        models.AboutHighlight.objects.all().delete()
+        models.AboutSection.objects.all().delete()
+        models.SkillItem.objects.all().delete()
+        models.SkillCategory.objects.all().delete()
+        models.ProjectTech.objects.all().delete()
+        models.ProjectImage.objects.all().delete()
+        models.Project.objects.all().delete()
+        models.Testimonial.objects.all().delete()
+        models.SocialLink.objects.all().delete()
+        models.Resume.objects.all().delete()
+        models.Footer.objects.all().delete()
+        models.SiteSettings.objects.all().delete()
+
+    def _sync(self, queryset, key, rows, delete_missing=True) -> dict:
+        """
+        Make ``queryset`` match ``rows`` (dicts of field values) matched on the
+        ``key`` fields: create missing rows, update changed ones and delete
+        the rest. Returns the resulting objects by key.
+        """
+        model = queryset.model
+        existing = {
+            tuple(getattr(obj, field) for field in key): obj for obj in queryset
+        }
+        result, to_create, to_update, update_fields = {}, [], [], set()
+        for row in rows:
+            row_key = tuple(row[field] for field in key)
+            obj = existing.pop(row_key, None)
+            if obj is None:
+                obj = model(**row)
+                to_create.append(obj)
+            else:
+                changed = [
+                    field
+                    for field, value in row.items()
+                    if getattr(obj, field) != value
+                ]
+                if changed:
+                    for field in changed:
+                        setattr(obj, field, row[field])
+                    to_update.append(obj)
+                    update_fields.update(changed)
+            result[row_key] = obj
+
+        if to_create:
+            model.objects.bulk_create(to_create)
+        if to_update:
+            # bulk_update bypasses auto_now; keep the conditional GET state honest.
+            now = timezone.now()
+            for obj in to_update:
+                obj.updated_at = now
+            model.objects.bulk_update(to_update, [*update_fields, "updated_at"])
+        stale = [obj.pk for obj in existing.values()] if delete_missing else []
+        if stale:
+            model.objects.filter(pk__in=stale).delete()
+        if to_create or to_update or stale:
+            self.changed.add(model)
+            self.stdout.write(
+                f"{model._meta.verbose_name_plural}: {len(to_create)} created, "
+                f"{len(to_update)} updated, {len(stale)} deleted"
             )
+        return result
 
-        about_section, _ = models.AboutSection.objects.get_or_create()
-        for field, value in ABOUT_SECTION.items():
-            if field == "profile_image_url":
-                continue
-            setattr(about_section, field, value)
-        about_section.save()
-        profile_image_url = ABOUT_SECTION.get("profile_image_url")
-        if profile_image_url and (options.get("reset") or not about_section.profile_image):
+    def _sync_content(self):
+        self._sync(models.SiteSettings.objects.all()[:1], (), [SITE_SETTINGS_DATA])
+        self._sync(
+            models.NavigationLink.objects.all(),
+            ("label",),
+            NAVIGATION_LINKS,
+            delete_missing=False,
+        )
+        about_fields = {
+            field: value
+            for field, value in ABOUT_SECTION.items()
+            if field != "profile_image_url"
+        }
+        (about_section,) = self._sync(
+            models.AboutSection.objects.all()[:1], (), [about_fields]
+        ).values()
+        self._sync(
+            about_section.highlights.all(),
+            ("title",),
+            [
+                dict(highlight, section_id=about_section.pk)
+                for highlight in ABOUT_HIGHLIGHTS
+            ],
+        )
+
+        # Rows from --scale are left alone; they are not in the seed data.
+        synthetic = dataset.SYNTHETIC_SUBTITLE
+        categories = self._sync(
+            models.SkillCategory.objects.exclude(subtitle=synthetic),
+            ("title",),
+            [
+                {field: value for field, value in data.items() if field != "skills"}
+                for data in SKILL_CATEGORIES
+            ],
+        )
+        self._sync(
+            models.SkillItem.objects.exclude(category__subtitle=synthetic),
+            ("category_id", "name"),
+            [
+                dict(skill, category_id=categories[(data["title"],)].pk, order=order)
+                for data in SKILL_CATEGORIES
+                for order, skill in enumerate(data["skills"])
+            ],
+        )
+
+        projects = self._sync(
+            models.Project.objects.exclude(subtitle=synthetic),
+            ("title",),
+            [
+                {field: value for field, value in data.items() if field != "tech"}
+                for data in PROJECTS
+            ],
+        )
+        self._sync(
+            models.ProjectTech.objects.exclude(project__subtitle=synthetic),
+            ("project_id", "name"),
+            [
+                {
+                    "project_id": projects[(data["title"],)].pk,
+                    "name": name,
+                    "order": order,
+                }
+                for data in PROJECTS
+                for order, name in enumerate(data["tech"])
+            ],
+        )
+
+        self._sync(
+            models.Testimonial.objects.exclude(author_role=synthetic),
+            ("author_name",),
+            TESTIMONIALS,
+        )
+        self._sync(models.SocialLink.objects.all(), ("label",), SOCIAL_LINKS)
+        self._sync(models.Footer.objects.all()[:1], (), [FOOTER])
+        return about_section, {key[0]: project for key, project in projects.items()}
+
+    def _fetch_asset(self, url) -> bytes:
+        if self.offline:
+            return dataset.generate_image(zlib.crc32(url.encode()))
+        path = self.asset_cache / hashlib.sha256(url.encode()).hexdigest()
+        if path.exists():
+            return path.read_bytes()
+        with urlopen(url, timeout=30) as response:
+            content = response.read()
+        self.asset_cache.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.asset_cache, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(content)
+        os.replace(tmp_path, path)
+        return content
+
+    def _fetch_assets(self, urls) -> dict:
+        """Fetch ``urls`` on a bounded thread pool; failures map to the exception."""
+
+        def fetch(url):
             try:
-                with urlopen(profile_image_url) as response:
-                    about_section.profile_image.save(
-                        "profile.jpg",
-                        ContentFile(response.read()),
-                        save=True,
-                    )
+                return self._fetch_asset(url)
             except Exception as exc:  # pragma: no cover - best effort
-                self.stdout.write(
-                    self.style.WARNING(
-                        f"Unable to download profile image ({profile_image_url}): {exc}"
-                    )
-                )
+                return exc
 
-        models.AboutHighlight.objects.filter(section=about_section).delete()
-        for highlight in ABOUT_HIGHLIGHTS:
-            models.AboutHighlight.objects.create(section=about_section, **highlight)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return dict(zip(urls, pool.map(fetch, urls)))
 
-        models.SkillCategory.objects.all().delete()
-        for category_data in SKILL_CATEGORIES:
-            skills = category_data.pop("skills")
-            category = models.SkillCategory.objects.create(**category_data)
-            for order, skill in enumerate(skills):
-                models.SkillItem.objects.create(category=category, order=order, **skill)
+    def _sync_images(self, about_section, projects, force=False):
+        profile_image_url = ABOUT_SECTION.get("profile_image_url")
+        wants_profile = profile_image_url and (force or not about_section.profile_image)
 
-        models.Project.objects.all().delete()
-        for project_data in PROJECTS:
-            tech = project_data.pop("tech")
-            project = models.Project.objects.create(**project_data)
-            for order, name in enumerate(tech):
-                models.ProjectTech.objects.create(project=project, name=name, order=order)
-            for idx, asset in enumerate(PROJECT_GALLERIES.get(project.title, []), start=1):
-                try:
-                    with urlopen(asset["url"]) as response:
-                        image = models.ProjectImage(project=project, caption=asset.get("caption", ""))
-                        image.image.save(
-                            f"{slugify(project.title)}-{idx}.jpg",
-                            ContentFile(response.read()),
-                            save=True,
-                        )
-                except Exception as exc:  # pragma: no cover - best effort
-                    self.stdout.write(
-                        self.style.WARNING(
-                            f"Unable to download project gallery image for {project.title}: {exc}"
-                        )
-                    )
+        expected = {
+            (projects[title].pk, asset.get("caption", ""))
+            for title, assets in PROJECT_GALLERIES.items()
+            for asset in assets
+        }
+        existing, stale_ids = set(), []
+        for pk, *key in models.ProjectImage.objects.filter(
+            project__in=projects.values()
+        ).values_list("pk", "project_id", "caption"):
+            if tuple(key) in expected:
+                existing.add(tuple(key))
+            else:
+                stale_ids.append(pk)
+        if stale_ids:
+            models.ProjectImage.objects.filter(pk__in=stale_ids).delete()
+            self.changed.add(models.ProjectImage)
+        missing = [
+            (projects[title], idx, asset)
+            for title, assets in PROJECT_GALLERIES.items()
+            for idx, asset in enumerate(assets, start=1)
+            if (projects[title].pk, asset.get("caption", "")) not in existing
+        ]
 
-        models.Testimonial.objects.all().delete()
-        for testimonial in TESTIMONIALS:
-            models.Testimonial.objects.create(**testimonial)
+        urls = [asset["url"] for _, _, asset in missing]
+        if wants_profile:
+            urls.append(profile_image_url)
+        assets = self._fetch_assets(urls)
 
-        models.SocialLink.objects.all().delete()
-        for link in SOCIAL_LINKS:
-            models.SocialLink.objects.create(**link)
+        # One short write per file; renditions are built by the post_save signal.
+        if wants_profile:
+            content = assets[profile_image_url]
+            if isinstance(content, Exception):
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Unable to download profile image ({profile_image_url}): "
+                        f"{content}"
+                    )
+                )
+            else:
+                about_section.profile_image.save(
+                    "profile.jpg", ContentFile(content), save=True
+                )
+        for project, idx, asset in missing:
+            content = assets[asset["url"]]
+            if isinstance(content, Exception):
+                self.stdout.write(
+                    self.style.WARNING(
+                        "Unable to download project gallery image for "
+                        f"{project.title}: {content}"
+                    )
+                )
+                continue
+            image = models.ProjectImage(
+                project=project, caption=asset.get("caption", "")
+            )
+            image.image.save(
+                f"{slugify(project.title)}-{idx}.jpg", ContentFile(content), save=True
+            )
 
+    def _sync_resumes(self):
+        existing = set(models.Resume.objects.values_list("resume_type", flat=True))
         for resume_data in RESUME_PLACEHOLDERS:
-            if models.Resume.objects.filter(resume_type=resume_data["resume_type"]).exists():
+            if resume_data["resume_type"] in existing:
                 continue
             resume = models.Resume(resume_type=resume_data["resume_type"])
             resume.file.save(
@@ -443,6 +654,30 @@ class Command(BaseCommand):
                 save=True,
             )
 
-        models.Footer.objects.update_or_create(defaults=FOOTER)
-
-        self.stdout.write(self.style.SUCCESS("Portfolio content seeded successfully."))
+    def _seed_scale(self, scale, pool_size):
+        # Only top up, so re-running with the same N creates nothing.
+        existing = models.Project.objects.filter(
+            subtitle=dataset.SYNTHETIC_SUBTITLE
+        ).count()
+        missing = scale - existing
+        if missing <= 0:
+            self.stdout.write(f"{existing} synthetic projects already present.")
+            return False
+        self.stdout.write(
+            f"Generating {pool_size} images for {missing} synthetic projects…"
+        )
+        pool = dataset.write_image_pool(max(pool_size, 1))
+        counts = dataset.seed_collections(
+            projects=missing,
+            contact_messages=missing * 10,
+            image_name=dataset.pool_image_names(pool),
+        )
+        # bulk_create skips post_save, so invalidate the cached sections here.
+        for model in snapshots.PORTFOLIO_MODELS:
+            snapshots.bump_section_versions(model)
+        for name, count in counts.items():
+            self.stdout.write(f"  {name}: {count}")
+        self.stdout.write(
+            "Run `manage.py build_image_renditions` to generate responsive variants."
+        )
+        return True
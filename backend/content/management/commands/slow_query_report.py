@@ -0,0 +1,90 @@
+import json
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+SORT_KEYS = {
+    "total": lambda group: group["total_ms"],
+    "max": lambda group: group["max_ms"],
+    "count": lambda group: group["count"],
+}
+
+
+def read_records(path):
+    """Records from ``path`` and its rotated backups, oldest first."""
+    path = Path(path)
+    backups = sorted(
+        path.parent.glob(f"{path.name}.*"),
+        key=lambda backup: int(backup.suffix[1:]) if backup.suffix[1:].isdigit() else 0,
+        reverse=True,
+    )
+    for log in [*backups, path]:
+        if not log.exists():
+            continue
+        with log.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+class Command(BaseCommand):
+    help = "Summarize the slow-query log, worst statements first."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--log", default=None, help="Log file (default: SLOW_QUERY_LOG)"
+        )
+        parser.add_argument(
+            "--limit", type=int, default=10, help="Statements to show"
+        )
+        parser.add_argument(
+            "--sort",
+            choices=sorted(SORT_KEYS),
+            default="total",
+            help="Rank by total time, slowest single run or number of runs",
+        )
+        parser.add_argument("--view", default=None, help="Only queries from this view")
+
+    def handle(self, *args, **options):
+        groups = {}
+        for record in read_records(options["log"] or settings.SLOW_QUERY_LOG):
+            if options["view"] and record.get("view") != options["view"]:
+                continue
+            group = groups.setdefault(
+                record["sql"],
+                {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "views": Counter()},
+            )
+            group["count"] += 1
+            group["total_ms"] += record["duration_ms"]
+            group["views"][record.get("view") or "-"] += 1
+            if record["duration_ms"] >= group["max_ms"]:
+                group["max_ms"] = record["duration_ms"]
+                group["worst"] = record
+
+        if not groups:
+            self.stdout.write("No slow queries logged.")
+            return
+
+        ranked = sorted(groups.values(), key=SORT_KEYS[options["sort"]], reverse=True)
+        for rank, group in enumerate(ranked[: options["limit"]], start=1):
+            worst = group["worst"]
+            views = ", ".join(
+                f"{view} ({count})" for view, count in group["views"].most_common(3)
+            )
+            self.stdout.write(
+                self.style.MIGRATE_HEADING(
+                    f"\n#{rank}  {group['count']} run(s), "
+                    f"total {group['total_ms']:.1f} ms, "
+                    f"mean {group['total_ms'] / group['count']:.1f} ms, "
+                    f"max {group['max_ms']:.1f} ms"
+                )
+            )
+            self.stdout.write(f"  views: {views}")
+            self.stdout.write(f"  sql:   {worst['sql']}")
+            self.stdout.write(f"  slowest params: {worst['params']}")
+            for step in worst["plan"]:
+                self.stdout.write(f"  plan:  {step}")
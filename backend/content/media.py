@@ -0,0 +1,139 @@
+"""
+Reference-counted cleanup for content-addressed media (``content.storage``).
+
+Rows can share a file, so a file is only deleted when no file field points at
+it any more: ``release`` is scheduled from the delete and replace signals,
+and ``collect_garbage`` sweeps anything those missed (uploads that never got
+a row, renditions from an older configuration, files left by a crash).
+"""
+
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.db import models
+
+from . import images
+from .storage import is_content_addressed
+
+
+def file_fields() -> list:
+    """``(model, field name)`` for every file field in the content app."""
+    return [
+        (model, field.name)
+        for model in apps.get_app_config("content").get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, models.FileField)
+    ]
+
+
+def is_referenced(name) -> bool:
+    return any(
+        model._default_manager.filter(**{field_name: name}).exists()
+        for model, field_name in file_fields()
+    )
+
+
+def release(storage, name, renditions=None) -> bool:
+    """Delete ``name`` and its ``renditions`` unless a row still uses ``name``."""
+    if not name or is_referenced(name):
+        return False
+    images.delete_renditions(storage, renditions)
+    storage.delete(name)
+    return True
+
+
+def release_renditions(storage, renditions_list) -> list:
+    """
+    Delete the derivatives listed in ``renditions_list`` that no row refers
+    to any more (rows sharing a file share its derivatives). Returns the
+    names removed.
+    """
+    referenced = referenced_names()
+    removed = []
+    for renditions in renditions_list:
+        for entries in (renditions or {}).get("formats", {}).values():
+            for entry in entries:
+                name = entry["name"]
+                if name in referenced or name in removed:
+                    continue
+                storage.delete(name)
+                removed.append(name)
+    return removed
+
+
+def referenced_names() -> set:
+    names = set()
+    for model, field_name in file_fields():
+        has_renditions = field_name in images.IMAGE_FIELDS.get(model, ())
+        columns = [field_name]
+        if has_renditions:
+            columns.append(images.renditions_field(field_name))
+        for row in model._default_manager.values_list(*columns):
+            names.add(row[0])
+            if has_renditions:
+                names.update(
+                    entry["name"]
+                    for entries in (row[1] or {}).get("formats", {}).values()
+                    for entry in entries
+                )
+    names.discard("")
+    names.discard(None)
+    return names
+
+
+def collect_garbage(storage=default_storage, min_age=3600, dry_run=False) -> list:
+    """
+    Delete files under the storage root that no row references, skipping
+    any modified in the last ``min_age`` seconds (uploads whose row is not
+    committed yet). Returns the names removed, or that would be.
+    """
+    referenced = referenced_names()
+    cutoff = time.time() - min_age
+    root = Path(storage.location)
+    removed = []
+    for path in sorted(root.rglob("*")):
+        if not path.is_file() or path.name.startswith("."):
+            continue
+        name = path.relative_to(root).as_posix()
+        if name in referenced or path.stat().st_mtime > cutoff:
+            continue
+        if not dry_run:
+            storage.delete(name)
+        removed.append(name)
+    return removed
+
+
+def rehash_files(dry_run=False):
+    """
+    Move files stored before content addressing to their hashed names
+    (``default_storage`` must be a ``ContentAddressedStorage``).
+
+    Saving each row fires the usual receivers, which regenerate renditions,
+    release the old file and invalidate the API caches. Yields
+    ``(old name, new name or None if unreadable)``.
+    """
+    for model, field_name in file_fields():
+        rows = model._default_manager.exclude(**{field_name: ""}).exclude(
+            **{f"{field_name}__isnull": True}
+        )
+        # Not .iterator(): rows are saved while looping.
+        for instance in list(rows):
+            fieldfile = getattr(instance, field_name)
+            old_name = fieldfile.name
+            if is_content_addressed(old_name):
+                continue
+            try:
+                with fieldfile.open("rb") as handle:
+                    if dry_run:
+                        new_name = fieldfile.storage.hashed_name(old_name, handle)
+                    else:
+                        new_name = fieldfile.storage.save(old_name, handle)
+            except OSError:
+                yield old_name, None
+                continue
+            if not dry_run:
+                fieldfile.name = new_name
+                instance.save(update_fields=[field_name, "updated_at"])
+            yield old_name, new_name
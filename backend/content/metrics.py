@@ -0,0 +1,274 @@
+"""
+Counters and histograms for operational metrics.
+
+Values are keyed by name and label values, e.g.
+``increment("db_write_retries_total", operation="contact")``. Each process
+keeps its own; when ``METRICS_DIR`` is set, ``flush`` writes them to
+``<METRICS_DIR>/<pid>.json`` so ``collect`` can add up every gunicorn worker
+(and the contact worker) for the ``/metrics`` endpoint. Files of processes
+that have exited are folded into ``archived.json`` and removed, so counters
+never go down when gunicorn recycles a worker. The first flush also
+starts a thread that keeps flushing every ``METRICS_FLUSH_INTERVAL``, so the
+last values of a worker that goes idle are published too.
+"""
+
+import copy
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+
+# Request latency buckets, in seconds.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Totals of exited processes, in the same format as the per-process files.
+ARCHIVE = "archived.json"
+
+_lock = threading.Lock()
+_counters = Counter()
+_histograms = {}
+_state = {"pid": os.getpid(), "flushed": 0.0, "flusher": None}
+
+
+def _key(name, labels) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+def _empty_histogram() -> dict:
+    return {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+
+
+def _check_fork() -> None:
+    # Values inherited through fork belong to the parent, not this worker.
+    if _state["pid"] != os.getpid():
+        _counters.clear()
+        _histograms.clear()
+        _state.update(pid=os.getpid(), flushed=0.0)
+
+
+def increment(name, value=1, **labels) -> None:
+    with _lock:
+        _check_fork()
+        _counters[_key(name, labels)] += value
+
+
+def observe(name, value, **labels) -> None:
+    """Record ``value`` in the ``BUCKETS`` histogram ``name``."""
+    with _lock:
+        _check_fork()
+        histogram = _histograms.setdefault(_key(name, labels), _empty_histogram())
+        for index, bound in enumerate(BUCKETS):
+            if value <= bound:
+                histogram["buckets"][index] += 1
+                break
+        histogram["sum"] += value
+        histogram["count"] += 1
+
+
+def get(name, **labels):
+    with _lock:
+        _check_fork()
+        return _counters[_key(name, labels)]
+
+
+def snapshot() -> dict:
+    """``{(name, ((label, value), ...)): count}`` for every counter."""
+    with _lock:
+        _check_fork()
+        return dict(_counters)
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _serialize(counters=None, histograms=None) -> dict:
+    counters = _counters if counters is None else counters
+    histograms = _histograms if histograms is None else histograms
+    return {
+        "counters": [
+            [name, list(labels), value] for (name, labels), value in counters.items()
+        ],
+        "histograms": [
+            [name, list(labels), histogram]
+            for (name, labels), histogram in histograms.items()
+        ],
+    }
+
+
+def _write(path, content) -> None:
+    # Readers never see a partly written file.
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        handle.write(content)
+    os.replace(tmp_path, path)
+
+
+def _flush_periodically() -> None:
+    while True:
+        time.sleep(settings.METRICS_FLUSH_INTERVAL)
+        try:
+            flush(force=True)
+        except OSError:
+            continue  # Directory unavailable for now; try again next time.
+
+
+def _start_flusher() -> None:
+    # Threads do not survive fork, so each process starts its own.
+    if _state["flusher"] != os.getpid():
+        _state["flusher"] = os.getpid()
+        threading.Thread(
+            target=_flush_periodically, name="metrics-flush", daemon=True
+        ).start()
+
+
+def flush(force=False) -> None:
+    """Write this process's values to ``METRICS_DIR`` at most once a second."""
+    directory = settings.METRICS_DIR
+    if not directory:
+        return
+    with _lock:
+        _check_fork()
+        _start_flusher()
+        now = time.monotonic()
+        if not force and now - _state["flushed"] < settings.METRICS_FLUSH_INTERVAL:
+            return
+        _state["flushed"] = now
+        content = json.dumps(_serialize())
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    _write(directory / f"{os.getpid()}.json", content)
+
+
+def _is_alive(pid) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Running as another user.
+    return True
+
+
+def _read(path):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None  # Replaced or removed while reading.
+
+
+def _merge(payloads) -> tuple:
+    counters, histograms = Counter(), {}
+    for payload in payloads:
+        for name, labels, value in payload["counters"]:
+            counters[_key(name, dict(labels))] += value
+        for name, labels, histogram in payload["histograms"]:
+            total = histograms.setdefault(_key(name, dict(labels)), _empty_histogram())
+            total["buckets"] = [
+                mine + theirs
+                for mine, theirs in zip(total["buckets"], histogram["buckets"])
+            ]
+            total["sum"] += histogram["sum"]
+            total["count"] += histogram["count"]
+    return counters, histograms
+
+
+def _archive_exited(directory) -> None:
+    """
+    Add the files of exited processes (a crashed or recycled worker) to
+    ``ARCHIVE`` and remove them, as prometheus_client's multiprocess mode
+    does: dropping them would make the ``*_total`` counters go down.
+    """
+    exited = [
+        path
+        for path in directory.glob("*.json")
+        if path.stem.isdigit() and not _is_alive(int(path.stem))
+    ]
+    if not exited:
+        return
+    # Every worker may serve /metrics; only one may fold a given file.
+    with open(directory / ".archive.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        # None: folded by another collector meanwhile, or unreadable.
+        payloads = [payload for payload in map(_read, exited) if payload is not None]
+        if payloads:
+            archive = directory / ARCHIVE
+            previous = _read(archive)
+            if previous is not None:
+                payloads.append(previous)
+            _write(archive, json.dumps(_serialize(*_merge(payloads))))
+        for path in exited:
+            path.unlink(missing_ok=True)
+
+
+def collect() -> tuple:
+    """Return ``(counters, histograms)`` summed over every process."""
+    if not settings.METRICS_DIR:
+        with _lock:
+            _check_fork()
+            payloads = [copy.deepcopy(_serialize())]
+    else:
+        flush(force=True)
+        directory = Path(settings.METRICS_DIR)
+        _archive_exited(directory)
+        payloads = [
+            payload
+            for payload in map(_read, directory.glob("*.json"))
+            if payload is not None
+        ]
+    return _merge(payloads)
+
+
+def _format_labels(labels, extra=()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def render() -> str:
+    """Prometheus text exposition of everything ``collect`` returns."""
+    counters, histograms = collect()
+    lines = []
+    for metric in sorted({name for name, _ in counters}):
+        lines.append(f"# TYPE {metric} counter")
+        for (name, labels), value in sorted(counters.items()):
+            if name == metric:
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    lookups = {
+        dict(labels).get("result"): value
+        for (name, labels), value in counters.items()
+        if name == "cache_lookups_total"
+    }
+    total = lookups.get("hit", 0) + lookups.get("miss", 0)
+    if total:
+        lines.append("# TYPE cache_hit_ratio gauge")
+        lines.append(f"cache_hit_ratio {lookups.get('hit', 0) / total:.4f}")
+
+    for metric in sorted({name for name, _ in histograms}):
+        lines.append(f"# TYPE {metric} histogram")
+        for (name, labels), histogram in sorted(histograms.items()):
+            if name != metric:
+                continue
+            cumulative = 0
+            for bound, count in zip(BUCKETS, histogram["buckets"]):
+                cumulative += count
+                bucket_labels = _format_labels(labels, [("le", bound)])
+                lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+            inf_labels = _format_labels(labels, [("le", "+Inf")])
+            lines.append(f"{name}_bucket{inf_labels} {histogram['count']}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {histogram['sum']:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram['count']}")
+    return "\n".join(lines) + "\n"
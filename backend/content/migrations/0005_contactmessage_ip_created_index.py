@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 15:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content", "0004_image_renditions"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="contactmessage",
+            index=models.Index(
+                fields=["ip_address", "created_at"], name="contact_ip_created_idx"
+            ),
+        ),
+    ]
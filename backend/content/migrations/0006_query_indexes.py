@@ -0,0 +1,77 @@
+# Generated by Django 5.2.8 on 2026-10-17 15:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content", "0005_contactmessage_ip_created_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="abouthighlight",
+            index=models.Index(
+                fields=["section", "order"], name="about_highlight_order_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="skillitem",
+            index=models.Index(
+                fields=["category", "order"], name="skill_item_order_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="projecttech",
+            index=models.Index(
+                fields=["project", "order"], name="project_tech_order_idx"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="abouthighlight",
+            name="section",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="highlights",
+                to="content.aboutsection",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="skillitem",
+            name="category",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="skills",
+                to="content.skillcategory",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="projecttech",
+            name="project",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tech",
+                to="content.project",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="skillcategory",
+            index=models.Index(fields=["order", "id"], name="skill_category_order_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(fields=["order", "id"], name="project_order_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="testimonial",
+            index=models.Index(fields=["order", "id"], name="testimonial_order_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="contactmessage",
+            index=models.Index(fields=["-created_at"], name="contact_created_idx"),
+        ),
+    ]
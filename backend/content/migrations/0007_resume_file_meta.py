@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 15:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content", "0006_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resume",
+            name="file_meta",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations
+from django.utils import timezone
+
+
+def backfill_file_meta(apps, schema_editor):
+    # Resumes uploaded before 0007 have no digest; the download view only
+    # reads file_meta, so describe them here.
+    from content import downloads
+
+    Resume = apps.get_model("content", "Resume")
+    for resume in Resume.objects.all():
+        changes = downloads.refresh_file_meta(resume)
+        if changes:
+            Resume.objects.filter(pk=resume.pk).update(
+                **changes, updated_at=timezone.now()
+            )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("content", "0007_resume_file_meta"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_file_meta, migrations.RunPython.noop),
+    ]
@@ -85,6 +85,9 @@ class AboutSection(TimeStampedModel):
     highlight_quote = models.TextField(blank=True)
     highlight_caption = models.CharField(max_length=200, blank=True)
     profile_image = models.ImageField(upload_to="about/", blank=True, null=True)
+    profile_image_renditions = models.JSONField(
+        default=dict, blank=True, editable=False
+    )
 
     class Meta:
         verbose_name = "About section"
@@ -96,7 +99,10 @@ class AboutSection(TimeStampedModel):
 
 class AboutHighlight(TimeStampedModel):
     section = models.ForeignKey(
-        AboutSection, related_name="highlights", on_delete=models.CASCADE
+        AboutSection,
+        related_name="highlights",
+        on_delete=models.CASCADE,
+        db_index=False,  # Covered by the (section, order) index.
     )
     title = models.CharField(max_length=150)
     description = models.CharField(max_length=255)
@@ -108,6 +114,9 @@ class AboutHighlight(TimeStampedModel):
 
     class Meta:
         ordering = ["order"]
+        indexes = [
+            models.Index(fields=["section", "order"], name="about_highlight_order_idx")
+        ]
         verbose_name = "About highlight"
         verbose_name_plural = "About highlights"
 
@@ -123,6 +132,9 @@ class SkillCategory(TimeStampedModel):
 
     class Meta:
         ordering = ["order"]
+        indexes = [
+            models.Index(fields=["order", "id"], name="skill_category_order_idx")
+        ]
         verbose_name = "Skill category"
         verbose_name_plural = "Skill categories"
 
@@ -132,16 +144,23 @@ class SkillCategory(TimeStampedModel):
 
 class SkillItem(TimeStampedModel):
     category = models.ForeignKey(
-        SkillCategory, related_name="skills", on_delete=models.CASCADE
+        SkillCategory,
+        related_name="skills",
+        on_delete=models.CASCADE,
+        db_index=False,  # Covered by the (category, order) index.
     )
     name = models.CharField(max_length=100)
     description = models.CharField(max_length=255, blank=True)
     logo = models.ImageField(upload_to="skills/", blank=True, null=True)
+    logo_renditions = models.JSONField(default=dict, blank=True, editable=False)
     logo_url = models.URLField(blank=True)
     order = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ["order"]
+        indexes = [
+            models.Index(fields=["category", "order"], name="skill_item_order_idx")
+        ]
         verbose_name = "Skill"
         verbose_name_plural = "Skills"
 
@@ -154,6 +173,7 @@ class Project(TimeStampedModel):
     subtitle = models.CharField(max_length=200, blank=True)
     description = models.TextField()
     cover_image = models.ImageField(upload_to="projects/", blank=True, null=True)
+    cover_image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     gradient_start = models.CharField(
         max_length=20, default="#ff8f2c", help_text="Starting color (hex or hsl)."
     )
@@ -166,6 +186,7 @@ class Project(TimeStampedModel):
 
     class Meta:
         ordering = ["order"]
+        indexes = [models.Index(fields=["order", "id"], name="project_order_idx")]
         verbose_name = "Project"
         verbose_name_plural = "Projects"
 
@@ -178,6 +199,7 @@ class ProjectImage(TimeStampedModel):
         Project, related_name="gallery_images", on_delete=models.CASCADE
     )
     image = models.ImageField(upload_to="projects/gallery/")
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     caption = models.CharField(max_length=255, blank=True)
 
     class Meta:
@@ -190,13 +212,19 @@ class ProjectImage(TimeStampedModel):
 
 class ProjectTech(TimeStampedModel):
     project = models.ForeignKey(
-        Project, related_name="tech", on_delete=models.CASCADE
+        Project,
+        related_name="tech",
+        on_delete=models.CASCADE,
+        db_index=False,  # Covered by the (project, order) index.
     )
     name = models.CharField(max_length=80)
     order = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ["order"]
+        indexes = [
+            models.Index(fields=["project", "order"], name="project_tech_order_idx")
+        ]
         verbose_name = "Project technology"
         verbose_name_plural = "Project technologies"
 
@@ -209,10 +237,12 @@ class Testimonial(TimeStampedModel):
     author_role = models.CharField(max_length=120, blank=True)
     quote = models.TextField()
     avatar = models.ImageField(upload_to="testimonials/", blank=True, null=True)
+    avatar_renditions = models.JSONField(default=dict, blank=True, editable=False)
     order = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ["order"]
+        indexes = [models.Index(fields=["order", "id"], name="testimonial_order_idx")]
         verbose_name = "Testimonial"
         verbose_name_plural = "Testimonials"
 
@@ -266,6 +296,7 @@ class Resume(TimeStampedModel):
         upload_to="resumes/",
         validators=[FileExtensionValidator(allowed_extensions=["pdf"])],
     )
+    file_meta = models.JSONField(default=dict, blank=True, editable=False)
 
     class Meta:
         verbose_name = "Resume"
@@ -284,6 +315,12 @@ class ContactMessage(TimeStampedModel):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["ip_address", "created_at"], name="contact_ip_created_idx"
+            ),
+            models.Index(fields=["-created_at"], name="contact_created_idx"),
+        ]
         verbose_name = "Contact message"
         verbose_name_plural = "Contact messages"
 
@@ -0,0 +1,130 @@
+"""
+Opt-in keyset pagination for the read-only lists.
+
+Lists stay unpaginated unless the client sends ``limit`` or ``cursor``. The
+page then holds the ``limit`` rows that sort after the cursor on the view's
+``keyset_ordering`` (``(order, id)``, or ``(id,)`` for models without an
+``order`` field), so every page is an index range scan whatever the table
+size. The cursor is the unpadded URL-safe base64 of the JSON list of the
+last row's key values; treat it as opaque.
+"""
+
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_cursor(position) -> str:
+    raw = json.dumps(list(position), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token, length) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        position = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise NotFound(KeysetPagination.invalid_cursor_message)
+    if (
+        not isinstance(position, list)
+        or len(position) != length
+        or not all(type(value) is int for value in position)
+    ):
+        raise NotFound(KeysetPagination.invalid_cursor_message)
+    return tuple(position)
+
+
+def _after(ordering, position) -> Q:
+    """
+    Rows sorting strictly after ``position`` on the ``ordering`` fields.
+
+    The leading ``>=`` bound lets the database seek into the index instead of
+    scanning it for the expanded OR.
+    """
+    field, value = ordering[0], position[0]
+    if len(ordering) == 1:
+        return Q(**{f"{field}__gt": value})
+    return Q(**{f"{field}__gte": value}) & (
+        Q(**{f"{field}__gt": value})
+        | Q(**{field: value}) & _after(ordering[1:], position[1:])
+    )
+
+
+class KeysetPagination(BasePagination):
+    limit_query_param = "limit"
+    cursor_query_param = "cursor"
+    default_limit = 20
+    max_limit = 100
+    invalid_cursor_message = "Invalid cursor"
+
+    def is_requested(self, request) -> bool:
+        return (
+            self.limit_query_param in request.GET
+            or self.cursor_query_param in request.GET
+        )
+
+    def get_limit(self, request) -> int:
+        try:
+            limit = int(request.GET[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return min(limit, self.max_limit) if limit > 0 else self.default_limit
+
+    def get_ordering(self, queryset, view) -> tuple:
+        ordering = getattr(view, "keyset_ordering", None)
+        if ordering is None:
+            field_names = {field.name for field in queryset.model._meta.fields}
+            ordering = ("order", "id") if "order" in field_names else ("id",)
+        return tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+        self.request = request
+        self.ordering = self.get_ordering(queryset, view)
+        self.limit = self.get_limit(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        token = request.GET.get(self.cursor_query_param)
+        if token:
+            position = decode_cursor(token, len(self.ordering))
+            queryset = queryset.filter(_after(self.ordering, position))
+        # Probe one row past the page on the index alone to find the next cursor.
+        keys = list(
+            queryset.prefetch_related(None).values_list(*self.ordering)[
+                : self.limit + 1
+            ]
+        )
+        self.next_position = keys[self.limit - 1] if len(keys) > self.limit else None
+        return queryset[: self.limit]
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            encode_cursor(self.next_position),
+        )
+
+    def get_paginated_data(self, data) -> dict:
+        return {"next": self.get_next_link(), "results": data}
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
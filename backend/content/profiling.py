@@ -0,0 +1,171 @@
+"""
+On-demand profiling of single API requests for staff.
+
+A signed-in staff user adds ``?profile=1`` (or an ``X-Profile: 1`` header) to
+a ``GET`` of ``/api/portfolio/`` or any viewset, and the request runs under
+``cProfile``. The response is replaced by a downloadable ``pstats`` report;
+with ``PROFILING_DIR`` set the raw ``.prof`` file is kept there too, for
+``snakeviz`` or ``python -m pstats``.
+
+Production guards: one profiled request per process at a time, at most
+``PROFILING_USER_LIMIT`` profiles per user and ``PROFILING_SITE_LIMIT`` across
+the site per ``PROFILING_WINDOW`` seconds (both kept in the shared cache),
+and a request that misses any of them is served normally with an
+``X-Profile-Skipped`` header saying why.
+"""
+
+import cProfile
+import io
+import pstats
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+from django.utils.text import slugify
+from rest_framework.views import APIView
+
+from . import metrics
+from .ratelimit import CacheSlidingWindowLimiter
+
+REPORT_LINES = 60
+
+# cProfile hooks the whole interpreter, so only one request may be profiled
+# in a process at a time.
+_profiler_lock = threading.Lock()
+
+
+class ProfileLimiter(CacheSlidingWindowLimiter):
+    """Sliding window of profiled requests; nothing to rebuild on a miss."""
+
+    key_prefix = "content:ratelimit:profile"
+
+    def recent_timestamps(self, key) -> list:
+        return []
+
+
+def _limiters():
+    window = timedelta(seconds=settings.PROFILING_WINDOW)
+    return (
+        ProfileLimiter(settings.PROFILING_USER_LIMIT, window),
+        ProfileLimiter(settings.PROFILING_SITE_LIMIT, window),
+    )
+
+
+def is_requested(request) -> bool:
+    flag = request.GET.get("profile") or request.headers.get("X-Profile", "")
+    return flag.lower() in {"1", "true", "yes"}
+
+
+def profiled_view_name(request):
+    """URL name of the DRF view ``request`` targets, or ``None``."""
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return None
+    view_class = getattr(match.func, "cls", None)
+    if view_class is None or not issubclass(view_class, APIView):
+        return None
+    return match.view_name or view_class.__name__
+
+
+def skip_reason(request):
+    """Why this staff request must not be profiled now, or ``None``."""
+    user_limiter, site_limiter = _limiters()
+    user_key = str(request.user.pk)
+    if user_limiter.is_limited(user_key):
+        return "user-throttled"
+    if site_limiter.is_limited("site"):
+        return "site-throttled"
+    return None
+
+
+def build_report(profiler, view_name, response) -> str:
+    stream = io.StringIO()
+    stream.write(
+        f"{view_name}: {response.status_code}, {len(response.content)} bytes\n\n"
+    )
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE)
+    stats.print_stats(REPORT_LINES)
+    return stream.getvalue()
+
+
+def profile_request(get_response, request, view_name):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        response = get_response(request)
+        if hasattr(response, "render"):
+            response.render()  # Include DRF's rendering in the profile.
+    finally:
+        profiler.disable()
+
+    stem = f"profile-{slugify(view_name)}-{time.strftime('%Y%m%d-%H%M%S')}"
+    if settings.PROFILING_DIR:
+        directory = Path(settings.PROFILING_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(directory / f"{stem}.prof")
+
+    report = HttpResponse(
+        build_report(profiler, view_name, response),
+        content_type="text/plain; charset=utf-8",
+    )
+    report["Content-Disposition"] = f'attachment; filename="{stem}.txt"'
+    report["X-Profile-Status"] = str(response.status_code)
+    report["Cache-Control"] = "private, no-store"
+    return report
+
+
+class ProfilingMiddleware:
+    """
+    Run flagged staff requests to DRF views under ``cProfile``.
+
+    Sits after ``AuthenticationMiddleware`` so ``request.user`` is known.
+    Async requests (the ASGI views) pass straight through: a profiler on the
+    event loop would record every other request sharing it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.get_response(request)
+        if not (
+            settings.PROFILING_ENABLED
+            and request.method == "GET"
+            and is_requested(request)
+        ):
+            return self.get_response(request)
+        user = request.user
+        view_name = profiled_view_name(request)
+        if not (user.is_active and user.is_staff) or view_name is None:
+            return self.get_response(request)
+
+        reason = skip_reason(request)
+        if reason is None and not _profiler_lock.acquire(blocking=False):
+            reason = "busy"
+        if reason is not None:
+            metrics.increment("request_profiles_total", result=reason)
+            response = self.get_response(request)
+            response["X-Profile-Skipped"] = reason
+            return response
+
+        try:
+            user_limiter, site_limiter = _limiters()
+            user_limiter.record(str(user.pk))
+            site_limiter.record("site")
+            metrics.increment("request_profiles_total", result="profiled")
+            return profile_request(self.get_response, request, view_name)
+        finally:
+            _profiler_lock.release()
@@ -0,0 +1,144 @@
+"""
+Rate limiters for contact submissions.
+
+A limiter's ``acquire(key)`` checks a submission against the limit and counts
+it in one step, returning ``False`` when it is over the limit; ``cancel(key)``
+hands the slot back when the submission could not be stored.
+``CONTACT_RATE_LIMITER`` selects the implementation.
+"""
+
+import fcntl
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import models
+
+_lock = threading.Lock()
+
+
+class DatabaseRateLimiter:
+    """Count stored messages per IP using the ``(ip_address, created_at)`` index."""
+
+    # Spooled submissions are only stored when the worker ingests them, so a
+    # limiter counting stored rows lets every submission in between through.
+    counts_spooled = False
+
+    def __init__(self, limit: int, window: timedelta):
+        self.limit = limit
+        self.window = window
+
+    def recent_timestamps(self, key) -> list:
+        window_start = timezone.now() - self.window
+        return [
+            created_at.timestamp()
+            for created_at in models.ContactMessage.objects.filter(
+                ip_address=key, created_at__gte=window_start
+            )
+            .order_by()
+            .values_list("created_at", flat=True)
+        ]
+
+    def is_limited(self, key) -> bool:
+        window_start = timezone.now() - self.window
+        recent_count = models.ContactMessage.objects.filter(
+            ip_address=key, created_at__gte=window_start
+        ).count()
+        return recent_count >= self.limit
+
+    def record(self, key) -> None:
+        # The stored message is the record.
+        pass
+
+    def acquire(self, key) -> bool:
+        return not self.is_limited(key)
+
+    def cancel(self, key) -> None:
+        pass
+
+
+class CacheSlidingWindowLimiter(DatabaseRateLimiter):
+    """
+    Sliding-window log of accepted submission times kept in the shared cache.
+
+    On a cache miss (cold cache, eviction) the log is rebuilt from the
+    database once, so limits survive restarts without a query per request.
+    The log is read, checked and written back under a lock held across the
+    threads and processes of one host (``RATE_LIMIT_LOCK_FILE``), so a burst
+    of concurrent requests cannot all pass on the same stale log. The cache
+    has to be shared by every worker: "file" or "redis", not "locmem".
+    """
+
+    key_prefix = "content:ratelimit:contact"
+    counts_spooled = True
+
+    def _cache_key(self, key) -> str:
+        return f"{self.key_prefix}:{key}"
+
+    def _prune(self, entries) -> list:
+        cutoff = time.time() - self.window.total_seconds()
+        return [entry for entry in entries if entry > cutoff]
+
+    def _store(self, key, entries) -> None:
+        cache.set(
+            self._cache_key(key), entries, timeout=int(self.window.total_seconds())
+        )
+
+    def _entries(self, key) -> list:
+        entries = cache.get(self._cache_key(key))
+        if entries is None:
+            # Rebuilt before this submission is stored, so with sync ingestion
+            # its row is not counted on top of the entry added for it.
+            entries = self.recent_timestamps(key)
+        return self._prune(entries)
+
+    @contextmanager
+    def _locked(self):
+        path = Path(settings.RATE_LIMIT_LOCK_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _lock, open(path, "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            yield
+
+    def is_limited(self, key) -> bool:
+        return len(self._entries(key)) >= self.limit
+
+    def record(self, key) -> None:
+        with self._locked():
+            self._store(key, self._entries(key) + [time.time()])
+
+    def acquire(self, key) -> bool:
+        with self._locked():
+            entries = self._entries(key)
+            if len(entries) >= self.limit:
+                return False
+            self._store(key, entries + [time.time()])
+            return True
+
+    def cancel(self, key) -> None:
+        with self._locked():
+            entries = self._entries(key)
+            if entries:
+                self._store(key, entries[:-1])
+
+
+def get_contact_rate_limiter_class():
+    limiter_class = import_string(settings.CONTACT_RATE_LIMITER)
+    if settings.CONTACT_INGESTION == "spool" and not limiter_class.counts_spooled:
+        raise ImproperlyConfigured(
+            f"{settings.CONTACT_RATE_LIMITER} cannot limit spooled contact "
+            "submissions; use CacheSlidingWindowLimiter or CONTACT_INGESTION=sync."
+        )
+    return limiter_class
+
+
+def get_contact_rate_limiter(limit: int, window: timedelta):
+    return get_contact_rate_limiter_class()(limit, window)
@@ -1,6 +1,18 @@
 from rest_framework import serializers
 
-from . import models
+from . import downloads, images, models
+
+
+def get_meta(obj, field_name):
+    return images.build_meta(getattr(obj, images.renditions_field(field_name)))
+
+
+def get_srcset(obj, field_name, context):
+    return images.build_srcset(
+        getattr(obj, field_name).storage,
+        getattr(obj, images.renditions_field(field_name)),
+        context.get("request"),
+    )
 
 
 class NavigationLinkSerializer(serializers.ModelSerializer):
@@ -17,20 +29,30 @@ class ProjectTechSerializer(serializers.ModelSerializer):
 
 class ProjectImageSerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
+    image_srcset = serializers.SerializerMethodField()
+    image_meta = serializers.SerializerMethodField()
 
     class Meta:
         model = models.ProjectImage
-        fields = ("image", "caption")
+        fields = ("image", "image_srcset", "image_meta", "caption")
 
     def get_image(self, obj: models.ProjectImage):
         request = self.context.get("request")
         url = obj.image.url
         return request.build_absolute_uri(url) if request else url
 
+    def get_image_srcset(self, obj: models.ProjectImage):
+        return get_srcset(obj, "image", self.context)
+
+    def get_image_meta(self, obj: models.ProjectImage):
+        return get_meta(obj, "image")
+
 
 class ProjectSerializer(serializers.ModelSerializer):
     tech = ProjectTechSerializer(many=True, read_only=True)
     cover_image = serializers.SerializerMethodField()
+    cover_image_srcset = serializers.SerializerMethodField()
+    cover_image_meta = serializers.SerializerMethodField()
     gallery = ProjectImageSerializer(
         source="gallery_images", many=True, read_only=True
     )
@@ -42,6 +64,8 @@ class ProjectSerializer(serializers.ModelSerializer):
             "subtitle",
             "description",
             "cover_image",
+            "cover_image_srcset",
+            "cover_image_meta",
             "gradient_start",
             "gradient_end",
             "live_url",
@@ -58,11 +82,42 @@ class ProjectSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(url) if request else url
         return None
 
+    def get_cover_image_srcset(self, obj: models.Project):
+        return get_srcset(obj, "cover_image", self.context)
+
+    def get_cover_image_meta(self, obj: models.Project):
+        return get_meta(obj, "cover_image")
+
 
 class TestimonialSerializer(serializers.ModelSerializer):
+    avatar = serializers.SerializerMethodField()
+    avatar_srcset = serializers.SerializerMethodField()
+    avatar_meta = serializers.SerializerMethodField()
+
     class Meta:
         model = models.Testimonial
-        fields = ("author_name", "author_role", "quote", "order")
+        fields = (
+            "author_name",
+            "author_role",
+            "quote",
+            "avatar",
+            "avatar_srcset",
+            "avatar_meta",
+            "order",
+        )
+
+    def get_avatar(self, obj: models.Testimonial):
+        if obj.avatar:
+            request = self.context.get("request")
+            url = obj.avatar.url
+            return request.build_absolute_uri(url) if request else url
+        return None
+
+    def get_avatar_srcset(self, obj: models.Testimonial):
+        return get_srcset(obj, "avatar", self.context)
+
+    def get_avatar_meta(self, obj: models.Testimonial):
+        return get_meta(obj, "avatar")
 
 
 class SocialLinkSerializer(serializers.ModelSerializer):
@@ -85,17 +140,27 @@ class ResumeSerializer(serializers.ModelSerializer):
         fields = ("resume_type", "file")
 
     def get_file(self, obj: models.Resume):
-        request = self.context.get("request")
-        url = obj.file.url
-        return request.build_absolute_uri(url) if request else url
+        return downloads.resume_url(
+            obj.resume_type, obj.file_meta, self.context.get("request")
+        )
 
 
 class SkillItemSerializer(serializers.ModelSerializer):
     logo = serializers.SerializerMethodField()
+    logo_srcset = serializers.SerializerMethodField()
+    logo_meta = serializers.SerializerMethodField()
 
     class Meta:
         model = models.SkillItem
-        fields = ("name", "description", "logo", "logo_url", "order")
+        fields = (
+            "name",
+            "description",
+            "logo",
+            "logo_srcset",
+            "logo_meta",
+            "logo_url",
+            "order",
+        )
 
     def get_logo(self, obj: models.SkillItem):
         if obj.logo:
@@ -104,6 +169,12 @@ class SkillItemSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(url) if request else url
         return None
 
+    def get_logo_srcset(self, obj: models.SkillItem):
+        return get_srcset(obj, "logo", self.context)
+
+    def get_logo_meta(self, obj: models.SkillItem):
+        return get_meta(obj, "logo")
+
 
 class SkillCategorySerializer(serializers.ModelSerializer):
     skills = SkillItemSerializer(many=True, read_only=True)
@@ -122,6 +193,8 @@ class AboutHighlightSerializer(serializers.ModelSerializer):
 class AboutSectionSerializer(serializers.ModelSerializer):
     highlights = AboutHighlightSerializer(many=True, read_only=True)
     profile_image = serializers.SerializerMethodField()
+    profile_image_srcset = serializers.SerializerMethodField()
+    profile_image_meta = serializers.SerializerMethodField()
 
     class Meta:
         model = models.AboutSection
@@ -132,6 +205,8 @@ class AboutSectionSerializer(serializers.ModelSerializer):
             "highlight_quote",
             "highlight_caption",
             "profile_image",
+            "profile_image_srcset",
+            "profile_image_meta",
             "highlights",
         )
 
@@ -141,6 +216,12 @@ class AboutSectionSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(obj.profile_image.url) if request else obj.profile_image.url
         return None
 
+    def get_profile_image_srcset(self, obj: models.AboutSection):
+        return get_srcset(obj, "profile_image", self.context)
+
+    def get_profile_image_meta(self, obj: models.AboutSection):
+        return get_meta(obj, "profile_image")
+
 
 class SiteSettingsSerializer(serializers.ModelSerializer):
     class Meta:
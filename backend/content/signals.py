@@ -0,0 +1,155 @@
+import functools
+import threading
+import weakref
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from . import downloads, images, media, models, snapshots
+
+
+_pending = threading.local()
+
+
+def once_on_commit(key, func) -> None:
+    """
+    Run ``func`` after the current transaction commits, once per ``key`` no
+    matter how many rows (admin inlines) schedule it. The pending callbacks
+    run together, in the order of their latest registration, so a publish
+    still follows the renditions of rows saved after the first one.
+
+    Every registration queues its own drain with ``transaction.on_commit``.
+    A key is forgotten once all of its drains are gone without running,
+    which is what a rollback of the transaction or savepoint does to them.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        transaction.on_commit(func)
+        return
+    pending = _pending.__dict__.setdefault(connection.alias, {})
+    _, drains = pending.pop(key, (None, 0))
+    pending[key] = (func, drains + 1)
+    drain = functools.partial(_run_pending, connection.alias)
+    weakref.finalize(drain, _forget, pending, key)
+    transaction.on_commit(drain)
+
+
+def _forget(pending, key) -> None:
+    if key in pending:
+        func, drains = pending[key]
+        if drains > 1:
+            pending[key] = (func, drains - 1)
+        else:
+            del pending[key]
+
+
+def _run_pending(alias) -> None:
+    pending = _pending.__dict__.pop(alias, {})
+    for func, _ in list(pending.values()):
+        func()
+
+
+def release_on_commit(storage, name, renditions=None):
+    # After commit, so a rolled-back replacement never loses the old file.
+    transaction.on_commit(lambda: media.release(storage, name, renditions))
+
+
+def build_renditions(model, pk) -> None:
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is None:
+        return
+    previous = {
+        field_name: getattr(instance, images.renditions_field(field_name)) or {}
+        for field_name in images.IMAGE_FIELDS[model]
+    }
+    changes = images.refresh_renditions(instance)
+    if changes:
+        # After the row's own save, so updated_at has to move again for the
+        # conditional GET validators to change.
+        model._default_manager.filter(pk=pk).update(
+            **changes, updated_at=timezone.now()
+        )
+    for field_name, renditions in previous.items():
+        fieldfile = getattr(instance, field_name)
+        source = renditions.get("source")
+        if source and source != fieldfile.name:
+            release_on_commit(fieldfile.storage, source, renditions)
+
+
+def update_image_renditions(sender, instance, raw=False, **kwargs):
+    # Encoding takes seconds, so it runs after the commit rather than holding
+    # the write lock. Scheduled before the snapshot bump, which therefore
+    # publishes the new renditions too.
+    if raw:
+        return
+    pk = instance.pk
+    once_on_commit(("renditions", sender, pk), lambda: build_renditions(sender, pk))
+
+
+def release_files(sender, instance, **kwargs):
+    image_fields = images.IMAGE_FIELDS.get(sender, ())
+    for model, field_name in media.file_fields():
+        if model is not sender:
+            continue
+        fieldfile = getattr(instance, field_name)
+        renditions = None
+        if field_name in image_fields:
+            renditions = getattr(instance, images.renditions_field(field_name))
+        release_on_commit(fieldfile.storage, fieldfile.name, renditions)
+
+
+def update_file_meta(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    source = (instance.file_meta or {}).get("source")
+    changes = downloads.refresh_file_meta(instance)
+    if changes:
+        sender.objects.filter(pk=instance.pk).update(**changes)
+        if source and source != instance.file.name:
+            release_on_commit(instance.file.storage, source)
+
+
+def invalidate_portfolio_snapshot(sender, **kwargs):
+    # Bumped after the commit: a bump inside the transaction would let a
+    # concurrent request cache the old rows under the new version.
+    once_on_commit(
+        ("bump", sender), lambda: snapshots.bump_section_versions(sender)
+    )
+    if settings.PORTFOLIO_SNAPSHOT_AUTOPUBLISH:
+        once_on_commit("publish", snapshots.publish_portfolio_snapshot)
+
+
+# Registered before the snapshot receivers so derivatives are recorded before
+# the affected sections are invalidated (both run in on_commit order).
+for model in images.IMAGE_FIELDS:
+    post_save.connect(
+        update_image_renditions,
+        sender=model,
+        dispatch_uid=f"image-renditions-save-{model._meta.model_name}",
+    )
+post_save.connect(
+    update_file_meta,
+    sender=models.Resume,
+    dispatch_uid="file-meta-save-resume",
+)
+
+for model in {model for model, _ in media.file_fields()}:
+    post_delete.connect(
+        release_files,
+        sender=model,
+        dispatch_uid=f"media-release-delete-{model._meta.model_name}",
+    )
+
+for model in snapshots.PORTFOLIO_MODELS:
+    post_save.connect(
+        invalidate_portfolio_snapshot,
+        sender=model,
+        dispatch_uid=f"portfolio-snapshot-save-{model._meta.model_name}",
+    )
+    post_delete.connect(
+        invalidate_portfolio_snapshot,
+        sender=model,
+        dispatch_uid=f"portfolio-snapshot-delete-{model._meta.model_name}",
+    )
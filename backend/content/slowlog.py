@@ -0,0 +1,131 @@
+"""
+Slow-query log.
+
+``install_slow_query_log`` puts ``record_slow_query`` on every connection.
+Queries slower than ``SLOW_QUERY_MS`` are written as one JSON line to the
+``content.slow_queries`` logger (a file, see ``LOGGING``) with their
+duration, the view serving the request and the database's plan for them.
+Bound parameters are logged as type and length only unless
+``SLOW_QUERY_LOG_PARAMS`` is set, as they carry emails, session keys and
+password hashes. ``manage.py slow_query_report`` summarizes the file.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import time
+from logging.handlers import WatchedFileHandler
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+from . import instrumentation
+
+logger = logging.getLogger("content.slow_queries")
+
+MAX_PARAM_LENGTH = 200
+
+_explaining = contextvars.ContextVar("content_slowlog_explaining", default=False)
+
+
+class SlowQueryFileHandler(WatchedFileHandler):
+    """
+    ``WatchedFileHandler`` that creates the log's directory.
+
+    Every gunicorn worker appends to the same file, so none of them may
+    rotate it; logrotate does (``deploy/logrotate-slow-queries``) and each
+    worker reopens the file once it has been moved.
+    """
+
+    def __init__(self, filename, *args, **kwargs):
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(filename, *args, **kwargs)
+
+    def _open(self):
+        stream = super()._open()
+        # SQL text alone can identify users; keep it from other accounts.
+        os.chmod(self.baseFilename, 0o640)
+        return stream
+
+
+def _param(value):
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    text = str(value)
+    if len(text) > MAX_PARAM_LENGTH:
+        return text[:MAX_PARAM_LENGTH] + "..."
+    return text
+
+
+def _redacted(value):
+    """``"<str:12>"`` for sized values, ``"<int>"`` otherwise; ``None`` as is."""
+    if value is None:
+        return None
+    kind = type(value).__name__
+    if isinstance(value, (str, bytes, bytearray, memoryview)):
+        return f"<{kind}:{len(value)}>"
+    return f"<{kind}>"
+
+
+def _explainable(sql) -> bool:
+    # Only reads: explaining writes, DDL or transaction control is not safe.
+    words = sql.lstrip("( \t\n").split(None, 1)
+    return bool(words) and words[0].upper() in ("SELECT", "WITH")
+
+
+def explain(connection, sql, params) -> list:
+    """The plan the database picks for ``sql``, one line per step."""
+    prefix = connection.ops.explain_query_prefix()
+    token = _explaining.set(True)
+    try:
+        with instrumentation.untracked(), connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql}", params)
+            return [str(row[-1]) for row in cursor.fetchall()]
+    except DatabaseError as exc:
+        return [f"EXPLAIN failed: {exc}"]
+    finally:
+        _explaining.reset(token)
+
+
+def record_slow_query(execute, sql, params, many, context):
+    threshold = settings.SLOW_QUERY_MS
+    if threshold <= 0 or _explaining.get():
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration = (time.perf_counter() - start) * 1000
+    if duration >= threshold:
+        connection = context["connection"]
+        # executemany runs one statement per parameter set; explain the first.
+        sample = next(iter(params), None) if many else params
+        describe = _param if settings.SLOW_QUERY_LOG_PARAMS else _redacted
+        logger.warning(
+            json.dumps(
+                {
+                    "at": timezone.now().isoformat(),
+                    "alias": connection.alias,
+                    "view": instrumentation.current_view(),
+                    "duration_ms": round(duration, 2),
+                    "sql": sql,
+                    "params": [describe(value) for value in sample or ()],
+                    "many": many,
+                    "plan": (
+                        explain(connection, sql, sample)
+                        if _explainable(sql)
+                        else []
+                    ),
+                }
+            )
+        )
+    return result
+
+
+def install_slow_query_log(sender, connection, **kwargs):
+    """``connection_created`` receiver; a no-op unless ``SLOW_QUERY_MS`` > 0."""
+    if settings.SLOW_QUERY_MS <= 0:
+        return
+    if record_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_slow_query)
@@ -0,0 +1,387 @@
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpRequest
+from rest_framework.renderers import JSONRenderer
+
+from . import compression, fast_serializers, instrumentation, models, serializers
+
+SECTION_VERSION_KEY_PREFIX = "content:portfolio:version"
+SECTION_KEY_PREFIX = "content:portfolio:section"
+SNAPSHOT_KEY_PREFIX = "content:portfolio:snapshot"
+SNAPSHOT_TIMEOUT = 60 * 60 * 24 * 7
+PUBLISHED_SNAPSHOT_NAME = "portfolio.json"
+
+# Section key -> models its data is read from, in payload order.
+SECTIONS = {
+    "site": (models.SiteSettings,),
+    "navigation": (models.NavigationLink,),
+    "about": (models.AboutSection, models.AboutHighlight),
+    "skills": (models.SkillCategory, models.SkillItem),
+    "projects": (models.Project, models.ProjectTech, models.ProjectImage),
+    "testimonials": (models.Testimonial,),
+    "social_links": (models.SocialLink,),
+    "footer": (models.Footer,),
+    "resumes": (models.Resume,),
+}
+
+PORTFOLIO_MODELS = tuple(
+    model for section_models in SECTIONS.values() for model in section_models
+)
+
+
+def parse_sections(value) -> tuple:
+    """
+    Turn a ``?sections=`` value into section keys in payload order.
+
+    An empty value selects every section; unknown keys raise ``ValueError``.
+    """
+    if not value:
+        return tuple(SECTIONS)
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested.difference(SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}")
+    return tuple(name for name in SECTIONS if name in requested)
+
+
+def get_models_for_sections(sections) -> tuple:
+    return tuple(model for name in sections for model in SECTIONS[name])
+
+
+def _version_key(section) -> str:
+    return f"{SECTION_VERSION_KEY_PREFIX}:{section}"
+
+
+def _new_version() -> int:
+    # Never reused, unlike a counter that restarts when its key is evicted and
+    # would make old fragments under the same number current again.
+    return time.time_ns()
+
+
+def get_section_versions(sections) -> dict:
+    keys = {_version_key(name): name for name in sections}
+    found = cache.get_many(keys)
+    versions = {}
+    for key, name in keys.items():
+        if key not in found:
+            version = _new_version()
+            cache.add(key, version, timeout=None)
+            found[key] = cache.get(key, version)
+        versions[name] = found[key]
+    return versions
+
+
+def bump_section_versions(model) -> list:
+    """Invalidate every section built from ``model``; returns their keys."""
+    sections = [
+        name for name, section_models in SECTIONS.items() if model in section_models
+    ]
+    for name in sections:
+        cache.set(_version_key(name), _new_version(), timeout=None)
+    return sections
+
+
+def _drf_site(request):
+    site_settings = models.SiteSettings.objects.first()
+    if site_settings is None:
+        return None
+    return serializers.SiteSettingsSerializer(
+        site_settings, context={"request": request}
+    ).data
+
+
+def _drf_about(request):
+    about_section = models.AboutSection.objects.first()
+    if about_section is None:
+        return None
+    return serializers.AboutSectionSerializer(
+        about_section, context={"request": request}
+    ).data
+
+
+def _drf_footer(request):
+    footer = models.Footer.objects.first()
+    return serializers.FooterSerializer(footer).data if footer else None
+
+
+DRF_BUILDERS = {
+    "site": _drf_site,
+    "navigation": lambda request: serializers.NavigationLinkSerializer(
+        models.NavigationLink.objects.all(), many=True
+    ).data,
+    "about": _drf_about,
+    "skills": lambda request: serializers.SkillCategorySerializer(
+        models.SkillCategory.objects.prefetch_related("skills").all(),
+        many=True,
+        context={"request": request},
+    ).data,
+    "projects": lambda request: serializers.ProjectSerializer(
+        models.Project.objects.prefetch_related("tech", "gallery_images").all(),
+        many=True,
+        context={"request": request},
+    ).data,
+    "testimonials": lambda request: serializers.TestimonialSerializer(
+        models.Testimonial.objects.all(), many=True, context={"request": request}
+    ).data,
+    "social_links": lambda request: serializers.SocialLinkSerializer(
+        models.SocialLink.objects.all(), many=True
+    ).data,
+    "footer": _drf_footer,
+    "resumes": lambda request: serializers.ResumeSerializer(
+        models.Resume.objects.all(), many=True, context={"request": request}
+    ).data,
+}
+
+FAST_BUILDERS = {
+    "site": fast_serializers.serialize_site_settings,
+    "navigation": lambda request: fast_serializers.serialize_navigation_links(
+        request=request
+    ),
+    "about": fast_serializers.serialize_about_section,
+    "skills": lambda request: fast_serializers.serialize_skill_categories(
+        request=request
+    ),
+    "projects": lambda request: fast_serializers.serialize_projects(request=request),
+    "testimonials": lambda request: fast_serializers.serialize_testimonials(
+        request=request
+    ),
+    "social_links": lambda request: fast_serializers.serialize_social_links(
+        request=request
+    ),
+    "footer": fast_serializers.serialize_footer,
+    "resumes": lambda request: fast_serializers.serialize_resumes(request=request),
+}
+
+
+def build_portfolio_payload(request, engine=None, sections=None) -> dict:
+    engine = engine or settings.CONTENT_SERIALIZER_ENGINE
+    builders = DRF_BUILDERS if engine == "drf" else FAST_BUILDERS
+    return {name: builders[name](request) for name in sections or SECTIONS}
+
+
+def _section_key(name: str, version: int, origin: str) -> str:
+    return f"{SECTION_KEY_PREFIX}:{name}:{version}:{origin}"
+
+
+def _snapshot_key(versions: dict, origin: str) -> str:
+    signature = ",".join(f"{name}.{version}" for name, version in versions.items())
+    # Nanosecond versions make the signature too long for a memcached key.
+    digest = hashlib.sha256(f"{signature}:{origin}".encode()).hexdigest()
+    return f"{SNAPSHOT_KEY_PREFIX}:{digest}"
+
+
+def _get_section_fragments(request, versions: dict, origin: str) -> dict:
+    keys = {
+        _section_key(name, version, origin): name
+        for name, version in versions.items()
+    }
+    cached = cache.get_many(keys)
+    instrumentation.record_cache(True, len(cached))
+    instrumentation.record_cache(False, len(keys) - len(cached))
+    fragments = {keys[key]: fragment for key, fragment in cached.items()}
+    missing = {}
+    renderer = JSONRenderer()
+    for key, name in keys.items():
+        if name not in fragments:
+            with instrumentation.span(
+                "serialize", exclude_db=True
+            ), instrumentation.span(f"section.{name}"):
+                data = build_portfolio_payload(request, sections=[name])[name]
+                # JSONRenderer renders None as an empty body rather than null.
+                fragment = b"null" if data is None else renderer.render(data)
+            fragments[name] = missing[key] = fragment
+    if missing:
+        cache.set_many(missing, timeout=SNAPSHOT_TIMEOUT)
+    return fragments
+
+
+class _PublicRequest(HttpRequest):
+    """A GET of /api/portfolio/ as seen at ``base_url``, for absolute URLs."""
+
+    def __init__(self, base_url):
+        super().__init__()
+        parts = urlsplit(base_url)
+        self.method = "GET"
+        self.path = self.path_info = "/api/portfolio/"
+        self.META["HTTP_HOST"] = parts.netloc
+        self._scheme = parts.scheme
+
+    def _get_scheme(self):
+        return self._scheme
+
+
+def _base_url(base_url=None, request=None) -> str:
+    """``base_url``, else ``PORTFOLIO_PUBLIC_URL``, else the host of ``request``."""
+    base_url = base_url or settings.PORTFOLIO_PUBLIC_URL
+    if base_url:
+        return base_url
+    if request is None:
+        raise ImproperlyConfigured(
+            "Set PORTFOLIO_PUBLIC_URL (or pass base_url) to render the portfolio "
+            "outside a request; its media URLs would not point at the site."
+        )
+    return request.build_absolute_uri("/")
+
+
+def _public_request(base_url):
+    return _PublicRequest(base_url)
+
+
+def _origin(base_url) -> str:
+    parts = urlsplit(base_url)
+    return f"{parts.scheme}://{parts.netloc}/"
+
+
+def get_portfolio_variants(
+    sections=None, base_url=None, best=False, request=None
+) -> dict:
+    """
+    Return the rendered aggregate payload for ``sections`` keyed by content
+    encoding.
+
+    Each section is rendered and cached on its own under its own version, so
+    editing one model only re-renders the sections built from it. Media URLs
+    are absolute and built from ``PORTFOLIO_PUBLIC_URL`` (or ``base_url``)
+    rather than the client's Host header, which would let any client add
+    cache entries; only when the setting is unset does ``request``'s host
+    stand in. ``best`` compresses a miss at the highest (slow) brotli quality.
+    """
+    sections = tuple(sections or SECTIONS)
+    base_url = _base_url(base_url, request)
+    origin = _origin(base_url)
+    versions = get_section_versions(sections)
+    key = _snapshot_key(versions, origin)
+    variants = cache.get(key)
+    instrumentation.record_cache(variants is not None)
+    if variants is None:
+        fragments = _get_section_fragments(
+            _public_request(base_url), versions, origin
+        )
+        # Same bytes JSONRenderer produces for the whole dict (compact separators).
+        content = b"{%s}" % b",".join(
+            b'"%s":%s' % (name.encode(), fragments[name]) for name in sections
+        )
+        with instrumentation.span("compress"):
+            variants = compression.compress_variants(content, best=best)
+        cache.set(key, variants, timeout=SNAPSHOT_TIMEOUT)
+    return variants
+
+
+def get_portfolio_snapshot(sections=None, request=None) -> bytes:
+    return get_portfolio_variants(sections, request=request)[compression.IDENTITY]
+
+
+def get_section_fragment(name: str, request=None) -> bytes:
+    """Rendered JSON for a single section, as served by its list endpoint."""
+    base_url = _base_url(request=request)
+    versions = get_section_versions([name])
+    return _get_section_fragments(
+        _public_request(base_url), versions, _origin(base_url)
+    )[name]
+
+
+async def _aget_cached(keys, build_key):
+    """
+    Look ``keys`` versions up with the async cache API and return the cached
+    value under ``build_key(versions)``, or ``None`` on any miss.
+    """
+    found = await cache.aget_many(keys)
+    if len(found) != len(keys):
+        return None
+    versions = {name: found[key] for key, name in keys.items()}
+    return await cache.aget(build_key(versions))
+
+
+async def aget_portfolio_variants(sections=None, request=None) -> dict:
+    """Async cache-hit path for ``get_portfolio_variants``."""
+    sections = tuple(sections or SECTIONS)
+    origin = _origin(_base_url(request=request))
+    keys = {_version_key(name): name for name in sections}
+    variants = await _aget_cached(
+        keys, lambda versions: _snapshot_key(versions, origin)
+    )
+    if variants is None:
+        # The sync path records its own hits and misses.
+        variants = await sync_to_async(get_portfolio_variants)(
+            sections, request=request
+        )
+    else:
+        instrumentation.record_cache(True)
+    return variants
+
+
+async def aget_section_fragment(name: str, request=None) -> bytes:
+    """Async cache-hit path for ``get_section_fragment``."""
+    origin = _origin(_base_url(request=request))
+    fragment = await _aget_cached(
+        {_version_key(name): name},
+        lambda versions: _section_key(name, versions[name], origin),
+    )
+    if fragment is None:
+        fragment = await sync_to_async(get_section_fragment)(name, request)
+    else:
+        instrumentation.record_cache(True)
+    return fragment
+
+
+def warm_portfolio_cache(base_url=None) -> None:
+    """Render the full payload and every single section into the cache."""
+    get_portfolio_variants(base_url=base_url, best=True)
+    for name in SECTIONS:
+        get_portfolio_variants(sections=[name], base_url=base_url, best=True)
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def publish_portfolio_snapshot(output_dir=None, base_url=None, keep=3) -> Path:
+    """
+    Render the aggregate payload to ``output_dir`` for nginx to serve.
+
+    Writes ``portfolio.<hash>.json`` plus ``portfolio.json`` (same bytes) with
+    their ``.gz``/``.br`` variants, all atomically, and prunes all but the
+    newest ``keep`` hashed files.
+    """
+    output_dir = Path(output_dir or settings.PORTFOLIO_SNAPSHOT_ROOT)
+    content = get_portfolio_variants(base_url=base_url)[compression.IDENTITY]
+    # The cached variants may have come from the fast request-path settings.
+    variants = compression.compress_variants(content, best=True)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256(content).hexdigest()[:16]
+    hashed_path = output_dir / f"portfolio.{digest}.json"
+    for path in (hashed_path, output_dir / PUBLISHED_SNAPSHOT_NAME):
+        # Precompressed siblings are picked up by nginx's gzip_static/brotli_static.
+        for encoding, suffix in (("gzip", ".gz"), ("br", ".br")):
+            if encoding in variants:
+                _write_atomic(path.with_name(path.name + suffix), variants[encoding])
+        _write_atomic(path, content)
+
+    hashed = sorted(
+        output_dir.glob("portfolio.*.json"),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for stale in hashed[keep:]:
+        if stale != hashed_path:
+            for suffix in ("", ".gz", ".br"):
+                stale.with_name(stale.name + suffix).unlink(missing_ok=True)
+    return hashed_path
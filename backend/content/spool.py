@@ -0,0 +1,175 @@
+"""
+File-backed spool for contact submissions.
+
+The API validates a submission and drops it into ``CONTACT_SPOOL_DIR/new``
+with an atomic rename, so the request never waits on a database write. The
+``process_contact_spool`` command claims files by renaming them into
+``processing/``, inserts them in one batch and mails a digest.
+"""
+
+import datetime
+import json
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.mail import send_mail
+from django.db import DatabaseError, OperationalError
+
+from . import models, writes
+
+NEW = "new"
+PROCESSING = "processing"
+FAILED = "failed"
+
+
+def _spool_dir(name: str) -> Path:
+    path = Path(settings.CONTACT_SPOOL_DIR) / name
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def enqueue_contact_message(ip_address: str, data: dict) -> Path:
+    payload = dict(data, ip_address=ip_address, submitted_at=time.time())
+    target = _spool_dir(NEW) / f"{time.time_ns()}-{uuid.uuid4().hex}.json"
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return target
+
+
+def requeue_stale(max_age: float = 300) -> int:
+    """Return files left in ``processing/`` by a crashed worker to ``new/``."""
+    cutoff = time.time() - max_age
+    requeued = 0
+    for path in _spool_dir(PROCESSING).glob("*.json"):
+        if path.stat().st_mtime < cutoff:
+            os.replace(path, _spool_dir(NEW) / path.name)
+            requeued += 1
+    return requeued
+
+
+def claim_batch(limit: int) -> list:
+    claimed = []
+    processing = _spool_dir(PROCESSING)
+    for path in sorted(_spool_dir(NEW).glob("*.json"))[:limit]:
+        target = processing / path.name
+        try:
+            os.replace(path, target)
+        except FileNotFoundError:
+            continue  # Claimed by another worker.
+        os.utime(target)
+        claimed.append(target)
+    return claimed
+
+
+# Errors caused by the row itself: retrying the same values cannot succeed.
+ROW_ERRORS = (DatabaseError, ValidationError, ValueError, TypeError)
+
+
+def _store(entries) -> list:
+    messages = models.ContactMessage.objects.bulk_create(
+        models.ContactMessage(**row) for row, _ in entries
+    )
+    # auto_now_add stamps ingestion time; keep the submission time so the
+    # rate limiter's database fallback sees the real window.
+    for message, (_, timestamp) in zip(messages, entries):
+        message.created_at = datetime.datetime.fromtimestamp(
+            timestamp, tz=datetime.timezone.utc
+        )
+    models.ContactMessage.objects.bulk_update(messages, ["created_at"])
+    return messages
+
+
+def _write(entries) -> list:
+    return writes.serialized_write(lambda: _store(entries), name="contact_spool")
+
+
+def _ingest(loaded) -> list:
+    if not loaded:
+        return []
+    try:
+        messages = _write(list(loaded.values()))
+    except OperationalError:
+        raise
+    except ROW_ERRORS:
+        pass
+    else:
+        for path in loaded:
+            path.unlink()
+        return messages
+
+    messages = []
+    for path, entry in loaded.items():
+        try:
+            messages += _write([entry])
+        except OperationalError:
+            raise
+        except ROW_ERRORS:
+            os.replace(path, _spool_dir(FAILED) / path.name)
+        else:
+            path.unlink()
+    return messages
+
+
+def ingest_batch(limit: int = 100) -> list:
+    """
+    Insert up to ``limit`` spooled submissions; returns the saved messages.
+
+    Files that cannot be parsed or stored go to ``failed/``. When the batch
+    insert fails, its rows are retried one at a time so a single bad file
+    does not hold back the others.
+    """
+    paths = claim_batch(limit)
+    loaded = {}
+    for path in paths:
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            row = {
+                field: payload[field]
+                for field in ("name", "email", "project", "message", "ip_address")
+            }
+            submitted_at = float(payload["submitted_at"])
+        except (ValueError, KeyError, TypeError):
+            os.replace(path, _spool_dir(FAILED) / path.name)
+            continue
+        loaded[path] = (row, submitted_at)
+
+    try:
+        return _ingest(loaded)
+    except OperationalError:
+        # Hand what is left back for the next pass instead of stranding it.
+        for path in loaded:
+            if path.exists():
+                os.replace(path, _spool_dir(NEW) / path.name)
+        raise
+
+
+def send_digest(messages) -> int:
+    recipients = settings.CONTACT_NOTIFICATION_EMAILS
+    if not messages or not recipients:
+        return 0
+    body = "\n\n".join(
+        f"From: {message.name} <{message.email}>\n"
+        f"Project: {message.project}\n"
+        f"IP: {message.ip_address}\n\n"
+        f"{message.message}"
+        for message in messages
+    )
+    return send_mail(
+        subject=f"{len(messages)} new contact message(s)",
+        message=body,
+        from_email=None,
+        recipient_list=recipients,
+    )
@@ -0,0 +1,54 @@
+"""
+Content-addressed media storage.
+
+``ContentAddressedStorage`` names every saved file after the SHA-256 of its
+bytes, keeping the directory ``upload_to`` chose and the extension, e.g.
+``projects/<digest>.jpg``. A name therefore always refers to the same bytes,
+so ``/media/`` can be cached as immutable, and saving bytes that are already
+stored returns the existing name instead of writing a copy. Files shared that
+way are only deleted once nothing references them (``content.media``).
+"""
+
+import hashlib
+import os
+import posixpath
+import re
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.files.utils import validate_file_name
+
+DIGEST_LENGTH = 32
+
+_HASHED_STEM = re.compile(rf"[0-9a-f]{{{DIGEST_LENGTH}}}")
+
+
+def is_content_addressed(name) -> bool:
+    stem = posixpath.splitext(posixpath.basename(name or ""))[0]
+    return bool(_HASHED_STEM.fullmatch(stem))
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def hashed_name(self, name, content) -> str:
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        directory, filename = posixpath.split(name)
+        extension = posixpath.splitext(filename)[1].lower()
+        return posixpath.join(
+            directory, f"{digest.hexdigest()[:DIGEST_LENGTH]}{extension}"
+        )
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = self.hashed_name(str(name).replace("\\", "/"), content)
+        validate_file_name(name, allow_relative_path=True)
+        if self.exists(name):
+            # Refresh the mtime so a garbage-collection sweep running before
+            # the referencing row is committed still sees a recent file.
+            os.utime(self.path(name))
+            return name
+        return super().save(name, content, max_length=max_length)
@@ -1,3 +1,1488 @@
-from django.test import TestCase
+import base64
+import gzip
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import runpy
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.utils import ConnectionHandler
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.utils import timezone
+from PIL import Image
+from rest_framework.renderers import JSONRenderer
+
+from . import (
+    compression,
+    downloads,
+    images,
+    instrumentation,
+    media,
+    metrics,
+    models,
+    ratelimit,
+    serializers,
+    signals,
+    slowlog,
+    snapshots,
+    spool,
+    viewsets,
+    writes,
+)
+from .benchmarks import api as benchmark_api
+from .benchmarks.dataset import seed_dataset
+from .pagination import _after, encode_cursor
+from .storage import ContentAddressedStorage, is_content_addressed
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite syntax")
+class QueryPlanTests(TestCase):
+    """The hot read and rate-limit queries are served by the composite indexes."""
+
+    def assertUsesIndex(self, queryset, index_name, sorted_by_index=True):
+        plan = queryset.explain()
+        self.assertIn(f"USING INDEX {index_name}", plan)
+        if sorted_by_index:
+            self.assertNotIn("USE TEMP B-TREE FOR ORDER BY", plan)
+
+    def test_children_by_parent_in_order(self):
+        self.assertUsesIndex(
+            models.SkillItem.objects.filter(category_id=1), "skill_item_order_idx"
+        )
+        self.assertUsesIndex(
+            models.ProjectTech.objects.filter(project_id=1), "project_tech_order_idx"
+        )
+        self.assertUsesIndex(
+            models.AboutHighlight.objects.filter(section_id=1),
+            "about_highlight_order_idx",
+        )
+
+    def test_prefetch_lookup(self):
+        # Batched prefetches still find rows through the index; the sort across
+        # parents is left to SQLite.
+        self.assertUsesIndex(
+            models.SkillItem.objects.filter(category_id__in=[1, 2, 3]),
+            "skill_item_order_idx",
+            sorted_by_index=False,
+        )
+
+    def test_keyset_page(self):
+        for model, index_name in (
+            (models.Project, "project_order_idx"),
+            (models.SkillCategory, "skill_category_order_idx"),
+            (models.Testimonial, "testimonial_order_idx"),
+        ):
+            with self.subTest(model=model.__name__):
+                page = model.objects.filter(_after(("order", "id"), (3, 10)))
+                page = page.order_by("order", "id")[:20]
+                self.assertUsesIndex(page, index_name)
+                self.assertIn(f"SEARCH {model._meta.db_table}", page.explain())
+
+    def test_contact_rate_limit_window(self):
+        window_start = timezone.now() - timedelta(hours=1)
+        self.assertUsesIndex(
+            models.ContactMessage.objects.filter(
+                ip_address="10.0.0.1", created_at__gte=window_start
+            ),
+            "contact_ip_created_idx",
+            sorted_by_index=False,
+        )
+
+    def test_contact_changelist(self):
+        self.assertUsesIndex(
+            models.ContactMessage.objects.all()[:100], "contact_created_idx"
+        )
+
+
+@skipUnless(connection.vendor == "sqlite", "checks SQLite PRAGMAs")
+class SqliteProfileTests(SimpleTestCase):
+    def test_production_profile_applies_pragmas(self):
+        with mock.patch.dict(os.environ, {"DJANGO_DATABASE_PROFILE": "production"}):
+            profile = runpy.run_path(
+                str(settings.BASE_DIR / "backend" / "settings.py")
+            )
+        directory = tempfile.TemporaryDirectory(prefix="content-sqlite-")
+        self.addCleanup(directory.cleanup)
+        database = dict(
+            profile["DATABASES"]["default"],
+            NAME=os.path.join(directory.name, "profile.sqlite3"),
+        )
+        # A handler needs a "default" alias, which SimpleTestCase refuses to
+        # connect to, so the profile database gets an alias of its own.
+        handler = ConnectionHandler({"default": {}, "profile": database})
+        self.addCleanup(handler.close_all)
+
+        with override_settings(SQLITE_PRAGMAS=profile["SQLITE_PRAGMAS"]):
+            with handler["profile"].cursor() as cursor:
+                pragmas = {}
+                for name in ("journal_mode", "busy_timeout", "synchronous"):
+                    cursor.execute(f"PRAGMA {name}")
+                    pragmas[name] = cursor.fetchone()[0]
+        self.assertEqual(
+            pragmas, {"journal_mode": "wal", "busy_timeout": 5000, "synchronous": 1}
+        )
+
+
+class RangeParsingTests(SimpleTestCase):
+    def test_ranges(self):
+        for header, expected in (
+            ("bytes=0-9", (0, 9)),
+            ("bytes=10-", (10, 99)),
+            ("bytes=-5", (95, 99)),
+            ("bytes=90-500", (90, 99)),
+            ("bytes=-500", (0, 99)),
+            ("bytes=9-0", None),
+            ("bytes=0-1,5-6", None),
+            ("items=0-9", None),
+        ):
+            with self.subTest(header=header):
+                self.assertEqual(downloads.parse_range(header, 100), expected)
+
+    def test_unsatisfiable(self):
+        for header in ("bytes=100-", "bytes=-0"):
+            with self.subTest(header=header):
+                with self.assertRaises(downloads.UnsatisfiableRange):
+                    downloads.parse_range(header, 100)
+
+
+class SpanTests(SimpleTestCase):
+    def test_exclude_db(self):
+        timings = instrumentation.RequestTimings()
+        token = instrumentation._current.set(timings)
+        self.addCleanup(instrumentation._current.reset, token)
+        for exclude_db in (False, True):
+            with instrumentation.span(f"exclude_db={exclude_db}", exclude_db):
+                time.sleep(0.02)
+                timings.db_time += 0.015  # As if a query ran inside the span.
+        self.assertGreaterEqual(timings.spans["exclude_db=False"], 0.02)
+        self.assertLess(timings.spans["exclude_db=True"], 0.015)
+
+
+class ContentAddressedStorageTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory(prefix="content-storage-")
+        self.addCleanup(directory.cleanup)
+        self.storage = ContentAddressedStorage(location=directory.name)
+
+    def test_names_follow_content(self):
+        first = self.storage.save("projects/Cover.JPG", ContentFile(b"one"))
+        again = self.storage.save("projects/renamed.jpg", ContentFile(b"one"))
+        other = self.storage.save("projects/Cover.JPG", ContentFile(b"two"))
+        self.assertEqual(first, again)
+        self.assertNotEqual(first, other)
+        self.assertTrue(first.startswith("projects/") and first.endswith(".jpg"))
+        self.assertTrue(is_content_addressed(first))
+        self.assertEqual(len(os.listdir(self.storage.path("projects"))), 2)
+
+
+def _image_file(color="#336699", size=(64, 48)) -> ContentFile:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return ContentFile(buffer.getvalue())
+
+
+class TemporaryMediaMixin:
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory(prefix="content-media-")
+        self.addCleanup(directory.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=directory.name))
+
+
+class RenditionSignalTests(TemporaryMediaMixin, TestCase):
+    def test_renditions_are_built_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            testimonial = models.Testimonial(author_name="Ada", quote="Great.")
+            testimonial.avatar.save("ada.png", _image_file(), save=True)
+            testimonial.refresh_from_db()
+            self.assertEqual(testimonial.avatar_renditions, {})
+        self.assertTrue(callbacks)
+
+        testimonial.refresh_from_db()
+        renditions = testimonial.avatar_renditions
+        self.assertEqual(renditions["source"], testimonial.avatar.name)
+        self.assertEqual(renditions["width"], 64)
+        self.assertTrue(renditions["formats"]["jpeg"])
+
+    def test_shared_file_is_encoded_once(self):
+        with mock.patch.object(
+            images, "generate_renditions", wraps=images.generate_renditions
+        ) as generate:
+            for name in ("Ada", "Grace"):
+                with self.captureOnCommitCallbacks(execute=True):
+                    testimonial = models.Testimonial(author_name=name, quote="")
+                    testimonial.avatar.save("avatar.png", _image_file(), save=True)
+        generate.assert_called_once()
+
+        first, second = models.Testimonial.objects.order_by("pk")
+        self.assertEqual(second.avatar.name, first.avatar.name)
+        self.assertEqual(second.avatar_renditions, first.avatar_renditions)
+
+    @override_settings(PORTFOLIO_SNAPSHOT_AUTOPUBLISH=True)
+    def test_command_builds_and_publishes(self):
+        name = default_storage.save("testimonials/ada.png", _image_file())
+        for author_name in ("Ada", "Grace"):
+            # Rows written without post_save, as seed_portfolio --scale does.
+            models.Testimonial.objects.bulk_create(
+                [models.Testimonial(author_name=author_name, quote="", avatar=name)]
+            )
+
+        with mock.patch.object(snapshots, "publish_portfolio_snapshot") as publish:
+            call_command("build_image_renditions", stdout=StringIO())
+            publish.assert_called_once_with()
+            publish.reset_mock()
+            call_command("build_image_renditions", stdout=StringIO())
+            publish.assert_not_called()
+
+        renditions = [row.avatar_renditions for row in models.Testimonial.objects.all()]
+        self.assertEqual(renditions[0]["source"], name)
+        self.assertEqual(renditions[0], renditions[1])
+
+    def test_meta_in_api_payload(self):
+        self.enterContext(mock.patch.object(instrumentation.logger, "disabled", True))
+        with self.captureOnCommitCallbacks(execute=True):
+            testimonial = models.Testimonial(author_name="Ada", quote="", order=0)
+            testimonial.avatar.save(
+                "ada.png", _image_file("#336699", (64, 48)), save=True
+            )
+            models.Testimonial.objects.create(author_name="Grace", quote="", order=1)
+
+        for engine in ("drf", "fast"):
+            with self.subTest(engine=engine), override_settings(
+                CONTENT_SERIALIZER_ENGINE=engine
+            ):
+                with_avatar, without_avatar = self.client.get(
+                    "/api/testimonials/"
+                ).json()
+                meta = with_avatar["avatar_meta"]
+                self.assertEqual(
+                    (meta["width"], meta["height"], meta["color"]),
+                    (64, 48, "#336699"),
+                )
+                header, _, data = meta["placeholder"].partition(",")
+                self.assertRegex(header, r"^data:image/(webp|png);base64$")
+                placeholder = Image.open(io.BytesIO(base64.b64decode(data)))
+                self.assertLessEqual(max(placeholder.size), images.PLACEHOLDER_SIZE)
+                self.assertIsNone(without_avatar["avatar_meta"])
+
+    def test_meta_without_renditions(self):
+        self.assertIsNone(images.build_meta(None))
+        self.assertIsNone(images.build_meta({}))
+        # Recorded for an upload that could not be decoded.
+        self.assertIsNone(images.build_meta({"source": "a.png", "formats": {}}))
+
+    def test_oversized_upload_is_recorded_not_raised(self):
+        with mock.patch.object(
+            Image, "MAX_IMAGE_PIXELS", 100
+        ), self.captureOnCommitCallbacks(execute=True):
+            testimonial = models.Testimonial(author_name="Ada", quote="Great.")
+            testimonial.avatar.save("ada.png", _image_file(), save=True)
+
+        testimonial.refresh_from_db()
+        self.assertEqual(
+            testimonial.avatar_renditions,
+            {"source": testimonial.avatar.name, "formats": {}},
+        )
+
+
+class ResumeDownloadTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.enterContext(mock.patch.object(instrumentation.logger, "disabled", True))
+        self.body = b"%PDF-1.4\n" + bytes(range(256)) * 4
+        self.resume = models.Resume(resume_type=models.Resume.TYPE_ATS)
+        self.resume.file.save("cv.pdf", ContentFile(self.body), save=True)
+        self.resume.refresh_from_db()
+        self.url = downloads.resume_url("ats", self.resume.file_meta)
+
+    def test_latest_redirects_to_digest(self):
+        response = self.client.get("/api/resumes/ats/download/")
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], self.url)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+    def test_full_range_and_conditional(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.body)
+        self.assertEqual(response["Cache-Control"], downloads.IMMUTABLE)
+        etag = response["ETag"]
+
+        response = self.client.get(self.url, HTTP_RANGE="bytes=0-9")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], f"bytes 0-9/{len(self.body)}")
+        self.assertEqual(b"".join(response.streaming_content), self.body[:10])
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_meta_is_backfilled_by_migration_not_by_downloads(self):
+        models.Resume.objects.filter(pk=self.resume.pk).update(file_meta={})
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/resumes/ats/download/")
+        self.assertEqual(response.status_code, 404)
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.file_meta, {})
+
+        migration = importlib.import_module(
+            "content.migrations.0008_backfill_resume_file_meta"
+        )
+        migration.backfill_file_meta(django_apps, None)
+        response = self.client.get("/api/resumes/ats/download/")
+        self.assertEqual(response["Location"], self.url)
+
+    @override_settings(MEDIA_ACCEL_REDIRECT_PREFIX="/protected-media/")
+    def test_accel_redirect(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected-media/{self.resume.file.name}"
+        )
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["Content-Type"], "application/pdf")
+
+
+def rendition_names(renditions) -> list:
+    return [
+        entry["name"] for entries in renditions["formats"].values() for entry in entries
+    ]
+
+
+class MediaReleaseTests(TemporaryMediaMixin, TestCase):
+    def create_testimonial(self, name):
+        with self.captureOnCommitCallbacks(execute=True):
+            testimonial = models.Testimonial(author_name=name, quote="")
+            testimonial.avatar.save("avatar.png", _image_file(), save=True)
+        testimonial.refresh_from_db()
+        return testimonial
+
+    def delete(self, instance):
+        with self.captureOnCommitCallbacks(execute=True):
+            instance.delete()
+
+    def test_shared_file_released_with_last_reference(self):
+        first = self.create_testimonial("Ada")
+        second = self.create_testimonial("Grace")
+        name = first.avatar.name
+        self.assertEqual(second.avatar.name, name)
+        derivatives = rendition_names(first.avatar_renditions)
+        self.assertTrue(derivatives)
+
+        self.delete(first)
+        self.assertTrue(default_storage.exists(name))
+        self.assertTrue(all(default_storage.exists(path) for path in derivatives))
+
+        self.delete(second)
+        self.assertFalse(default_storage.exists(name))
+        self.assertFalse(any(default_storage.exists(path) for path in derivatives))
+
+    def test_forced_rebuild_keeps_shared_derivatives(self):
+        first = self.create_testimonial("Ada")
+        self.create_testimonial("Grace")
+        old = set(rendition_names(first.avatar_renditions))
+
+        jpeg = ("JPEG", "jpg", {"quality": 30})
+        with mock.patch.dict(images.DERIVATIVE_FORMATS, jpeg=jpeg), mock.patch.object(
+            images, "generate_renditions", wraps=images.generate_renditions
+        ) as generate:
+            call_command("build_image_renditions", "--force", stdout=StringIO())
+        generate.assert_called_once()
+
+        renditions = [row.avatar_renditions for row in models.Testimonial.objects.all()]
+        self.assertEqual(renditions[0], renditions[1])
+        new = set(rendition_names(renditions[0]))
+        self.assertTrue(all(default_storage.exists(name) for name in new))
+        stale = old - new
+        self.assertTrue(stale)
+        self.assertFalse(any(default_storage.exists(name) for name in stale))
+
+    def test_collect_garbage(self):
+        kept = self.create_testimonial("Ada").avatar.name
+        orphan = default_storage.save("orphans/old.txt", ContentFile(b"old"))
+        recent = default_storage.save("orphans/new.txt", ContentFile(b"new"))
+        old = time.time() - 7200
+        for name in (kept, orphan):
+            os.utime(default_storage.path(name), (old, old))
+
+        self.assertEqual(media.collect_garbage(min_age=3600, dry_run=True), [orphan])
+        self.assertTrue(default_storage.exists(orphan))
+
+        self.assertEqual(media.collect_garbage(min_age=3600), [orphan])
+        self.assertFalse(default_storage.exists(orphan))
+        self.assertTrue(default_storage.exists(kept))
+        self.assertTrue(default_storage.exists(recent))
+
+
+class SerializerEngineTests(TemporaryMediaMixin, TestCase):
+    """The fast serializers render byte-for-byte what the DRF ones do."""
+
+    def setUp(self):
+        super().setUp()
+        seed_dataset(projects=3)
+        with self.captureOnCommitCallbacks(execute=True):
+            for model, field_names in images.IMAGE_FIELDS.items():
+                instance = model.objects.first()
+                for field_name in field_names:
+                    getattr(instance, field_name).save(
+                        f"{field_name}.png", _image_file(), save=True
+                    )
+
+    def test_sections_match(self):
+        request = RequestFactory().get("/api/portfolio/")
+        renderer = JSONRenderer()
+        for name in snapshots.SECTIONS:
+            with self.subTest(section=name):
+                drf, fast = (
+                    renderer.render(
+                        snapshots.build_portfolio_payload(
+                            request, engine=engine, sections=[name]
+                        )
+                    )
+                    for engine in ("drf", "fast")
+                )
+                self.assertEqual(drf, fast)
+                if name in ("about", "skills", "projects", "testimonials"):
+                    self.assertIn(b"http://testserver/media/derivatives/", fast)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class ContactRateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        directory = tempfile.TemporaryDirectory(prefix="content-spool-")
+        self.addCleanup(directory.cleanup)
+        self.enterContext(
+            override_settings(
+                CONTACT_SPOOL_DIR=directory.name,
+                RATE_LIMIT_LOCK_FILE=os.path.join(directory.name, "ratelimit.lock"),
+            )
+        )
+        self.enterContext(mock.patch.object(instrumentation.logger, "disabled", True))
+
+    def submit(self):
+        return self.client.post(
+            "/api/contact-messages/",
+            {
+                "name": "Ada",
+                "email": "ada@example.com",
+                "project": "Website",
+                "message": "Hello!",
+            },
+            REMOTE_ADDR="10.0.0.1",
+        )
+
+    def assertLimitedAfter(self, limit):
+        for _ in range(limit):
+            self.assertEqual(self.submit().status_code, 201)
+        response = self.submit()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(metrics.get("contact_rate_limited_total"), 1)
+
+    @override_settings(
+        CONTACT_RATE_LIMITER="content.ratelimit.DatabaseRateLimiter",
+        CONTACT_INGESTION="sync",
+    )
+    def test_database_limiter(self):
+        metrics.reset()
+        self.assertLimitedAfter(3)
+        self.assertEqual(models.ContactMessage.objects.count(), 3)
+
+    @override_settings(
+        CONTACT_RATE_LIMITER="content.ratelimit.CacheSlidingWindowLimiter",
+        CONTACT_INGESTION="spool",
+    )
+    def test_cache_limiter(self):
+        metrics.reset()
+        self.assertLimitedAfter(3)
+
+    @override_settings(
+        CONTACT_RATE_LIMITER="content.ratelimit.DatabaseRateLimiter",
+        CONTACT_INGESTION="spool",
+    )
+    def test_database_limiter_rejects_spool(self):
+        with self.assertRaises(ImproperlyConfigured):
+            ratelimit.get_contact_rate_limiter(3, timedelta(hours=24))
+
+    @override_settings(
+        CONTACT_RATE_LIMITER="content.ratelimit.CacheSlidingWindowLimiter",
+        CONTACT_INGESTION="sync",
+    )
+    def test_cache_limiter_rebuilds_without_double_counting(self):
+        metrics.reset()
+        self.assertEqual(self.submit().status_code, 201)
+        cache.clear()  # Evicted: the log is rebuilt from the stored row.
+        self.assertLimitedAfter(2)
+        self.assertEqual(models.ContactMessage.objects.count(), 3)
+
+    def test_cache_limiter_admits_limit_under_concurrency(self):
+        limiter = ratelimit.CacheSlidingWindowLimiter(3, timedelta(hours=1))
+        self.enterContext(
+            mock.patch.object(limiter, "recent_timestamps", return_value=[])
+        )
+        threads = 12
+        barrier = threading.Barrier(threads)
+
+        def submit(_):
+            barrier.wait()
+            return limiter.acquire("10.0.0.1")
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            accepted = list(pool.map(submit, range(threads)))
+        self.assertEqual(accepted.count(True), 3)
+        self.assertEqual(len(cache.get(limiter._cache_key("10.0.0.1"))), 3)
+
+
+class SnapshotInvalidationTests(TestCase):
+    @override_settings(PORTFOLIO_SNAPSHOT_AUTOPUBLISH=True)
+    def test_one_publish_per_save(self):
+        with mock.patch.object(
+            snapshots, "publish_portfolio_snapshot"
+        ) as publish, self.captureOnCommitCallbacks(execute=True):
+            project = models.Project.objects.create(title="Site", description="")
+            for order, name in enumerate(("Django", "React", "SQLite")):
+                models.ProjectTech.objects.create(
+                    project=project, name=name, order=order
+                )
+            publish.assert_not_called()
+        publish.assert_called_once_with()
+
+    @override_settings(PORTFOLIO_SNAPSHOT_AUTOPUBLISH=True)
+    def test_rollback_does_not_swallow_next_publish(self):
+        with mock.patch.object(
+            snapshots, "publish_portfolio_snapshot"
+        ) as publish, mock.patch.object(snapshots, "bump_section_versions") as bump:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                models.Project.objects.create(title="Draft", description="")
+                raise RuntimeError
+            with self.captureOnCommitCallbacks(execute=True):
+                models.Project.objects.create(title="Site", description="")
+        bump.assert_called_once_with(models.Project)
+        publish.assert_called_once_with()
+
+    @override_settings(PORTFOLIO_SNAPSHOT_AUTOPUBLISH=True)
+    def test_savepoint_rollback_keeps_earlier_publish(self):
+        with mock.patch.object(
+            snapshots, "publish_portfolio_snapshot"
+        ) as publish, self.captureOnCommitCallbacks(execute=True):
+            models.Project.objects.create(title="Site", description="")
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                models.Project.objects.create(title="Draft", description="")
+                raise RuntimeError
+        publish.assert_called_once_with()
+
+    def test_rolled_back_registration_is_forgotten(self):
+        rolled_back, committed = mock.Mock(), mock.Mock()
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            signals.once_on_commit("rolled back", rolled_back)
+            raise RuntimeError
+        with self.captureOnCommitCallbacks(execute=True):
+            signals.once_on_commit("committed", committed)
+        rolled_back.assert_not_called()
+        committed.assert_called_once_with()
+
+    def test_runs_in_order_of_latest_registration(self):
+        calls = mock.Mock()
+        with self.captureOnCommitCallbacks(execute=True):
+            signals.once_on_commit("publish", calls.first_publish)
+            signals.once_on_commit("renditions", calls.renditions)
+            signals.once_on_commit("publish", calls.publish)
+        self.assertEqual(
+            calls.mock_calls, [mock.call.renditions(), mock.call.publish()]
+        )
+
+    @override_settings(PORTFOLIO_SNAPSHOT_AUTOPUBLISH=True)
+    def test_reseed_publishes_once(self):
+        media = tempfile.TemporaryDirectory(prefix="content-media-")
+        self.addCleanup(media.cleanup)
+        with override_settings(MEDIA_ROOT=media.name), mock.patch.object(
+            snapshots, "publish_portfolio_snapshot"
+        ) as publish:
+            call_command("seed_portfolio", "--offline", stdout=StringIO())
+            publish.assert_called_once_with()
+            publish.reset_mock()
+            call_command("seed_portfolio", "--offline", stdout=StringIO())
+            publish.assert_not_called()
+
+
+class SeedScaleTests(TemporaryMediaMixin, TestCase):
+    def seed(self):
+        call_command(
+            "seed_portfolio",
+            "--scale",
+            "5",
+            "--offline",
+            "--image-pool",
+            "2",
+            stdout=StringIO(),
+        )
+        synthetic = models.Project.objects.filter(subtitle="Synthetic")
+        return {
+            "projects": synthetic.count(),
+            "project_tech": models.ProjectTech.objects.filter(
+                project__in=synthetic
+            ).count(),
+            "project_images": models.ProjectImage.objects.filter(
+                project__in=synthetic
+            ).count(),
+            "skill_items": models.SkillItem.objects.filter(
+                description="Synthetic skill description."
+            ).count(),
+            "testimonials": models.Testimonial.objects.filter(
+                author_role="Synthetic"
+            ).count(),
+            "contact_messages": models.ContactMessage.objects.filter(
+                project="Synthetic enquiry"
+            ).count(),
+            "all": {
+                model.__name__: model.objects.count()
+                for model in (*snapshots.PORTFOLIO_MODELS, models.ContactMessage)
+            },
+        }
+
+    def test_documented_counts_and_rerun(self):
+        first = self.seed()
+        self.assertEqual(
+            {name: count for name, count in first.items() if name != "all"},
+            {
+                "projects": 5,
+                "project_tech": 25,
+                "project_images": 15,
+                # N/20 categories, at least one, of 20 skills.
+                "skill_items": 20,
+                "testimonials": 5,
+                "contact_messages": 50,
+            },
+        )
+        self.assertEqual(self.seed(), first)
+
+
+class PortfolioSnapshotTests(TestCase):
+    url = "/api/portfolio/"
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.enterContext(mock.patch.object(instrumentation.logger, "disabled", True))
+        with self.captureOnCommitCallbacks(execute=True):
+            seed_dataset(projects=2)
+
+    def get(self, **params):
+        return self.client.get(self.url, params, HTTP_ACCEPT_ENCODING="identity")
+
+    def edit_testimonial(self, quote):
+        with self.captureOnCommitCallbacks(execute=True):
+            testimonial = models.Testimonial.objects.first()
+            testimonial.quote = quote
+            testimonial.save()
+
+    def section_spans(self, response):
+        return [
+            entry.split(";")[0]
+            for entry in response["Server-Timing"].split(", ")
+            if entry.startswith("section.")
+        ]
+
+    def test_save_changes_output(self):
+        self.assertNotIn("Edited quote", self.get().json()["testimonials"][0]["quote"])
+        self.edit_testimonial("Edited quote")
+        self.assertEqual(self.get().json()["testimonials"][0]["quote"], "Edited quote")
+
+    def test_sections(self):
+        response = self.get(sections="testimonials, site")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.json()), ["site", "testimonials"])
+        self.assertEqual(list(self.get(sections="").json()), list(snapshots.SECTIONS))
+
+        response = self.get(sections="site,unknown")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("unknown", response.json()["detail"])
+
+    def test_edit_rerenders_only_its_section(self):
+        first = self.get()
+        self.assertEqual(
+            sorted(self.section_spans(first)),
+            sorted(f"section.{name}" for name in snapshots.SECTIONS),
+        )
+        self.assertEqual(self.section_spans(self.get()), [])
+
+        self.edit_testimonial("Edited quote")
+        self.assertEqual(self.section_spans(self.get()), ["section.testimonials"])
+
+    @override_settings(PORTFOLIO_PUBLIC_URL="http://testserver")
+    def test_worker_warmup(self):
+        deploy = settings.BASE_DIR.parent / "deploy"
+        for conf in ("gunicorn.conf.py", "gunicorn.asgi.conf.py"):
+            with self.subTest(conf=conf):
+                cache.clear()
+                runpy.run_path(str(deploy / conf))["post_worker_init"](None)
+                with self.assertNumQueries(0):
+                    snapshots.get_portfolio_variants()
+                    for name in snapshots.SECTIONS:
+                        snapshots.get_portfolio_variants(sections=[name])
+                # Only the conditional GET validator query runs.
+                with self.assertNumQueries(1):
+                    response = self.get()
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(self.section_spans(response), [])
+
+    def test_media_urls_use_public_url(self):
+        with override_settings(PORTFOLIO_PUBLIC_URL="https://ananthu.online"):
+            cover = self.get(sections="projects").json()["projects"][0]["cover_image"]
+        self.assertTrue(cover.startswith("https://ananthu.online/media/"), cover)
+
+        with override_settings(PORTFOLIO_PUBLIC_URL=None):
+            cover = self.get(sections="projects").json()["projects"][0]["cover_image"]
+            self.assertTrue(cover.startswith("http://testserver/media/"), cover)
+            # Without a request there is no host to fall back to.
+            with self.assertRaises(ImproperlyConfigured):
+                snapshots.publish_portfolio_snapshot()
+
+
+@override_settings(PORTFOLIO_PUBLIC_URL="https://ananthu.online")
+class PublishSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        directory = tempfile.TemporaryDirectory(prefix="content-static-")
+        self.addCleanup(directory.cleanup)
+        self.static_root = Path(directory.name)
+        self.enterContext(
+            override_settings(
+                STATIC_ROOT=self.static_root,
+                PORTFOLIO_SNAPSHOT_ROOT=self.static_root / "api",
+            )
+        )
+        seed_dataset(projects=2)
+
+    def publish(self, quote):
+        models.Testimonial.objects.update(quote=quote)
+        snapshots.bump_section_versions(models.Testimonial)
+        path = snapshots.publish_portfolio_snapshot(keep=2)
+        # Hashed files are pruned by mtime: age this one so the next publish is
+        # newer even on a coarse clock.
+        stamp = time.time() - 100 + len(list(path.parent.glob("portfolio.*.json")))
+        os.utime(path, (stamp, stamp))
+        return path
+
+    def test_files_round_trip_and_prune(self):
+        paths = [self.publish(f"Quote {index}") for index in range(3)]
+        latest = paths[-1]
+        self.assertEqual(latest.parent, self.static_root / "api")
+
+        content = latest.read_bytes()
+        published = latest.with_name(snapshots.PUBLISHED_SNAPSHOT_NAME)
+        self.assertEqual(published.read_bytes(), content)
+        payload = json.loads(content)
+        self.assertEqual(list(payload), list(snapshots.SECTIONS))
+        self.assertEqual(payload["testimonials"][0]["quote"], "Quote 2")
+        self.assertTrue(
+            payload["projects"][0]["cover_image"].startswith("https://ananthu.online/")
+        )
+        for path in (latest, published):
+            with self.subTest(path=path.name):
+                gz = path.with_name(path.name + ".gz")
+                self.assertEqual(gzip.decompress(gz.read_bytes()), content)
+                if compression.brotli:
+                    br = path.with_name(path.name + ".br")
+                    decoded = compression.brotli.decompress(br.read_bytes())
+                    self.assertEqual(decoded, content)
+
+        self.assertEqual(
+            sorted(path.name for path in latest.parent.glob("portfolio.*.json")),
+            sorted(path.name for path in paths[1:]),
+        )
+        for suffix in ("", ".gz", ".br"):
+            self.assertFalse(paths[0].with_name(paths[0].name + suffix).exists())
+
+
+class CompressionTests(SimpleTestCase):
+    def setUp(self):
+        self.content = json.dumps({"quote": "Great work. " * 100}).encode()
+        self.variants = compression.compress_variants(self.content)
+
+    def respond(self, accept_encoding, variants=None):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return compression.encoded_response(request, variants or self.variants)
+
+    def decode(self, response):
+        encoding = response.headers.get("Content-Encoding")
+        if encoding == "br":
+            return compression.brotli.decompress(response.content)
+        if encoding == "gzip":
+            return gzip.decompress(response.content)
+        return response.content
+
+    def test_negotiation(self):
+        cases = [
+            ("gzip, deflate, br", "br" if compression.brotli else "gzip"),
+            ("gzip", "gzip"),
+            ("identity", None),
+            ("", None),
+            ("br;q=0, gzip", "gzip"),
+            ("gzip;q=0", None),
+            ("*", "br" if compression.brotli else "gzip"),
+            ("*;q=0", None),
+        ]
+        for accept_encoding, expected in cases:
+            with self.subTest(accept_encoding=accept_encoding):
+                response = self.respond(accept_encoding)
+                self.assertEqual(response.headers.get("Content-Encoding"), expected)
+                self.assertEqual(response["Vary"], "Accept-Encoding")
+                self.assertEqual(self.decode(response), self.content)
+
+    def test_small_bodies_are_not_compressed(self):
+        variants = compression.compress_variants(b'{"ok":true}')
+        self.assertEqual(list(variants), [compression.IDENTITY])
+        response = self.respond("gzip, br", variants)
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.enterContext(mock.patch.object(instrumentation.logger, "disabled", True))
+
+    def collect(self, url, field):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append([row[field] for row in response.json()["results"]])
+            url = response.json()["next"]
+        return pages
+
+    def test_duplicate_order_values(self):
+        # Inserted out of id order within each order value.
+        for name, order in [("e", 1), ("a", 0), ("b", 0), ("f", 1), ("c", 0)]:
+            models.Testimonial.objects.create(author_name=name, quote="", order=order)
+        pages = self.collect("/api/testimonials/?limit=2", "author_name")
+        self.assertEqual(pages, [["a", "b"], ["c", "e"], ["f"]])
+
+    def test_invalid_cursor(self):
+        for cursor in (
+            "not base64!",
+            encode_cursor([0]),
+            encode_cursor([0, 1, 2]),
+            encode_cursor(["0", 1]),
+            "e30",  # {}
+        ):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(
+                    "/api/testimonials/", {"cursor": cursor, "limit": 2}
+                )
+                self.assertEqual(response.status_code, 404)
+
+    def test_gallery(self):
+        project = models.Project.objects.create(title="Site", description="")
+        for caption in ("one", "two", "three"):
+            models.ProjectImage.objects.create(
+                project=project, image=f"projects/{caption}.jpg", caption=caption
+            )
+        url = f"/api/projects/{project.pk}/gallery/"
+        for engine in ("drf", "fast"):
+            with self.subTest(engine=engine), override_settings(
+                CONTENT_SERIALIZER_ENGINE=engine
+            ):
+                self.assertEqual(
+                    self.collect(f"{url}?limit=2", "caption"),
+                    [["one", "two"], ["three"]],
+                )
+                response = self.client.get(url)
+                self.assertEqual(
+                    [image["caption"] for image in response.json()],
+                    ["one", "two", "three"],
+                )
+        self.assertEqual(
+            self.client.get(f"/api/projects/{project.pk + 1}/gallery/").status_code,
+            404,
+        )
+
+
+class ConditionalGetTests(TestCase):
+    url = "/api/projects/"
+
+    def setUp(self):
+        self.enterContext(mock.patch.object(instrumentation.logger, "disabled", True))
+        seed_dataset(projects=2)
+
+    def test_if_none_match(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        # Only the validator query runs; the serializer's never do.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_if_modified_since(self):
+        response = self.client.get(self.url)
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                self.url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+            )
+        self.assertEqual(response.status_code, 304)
+
+    def test_not_modified_repeats_vary(self):
+        for urlconf in ("backend.urls", "backend.asgi_urls"):
+            with self.subTest(urlconf=urlconf), override_settings(ROOT_URLCONF=urlconf):
+                headers = {"accept-encoding": "gzip", "origin": "https://example.com"}
+                response = self.client.get("/api/portfolio/", headers=headers)
+                self.assertEqual(response.status_code, 200)
+                response = self.client.get(
+                    "/api/portfolio/",
+                    headers={**headers, "if-none-match": response["ETag"]},
+                )
+                self.assertEqual(response.status_code, 304)
+                vary = {field.strip() for field in response["Vary"].split(",")}
+                self.assertIn("Accept-Encoding", vary)
+
+    def test_delete_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        # The oldest row: MAX(updated_at) stays put, only the count changes.
+        models.ProjectTech.objects.order_by("updated_at", "pk").first().delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+@override_settings(PORTFOLIO_PUBLIC_URL="http://testserver")
+class AsgiUrlTests(TestCase):
+    def setUp(self):
+        self.enterContext(mock.patch.object(instrumentation.logger, "disabled", True))
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def assertSameResponses(self, *paths):
+        for path in paths:
+            responses = []
+            for urlconf in ("backend.urls", "backend.asgi_urls"):
+                with self.subTest(path=path), override_settings(ROOT_URLCONF=urlconf):
+                    responses.append(
+                        self.client.get(path, headers={"accept": "application/json"})
+                    )
+            with self.subTest(path=path):
+                self.assertEqual(responses[0].status_code, responses[1].status_code)
+                self.assertEqual(responses[0].json(), responses[1].json())
+
+    def test_api_root_matches(self):
+        self.assertSameResponses("/api/")
+
+    def test_missing_singletons_match(self):
+        self.assertSameResponses("/api/site-settings/", "/api/about/", "/api/footer/")
+
+    def test_lists_and_details_match(self):
+        models.Footer.objects.create(tagline="Built with Django")
+        project = models.Project.objects.create(title="Site", description="")
+        models.ProjectTech.objects.create(project=project, name="Django", order=0)
+        models.Testimonial.objects.create(author_name="Ada", quote="Great.")
+        for engine in ("drf", "fast"):
+            with override_settings(CONTENT_SERIALIZER_ENGINE=engine):
+                self.assertSameResponses(
+                    "/api/footer/",
+                    "/api/projects/",
+                    "/api/projects/?limit=1",
+                    f"/api/projects/{project.pk}/",
+                    f"/api/projects/{project.pk + 1}/",
+                    f"/api/projects/{project.pk}/gallery/?limit=1",
+                    "/api/testimonials/",
+                    "/api/skills/",
+                )
+
+    @override_settings(ROOT_URLCONF="backend.asgi_urls")
+    def test_detail_deleted_while_serving(self):
+        project = models.Project.objects.create(title="Site", description="")
+        # The row is gone by the time the serializer queries it.
+        with mock.patch.object(viewsets, "serialize_many", return_value=[]):
+            response = self.client.get(f"/api/projects/{project.pk}/")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            response.json(), {"detail": "No Project matches the given query."}
+        )
+
+    @override_settings(
+        CONTENT_SERIALIZER_ENGINE="drf", ROOT_URLCONF="backend.asgi_urls"
+    )
+    def test_drf_engine_is_honoured(self):
+        project = models.Project.objects.create(title="Site", description="")
+        with mock.patch.object(
+            serializers.ProjectSerializer,
+            "to_representation",
+            autospec=True,
+            side_effect=serializers.ProjectSerializer.to_representation,
+        ) as to_representation:
+            self.client.get(f"/api/projects/{project.pk}/")
+            self.client.get("/api/projects/?limit=1")
+        self.assertEqual(to_representation.call_count, 2)
+
+
+class MetricsAccessTests(TestCase):
+    def setUp(self):
+        self.enterContext(mock.patch.object(instrumentation.logger, "disabled", True))
+
+    def test_local_scrape(self):
+        response = self.client.get("/metrics", REMOTE_ADDR="127.0.0.1")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+
+    def test_remote_and_proxied_requests_are_refused(self):
+        self.assertEqual(
+            self.client.get("/metrics", REMOTE_ADDR="203.0.113.5").status_code, 403
+        )
+        response = self.client.get(
+            "/metrics", REMOTE_ADDR="127.0.0.1", HTTP_X_FORWARDED_FOR="203.0.113.5"
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_staff_from_anywhere(self):
+        user = get_user_model().objects.create_user("ops", is_staff=True)
+        self.client.force_login(user)
+        self.assertEqual(
+            self.client.get("/metrics", REMOTE_ADDR="203.0.113.5").status_code, 200
+        )
+
+
+class MetricsCollectTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory(prefix="content-metrics-")
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.enterContext(override_settings(METRICS_DIR=self.directory))
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def write(self, pid, value):
+        buckets = [1] + [0] * (len(metrics.BUCKETS) - 1)
+        histogram = {"buckets": buckets, "sum": 0.001, "count": 1}
+        payload = {
+            "counters": [["jobs_total", [], value]],
+            "histograms": [["job_seconds", [], histogram]],
+        }
+        with open(os.path.join(self.directory, f"{pid}.json"), "w") as handle:
+            json.dump(payload, handle)
+
+    def test_files_of_exited_processes_are_archived(self):
+        process = multiprocessing.get_context("fork").Process(target=int)
+        process.start()
+        process.join()
+        self.write(process.pid, 5)
+        self.write(os.getppid(), 2)
+        metrics.increment("jobs_total")
+
+        for _ in range(2):
+            counters, histograms = metrics.collect()
+            self.assertEqual(counters[("jobs_total", ())], 8)
+            self.assertEqual(histograms[("job_seconds", ())]["count"], 2)
+        self.assertFalse(
+            os.path.exists(os.path.join(self.directory, f"{process.pid}.json"))
+        )
+        self.assertTrue(os.path.exists(os.path.join(self.directory, metrics.ARCHIVE)))
+
+
+@override_settings(SERVER_TIMING_HEADER=True)
+class ServerTimingAccessTests(TestCase):
+    url = "/api/projects/"
+
+    def setUp(self):
+        self.enterContext(mock.patch.object(instrumentation.logger, "disabled", True))
+
+    def test_local_requests_get_timings(self):
+        response = self.client.get(self.url, REMOTE_ADDR="127.0.0.1")
+        self.assertIn("db;dur=", response["Server-Timing"])
+
+    def test_visitors_do_not(self):
+        for headers in (
+            {"REMOTE_ADDR": "203.0.113.5"},
+            {"REMOTE_ADDR": "127.0.0.1", "HTTP_X_FORWARDED_FOR": "203.0.113.5"},
+        ):
+            with self.subTest(**headers), mock.patch.object(
+                instrumentation.logger, "disabled", False
+            ), self.assertLogs(instrumentation.logger, "INFO") as logs:
+                response = self.client.get(self.url, **headers)
+                # The request log line is still written for every request.
+                self.assertIn('"db_queries"', logs.output[0])
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn("Server-Timing", response)
+
+    def test_staff_from_anywhere(self):
+        user = get_user_model().objects.create_user("ops", is_staff=True)
+        self.client.force_login(user)
+        for urlconf in ("backend.urls", "backend.asgi_urls"):
+            with self.subTest(urlconf=urlconf), override_settings(ROOT_URLCONF=urlconf):
+                response = self.client.get(self.url, REMOTE_ADDR="203.0.113.5")
+                self.assertIn("Server-Timing", response)
+
+    @override_settings(SERVER_TIMING_HEADER=False)
+    def test_disabled(self):
+        response = self.client.get(self.url, REMOTE_ADDR="127.0.0.1")
+        self.assertNotIn("Server-Timing", response)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    PROFILING_ENABLED=True,
+    PROFILING_DIR=None,
+    PROFILING_USER_LIMIT=5,
+    PROFILING_SITE_LIMIT=20,
+)
+class ProfilingAccessTests(TestCase):
+    url = "/api/projects/?profile=1"
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.enterContext(mock.patch.object(instrumentation.logger, "disabled", True))
+        self.users = get_user_model().objects
+
+    def assertNotProfiled(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Profile-Status", response)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_anonymous_and_non_staff_are_ignored(self):
+        self.assertNotProfiled(self.client.get(self.url))
+        self.client.force_login(self.users.create_user("visitor"))
+        self.assertNotProfiled(self.client.get(self.url))
+
+    @override_settings(PROFILING_ENABLED=False)
+    def test_disabled(self):
+        self.client.force_login(self.users.create_user("ops", is_staff=True))
+        self.assertNotProfiled(self.client.get(self.url))
+
+    def test_staff_is_throttled(self):
+        self.client.force_login(self.users.create_user("ops", is_staff=True))
+        for _ in range(5):
+            response = self.client.get(self.url)
+            self.assertEqual(response["X-Profile-Status"], "200")
+            self.assertIn("attachment;", response["Content-Disposition"])
+        response = self.client.get(self.url)
+        self.assertNotProfiled(response)
+        self.assertEqual(response["X-Profile-Skipped"], "user-throttled")
+
+
+class SlowQueryLogTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory(prefix="content-slowlog-")
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "slow-queries.log")
+        handler = slowlog.SlowQueryFileHandler(self.path, delay=True)
+        self.addCleanup(handler.close)
+        self.enterContext(mock.patch.object(slowlog.logger, "handlers", [handler]))
+
+    def records(self):
+        with open(self.path, encoding="utf-8") as handle:
+            return [json.loads(line) for line in handle]
+
+    def test_slow_select_is_logged_and_reported(self):
+        with override_settings(SLOW_QUERY_MS=0.000001):
+            models.Project.objects.filter(title="Site").count()
+        (record,) = self.records()
+        self.assertIn('FROM "content_project"', record["sql"])
+        self.assertEqual(record["params"], ["<str:4>"])
+        self.assertTrue(record["plan"])
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o640)
+
+        stdout = StringIO()
+        call_command("slow_query_report", "--log", self.path, stdout=stdout)
+        self.assertIn("1 run(s)", stdout.getvalue())
+        self.assertIn('FROM "content_project"', stdout.getvalue())
+        self.assertIn("plan:", stdout.getvalue())
+
+    def test_slow_write_is_logged_without_plan(self):
+        with override_settings(SLOW_QUERY_MS=0.000001), mock.patch.object(
+            slowlog, "explain"
+        ) as explain:
+            models.Footer.objects.create(tagline="Built with Django")
+        (record,) = self.records()
+        self.assertTrue(record["sql"].startswith('INSERT INTO "content_footer"'))
+        self.assertEqual(record["plan"], [])
+        explain.assert_not_called()
+
+    @override_settings(SLOW_QUERY_MS=0.000001, SLOW_QUERY_LOG_PARAMS=True)
+    def test_raw_params_on_request(self):
+        models.Project.objects.filter(title="Site").count()
+        (record,) = self.records()
+        self.assertEqual(record["params"], ["Site"])
+
+    def test_explain_is_not_counted_for_the_request(self):
+        timings = instrumentation.RequestTimings()
+        token = instrumentation._current.set(timings)
+        self.addCleanup(instrumentation._current.reset, token)
+        with override_settings(SLOW_QUERY_MS=0.000001):
+            models.Project.objects.filter(title="Site").count()
+        (record,) = self.records()
+        self.assertTrue(record["plan"])
+        self.assertEqual(timings.db_queries, 1)
+
+    def test_fast_queries_are_not_logged(self):
+        with override_settings(SLOW_QUERY_MS=10_000):
+            models.Project.objects.count()
+        self.assertFalse(os.path.exists(self.path))
+
+
+class ContactSpoolTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory(prefix="content-spool-")
+        self.addCleanup(directory.cleanup)
+        self.enterContext(
+            override_settings(
+                CONTACT_SPOOL_DIR=directory.name, CONTACT_NOTIFICATION_EMAILS=[]
+            )
+        )
+        self.data = {
+            "name": "Ada",
+            "email": "ada@example.com",
+            "project": "Website",
+            "message": "Hello!",
+        }
+
+    def spooled(self, name):
+        return sorted(path.name for path in spool._spool_dir(name).iterdir())
+
+    def test_enqueue(self):
+        path = spool.enqueue_contact_message("10.0.0.1", self.data)
+        self.assertEqual(self.spooled(spool.NEW), [path.name])
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        self.assertEqual(payload["ip_address"], "10.0.0.1")
+        self.assertEqual(payload["message"], "Hello!")
+
+    def test_ingest_keeps_submission_time(self):
+        path = spool.enqueue_contact_message("10.0.0.1", self.data)
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload["submitted_at"] -= 3600
+        path.write_text(json.dumps(payload), encoding="utf-8")
+        broken = spool._spool_dir(spool.NEW) / "0-broken.json"
+        broken.write_text("{}", encoding="utf-8")
+
+        messages = spool.ingest_batch()
+
+        self.assertEqual(len(messages), 1)
+        message = models.ContactMessage.objects.get()
+        self.assertEqual(message.ip_address, "10.0.0.1")
+        self.assertLess(message.created_at, timezone.now() - timedelta(minutes=59))
+        self.assertEqual(self.spooled(spool.NEW), [])
+        self.assertEqual(self.spooled(spool.PROCESSING), [])
+        self.assertEqual(self.spooled(spool.FAILED), [broken.name])
+
+    def test_bad_row_does_not_block_batch(self):
+        spool.enqueue_contact_message("10.0.0.1", self.data)
+        bad = spool.enqueue_contact_message("10.0.0.2", dict(self.data, name=None))
+
+        messages = spool.ingest_batch()
+
+        self.assertEqual([message.ip_address for message in messages], ["10.0.0.1"])
+        self.assertEqual(models.ContactMessage.objects.get().ip_address, "10.0.0.1")
+        self.assertEqual(self.spooled(spool.FAILED), [bad.name])
+        self.assertEqual(self.spooled(spool.NEW), [])
+        self.assertEqual(self.spooled(spool.PROCESSING), [])
+
+    def test_digest(self):
+        spool.enqueue_contact_message("10.0.0.1", self.data)
+        spool.enqueue_contact_message("10.0.0.2", dict(self.data, name="Grace"))
+        messages = spool.ingest_batch()
+        with override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+            CONTACT_NOTIFICATION_EMAILS=["owner@example.com", "ops@example.com"],
+        ):
+            self.assertEqual(spool.send_digest(messages), 1)
+
+        (email,) = mail.outbox
+        self.assertEqual(email.to, ["owner@example.com", "ops@example.com"])
+        self.assertEqual(email.subject, "2 new contact message(s)")
+        self.assertIn("From: Ada <ada@example.com>", email.body)
+        self.assertIn("From: Grace <ada@example.com>", email.body)
+        self.assertIn("IP: 10.0.0.2", email.body)
+        self.assertIn("Hello!", email.body)
+
+    def test_no_digest_without_recipients(self):
+        spool.enqueue_contact_message("10.0.0.1", self.data)
+        self.assertEqual(spool.send_digest(spool.ingest_batch()), 0)
+        self.assertEqual(mail.outbox, [])
+
+    def test_requeue_stale(self):
+        spool.enqueue_contact_message("10.0.0.1", self.data)
+        spool.enqueue_contact_message("10.0.0.2", self.data)
+        stale, fresh = spool.claim_batch(2)
+        old = time.time() - 600
+        os.utime(stale, (old, old))
+
+        self.assertEqual(spool.requeue_stale(max_age=300), 1)
+        self.assertEqual(self.spooled(spool.NEW), [stale.name])
+        self.assertEqual(self.spooled(spool.PROCESSING), [fresh.name])
+
+    def test_command_requeues_and_ingests(self):
+        spool.enqueue_contact_message("10.0.0.1", self.data)
+        (claimed,) = spool.claim_batch(1)
+        old = time.time() - 600
+        os.utime(claimed, (old, old))
+
+        stdout = StringIO()
+        call_command("process_contact_spool", "--once", stdout=stdout)
+
+        self.assertIn("Requeued 1", stdout.getvalue())
+        self.assertEqual(models.ContactMessage.objects.count(), 1)
+        self.assertEqual(self.spooled(spool.PROCESSING), [])
+
+
+def _write_storm_worker(path, worker, writes_per_worker, results):
+    # Forked from the test runner: point the inherited connection at the
+    # shared file and fail fast on the lock so the retry path is exercised.
+    connection.settings_dict["NAME"] = path
+    connection.settings_dict["OPTIONS"] = {
+        "timeout": 0,
+        "transaction_mode": "IMMEDIATE",
+    }
+    connection.close()
+    metrics.reset()
+    try:
+        with override_settings(
+            SQLITE_PRAGMAS={"journal_mode": "WAL", "busy_timeout": 0},
+            DATABASE_WRITE_ATTEMPTS=200,
+            DATABASE_WRITE_BACKOFF=0.002,
+            DATABASE_WRITE_BACKOFF_MAX=0.05,
+        ):
+            for index in range(writes_per_worker):
+                writes.serialized_write(
+                    lambda: models.ContactMessage.objects.create(
+                        name=f"Worker {worker}",
+                        email="storm@example.com",
+                        project="Write storm",
+                        message=f"Message {index}",
+                        ip_address=f"10.0.{worker}.{index}",
+                    ),
+                    name="contact",
+                )
+    except Exception as exc:
+        results.put((worker, repr(exc), {}))
+    else:
+        results.put((worker, None, metrics.snapshot()))
+    finally:
+        connection.close()
+
+
+@skipUnless(connection.vendor == "sqlite", "exercises SQLite file locking")
+class WriteStormTests(TransactionTestCase):
+    """Concurrent writer processes all land their rows through the retries."""
+
+    workers = 6
+    writes_per_worker = 30
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory(prefix="content-write-storm-")
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "storm.sqlite3")
+        with connection.schema_editor(collect_sql=True, atomic=False) as editor:
+            editor.create_model(models.ContactMessage)
+        with sqlite3.connect(self.path) as database:
+            database.executescript(";\n".join(editor.collected_sql))
+
+    def test_concurrent_contact_writes(self):
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        processes = [
+            context.Process(
+                target=_write_storm_worker,
+                args=(self.path, worker, self.writes_per_worker, results),
+            )
+            for worker in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+        reports = [results.get(timeout=60) for _ in processes]
+        for process in processes:
+            process.join(timeout=10)
+
+        for worker, error, counters in reports:
+            self.assertIsNone(error, f"worker {worker} failed")
+            key = ("db_writes_total", (("operation", "contact"),))
+            self.assertEqual(counters[key], self.writes_per_worker)
+            self.assertNotIn(("db_write_failures_total", key[1]), counters)
+        with sqlite3.connect(self.path) as database:
+            (stored,) = database.execute(
+                f"SELECT COUNT(*) FROM {models.ContactMessage._meta.db_table}"
+            ).fetchone()
+        self.assertEqual(stored, self.workers * self.writes_per_worker)
+
+
+class BenchmarkApiTests(SimpleTestCase):
+    def test_results_file(self):
+        directory = tempfile.TemporaryDirectory(prefix="content-benchmark-")
+        self.addCleanup(directory.cleanup)
+        output = Path(directory.name) / "results.json"
+        # A separate process: the benchmark swaps the default database out.
+        subprocess.run(
+            [
+                sys.executable,
+                "manage.py",
+                "benchmark_api",
+                "--projects=2",
+                "--contact-messages=3",
+                "--requests=2",
+                "--mode=warm",
+                f"--output={output}",
+            ],
+            cwd=settings.BASE_DIR,
+            check=True,
+            capture_output=True,
+        )
+        results = json.loads(output.read_text())
+
+        self.assertEqual(results["meta"]["requests_per_endpoint"], 2)
+        endpoints = results["endpoints"]["warm"]
+        self.assertIn("portfolio-content", endpoints)
+        self.assertIn("contact-messages", endpoints)
+        for name, result in endpoints.items():
+            with self.subTest(endpoint=name):
+                for metric in ("latency_ms", "queries", "db_time_ms"):
+                    self.assertEqual(result[metric]["count"], 2)
+                    self.assertLessEqual(result[metric]["p50"], result[metric]["p95"])
+                self.assertGreater(result["queries"]["p50"], 0)
+        self.assertEqual(set(results["serialization_ms"]), {"drf", "fast"})
+
+    def test_compare_flags_regression(self):
+        def results(**p95):
+            return {
+                "endpoints": {
+                    "warm": {
+                        name: {"latency_ms": benchmark_api.summarize([value])}
+                        for name, value in p95.items()
+                    }
+                }
+            }
+
+        baseline = results(about=10.0, footer=4.0)
+        current = results(about=15.0, footer=4.0, projects=1.0)
+        self.assertEqual(
+            benchmark_api.compare(baseline, current),
+            [("warm", "about", 10.0, 15.0, 0.5), ("warm", "footer", 4.0, 4.0, 0.0)],
+        )
@@ -20,5 +20,15 @@ urlpatterns = [
         views.ContactMessageAPIView.as_view(),
         name="contact-messages",
     ),
+    path(
+        "resumes/<str:resume_type>/download/",
+        views.ResumeDownloadView.as_view(),
+        name="resume-download-latest",
+    ),
+    path(
+        "resumes/<str:resume_type>/download/<str:digest>/",
+        views.ResumeDownloadView.as_view(),
+        name="resume-download",
+    ),
 ] + router.urls
 
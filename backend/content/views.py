@@ -1,60 +1,55 @@
 from datetime import timedelta
 
-from django.utils import timezone
+from django.conf import settings
+from django.db import OperationalError
+from django.http import HttpResponse, HttpResponseForbidden
+from django.shortcuts import get_object_or_404, redirect
+from django.views import View
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from . import models, serializers
+from . import (
+    compression,
+    downloads,
+    instrumentation,
+    metrics,
+    models,
+    ratelimit,
+    serializers,
+    snapshots,
+    spool,
+    writes,
+)
+from .conditional import ConditionalGetMixin
 
 
-class PortfolioContentAPIView(APIView):
+class PortfolioContentAPIView(ConditionalGetMixin, APIView):
     """
     Aggregate endpoint returning all portfolio content needed by the frontend.
+
+    Pass ``?sections=site,navigation`` to fetch a subset of the top-level
+    keys; each section is cached and invalidated independently.
     """
 
+    conditional_vary = compression.VARY
+
+    def get_conditional_models(self, request) -> tuple:
+        try:
+            sections = snapshots.parse_sections(request.GET.get("sections"))
+        except ValueError:
+            return ()
+        return snapshots.get_models_for_sections(sections)
+
     def get(self, request):
-        site_settings = models.SiteSettings.objects.first()
-        about_section = models.AboutSection.objects.first()
-        footer = models.Footer.objects.first()
-
-        data = {
-            "site": serializers.SiteSettingsSerializer(
-                site_settings, context={"request": request}
-            ).data
-            if site_settings
-            else None,
-            "navigation": serializers.NavigationLinkSerializer(
-                models.NavigationLink.objects.all(), many=True
-            ).data,
-            "about": serializers.AboutSectionSerializer(
-                about_section, context={"request": request}
-            ).data
-            if about_section
-            else None,
-            "skills": serializers.SkillCategorySerializer(
-                models.SkillCategory.objects.prefetch_related("skills").all(),
-                many=True,
-                context={"request": request},
-            ).data,
-            "projects": serializers.ProjectSerializer(
-                models.Project.objects.prefetch_related("tech", "gallery_images").all(),
-                many=True,
-                context={"request": request},
-            ).data,
-            "testimonials": serializers.TestimonialSerializer(
-                models.Testimonial.objects.all(), many=True
-            ).data,
-            "social_links": serializers.SocialLinkSerializer(
-                models.SocialLink.objects.all(), many=True
-            ).data,
-            "footer": serializers.FooterSerializer(footer).data if footer else None,
-            "resumes": serializers.ResumeSerializer(
-                models.Resume.objects.all(), many=True, context={"request": request}
-            ).data,
-        }
-        return Response(data)
+        try:
+            sections = snapshots.parse_sections(request.query_params.get("sections"))
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return compression.encoded_response(
+            request, snapshots.get_portfolio_variants(sections, request=request)
+        )
 
 
 class ContactMessageAPIView(APIView):
@@ -71,12 +66,16 @@ class ContactMessageAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        window_start = timezone.now() - self.rate_limit_window
-        recent_count = models.ContactMessage.objects.filter(
-            ip_address=client_ip, created_at__gte=window_start
-        ).count()
+        limiter = ratelimit.get_contact_rate_limiter(
+            self.rate_limit_per_ip, self.rate_limit_window
+        )
+        serializer = serializers.ContactMessageSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-        if recent_count >= self.rate_limit_per_ip:
+        # Checked and counted in one step, so concurrent submissions from one
+        # IP cannot all pass on the same count.
+        if not limiter.acquire(client_ip):
+            metrics.increment("contact_rate_limited_total")
             return Response(
                 {
                     "detail": "Too many submissions from this IP. Please try again later."
@@ -84,12 +83,23 @@ class ContactMessageAPIView(APIView):
                 status=status.HTTP_429_TOO_MANY_REQUESTS,
             )
 
-        serializer = serializers.ContactMessageSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        models.ContactMessage.objects.create(
-            ip_address=client_ip, **serializer.validated_data
-        )
+        if settings.CONTACT_INGESTION == "spool":
+            spool.enqueue_contact_message(client_ip, serializer.validated_data)
+        else:
+            try:
+                writes.serialized_write(
+                    lambda: models.ContactMessage.objects.create(
+                        ip_address=client_ip, **serializer.validated_data
+                    ),
+                    name="contact",
+                )
+            except OperationalError:
+                limiter.cancel(client_ip)
+                return Response(
+                    {"detail": "Unable to save your message. Please try again."},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    headers={"Retry-After": "5"},
+                )
 
         return Response(
             {"detail": "Message received. I’ll be in touch soon."},
@@ -102,3 +112,52 @@ class ContactMessageAPIView(APIView):
         if header:
             return header.split(",")[0].strip()
         return request.META.get("REMOTE_ADDR")
+
+
+class ResumeDownloadView(View):
+    """
+    Resume PDFs by type. The versioned URL (``resume_url``) is cached for a
+    year; the bare one redirects to it so shared links follow new uploads.
+    """
+
+    def get(self, request, resume_type, digest=None):
+        resume = get_object_or_404(models.Resume, resume_type=resume_type)
+        # Read-only: file_meta is written on save (and backfilled by migration
+        # 0008); a file that could not be hashed has no download.
+        current = downloads.short_digest(resume.file_meta)
+        if current is None:
+            return HttpResponse(status=status.HTTP_404_NOT_FOUND)
+        if digest != current:
+            response = redirect(
+                "resume-download", resume_type=resume_type, digest=current
+            )
+            response["Cache-Control"] = "no-cache"
+            return response
+
+        if request.method == "GET" and downloads.is_first_request(request):
+            metrics.increment("resume_downloads_total", resume_type=resume_type)
+        return downloads.serve_file(
+            request,
+            resume.file,
+            resume.file_meta,
+            filename=f"{resume_type}-resume.pdf",
+            content_type="application/pdf",
+            cache_control=downloads.IMMUTABLE,
+        )
+
+
+def metrics_view(request):
+    """
+    Prometheus text metrics, summed across every worker (``content.metrics``).
+
+    Served to direct connections from the host itself (a scraper or ``curl``
+    on the box, never a request nginx forwarded) and to signed-in staff.
+    """
+    if not (
+        instrumentation.is_local_request(request)
+        or instrumentation.is_staff(request.user)
+    ):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,54 +1,142 @@
+from django.conf import settings
 from rest_framework import generics, viewsets
-
-from . import models, serializers
-
-
-class NavigationLinkViewSet(viewsets.ReadOnlyModelViewSet):
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from . import fast_serializers, instrumentation, models, serializers
+from .conditional import ConditionalGetMixin
+
+
+def serialize_many(rows, request, fast_serializer, serializer_class, context=None):
+    """Render ``rows`` with ``CONTENT_SERIALIZER_ENGINE``, as ``FastListMixin`` does."""
+    if fast_serializer is not None and settings.CONTENT_SERIALIZER_ENGINE == "fast":
+        return fast_serializer(rows, request=request)
+    return serializer_class(
+        rows, many=True, context=context or {"request": request}
+    ).data
+
+
+class FastListMixin:
+    """
+    Serve ``list`` through ``fast_serializer`` when the fast engine is on and
+    time both actions, less their queries, as the request's ``serialize`` span.
+    """
+
+    fast_serializer = None
+
+    def list(self, request, *args, **kwargs):
+        with instrumentation.span("serialize", exclude_db=True):
+            return self._list(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        with instrumentation.span("serialize", exclude_db=True):
+            return super().retrieve(request, *args, **kwargs)
+
+    def _list(self, request, *args, **kwargs):
+        if (
+            self.fast_serializer is None
+            or settings.CONTENT_SERIALIZER_ENGINE != "fast"
+        ):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                self.fast_serializer(page, request=request)
+            )
+        return Response(self.fast_serializer(queryset, request=request))
+
+
+class NavigationLinkViewSet(
+    ConditionalGetMixin, FastListMixin, viewsets.ReadOnlyModelViewSet
+):
     queryset = models.NavigationLink.objects.all()
     serializer_class = serializers.NavigationLinkSerializer
+    conditional_models = (models.NavigationLink,)
+    fast_serializer = staticmethod(fast_serializers.serialize_navigation_links)
 
 
-class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
+class ProjectViewSet(
+    ConditionalGetMixin, FastListMixin, viewsets.ReadOnlyModelViewSet
+):
     queryset = models.Project.objects.prefetch_related("tech", "gallery_images").all()
     serializer_class = serializers.ProjectSerializer
-
-
-class SkillCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+    conditional_models = (models.Project, models.ProjectTech, models.ProjectImage)
+    fast_serializer = staticmethod(fast_serializers.serialize_projects)
+
+    @action(detail=True)
+    def gallery(self, request, pk=None):
+        """The project's gallery on its own, so it can be paged with a cursor."""
+        project = generics.get_object_or_404(models.Project.objects.only("pk"), pk=pk)
+        queryset = models.ProjectImage.objects.filter(project=project)
+        page = self.paginate_queryset(queryset)
+        data = serialize_many(
+            queryset if page is None else page,
+            request,
+            fast_serializers.serialize_project_images,
+            serializers.ProjectImageSerializer,
+            context=self.get_serializer_context(),
+        )
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+
+class SkillCategoryViewSet(
+    ConditionalGetMixin, FastListMixin, viewsets.ReadOnlyModelViewSet
+):
     queryset = models.SkillCategory.objects.prefetch_related("skills").all()
     serializer_class = serializers.SkillCategorySerializer
+    conditional_models = (models.SkillCategory, models.SkillItem)
+    fast_serializer = staticmethod(fast_serializers.serialize_skill_categories)
 
 
-class TestimonialViewSet(viewsets.ReadOnlyModelViewSet):
+class TestimonialViewSet(
+    ConditionalGetMixin, FastListMixin, viewsets.ReadOnlyModelViewSet
+):
     queryset = models.Testimonial.objects.all()
     serializer_class = serializers.TestimonialSerializer
+    conditional_models = (models.Testimonial,)
+    fast_serializer = staticmethod(fast_serializers.serialize_testimonials)
 
 
-class SocialLinkViewSet(viewsets.ReadOnlyModelViewSet):
+class SocialLinkViewSet(
+    ConditionalGetMixin, FastListMixin, viewsets.ReadOnlyModelViewSet
+):
     queryset = models.SocialLink.objects.all()
     serializer_class = serializers.SocialLinkSerializer
+    conditional_models = (models.SocialLink,)
+    fast_serializer = staticmethod(fast_serializers.serialize_social_links)
 
 
-class ResumeViewSet(viewsets.ReadOnlyModelViewSet):
+class ResumeViewSet(
+    ConditionalGetMixin, FastListMixin, viewsets.ReadOnlyModelViewSet
+):
     queryset = models.Resume.objects.all()
     serializer_class = serializers.ResumeSerializer
+    conditional_models = (models.Resume,)
+    fast_serializer = staticmethod(fast_serializers.serialize_resumes)
 
 
-class SiteSettingsView(generics.RetrieveAPIView):
+class SiteSettingsView(ConditionalGetMixin, generics.RetrieveAPIView):
     serializer_class = serializers.SiteSettingsSerializer
+    conditional_models = (models.SiteSettings,)
 
     def get_object(self):
         return models.SiteSettings.objects.first()
 
 
-class AboutSectionView(generics.RetrieveAPIView):
+class AboutSectionView(ConditionalGetMixin, generics.RetrieveAPIView):
     serializer_class = serializers.AboutSectionSerializer
+    conditional_models = (models.AboutSection, models.AboutHighlight)
 
     def get_object(self):
         return models.AboutSection.objects.first()
 
 
-class FooterView(generics.RetrieveAPIView):
+class FooterView(ConditionalGetMixin, generics.RetrieveAPIView):
     serializer_class = serializers.FooterSerializer
+    conditional_models = (models.Footer,)
 
     def get_object(self):
         return models.Footer.objects.first()
@@ -0,0 +1,49 @@
+"""
+Serialized, retried database writes.
+
+SQLite allows a single writer. Writes made through ``serialized_write`` take
+a process-wide lock so threads in one worker queue up instead of contending
+for the database file, and a "database is locked" error caused by another
+process is retried with exponential backoff and full jitter. Attempts,
+retries and failures are counted in ``content.metrics``.
+"""
+
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+
+from . import metrics
+
+_write_lock = threading.Lock()
+
+
+def is_lock_error(exc) -> bool:
+    message = str(exc).lower()
+    return "locked" in message or "busy" in message
+
+
+def serialized_write(operation, name="write"):
+    """Run ``operation()`` in its own transaction under the writer lock."""
+    attempts = max(settings.DATABASE_WRITE_ATTEMPTS, 1)
+    for attempt in range(1, attempts + 1):
+        with _write_lock:
+            try:
+                with transaction.atomic():
+                    result = operation()
+            except OperationalError as exc:
+                if not is_lock_error(exc) or attempt == attempts:
+                    metrics.increment("db_write_failures_total", operation=name)
+                    raise
+                metrics.increment("db_write_retries_total", operation=name)
+            else:
+                metrics.increment("db_writes_total", operation=name)
+                return result
+        # Back off outside the lock so other threads can take their turn.
+        ceiling = min(
+            settings.DATABASE_WRITE_BACKOFF_MAX,
+            settings.DATABASE_WRITE_BACKOFF * 2 ** (attempt - 1),
+        )
+        time.sleep(random.uniform(0, ceiling))
@@ -0,0 +1,36 @@
+"""
+Gunicorn configuration for serving the backend over ASGI with Uvicorn workers.
+
+Run with ``gunicorn -c ../deploy/gunicorn.asgi.conf.py backend.asgi:application``
+from the ``backend`` directory (requires the ``uvicorn`` package). Each worker
+handles many slow clients concurrently on its event loop, so fewer workers
+are needed than with the sync ``gunicorn.conf.py`` setup.
+"""
+
+import logging
+import os
+from pathlib import Path
+
+bind = "0.0.0.0:9090"
+workers = 2
+worker_class = "uvicorn.workers.UvicornWorker"
+keepalive = 5
+
+
+def on_starting(server):
+    # Per-worker metric files (and the archive of exited ones) left by the
+    # previous master: a new master starts its counters from zero.
+    # Django is not set up in the master yet, so read the setting's source.
+    directory = os.environ.get("DJANGO_METRICS_DIR")
+    if directory:
+        for path in Path(directory).glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+def post_worker_init(worker):
+    from content.snapshots import warm_portfolio_cache
+
+    try:
+        warm_portfolio_cache()
+    except Exception:  # pragma: no cover - never block a worker from booting
+        logging.getLogger("gunicorn.error").exception("Portfolio cache warmup failed")
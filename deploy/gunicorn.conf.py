@@ -0,0 +1,34 @@
+"""
+Gunicorn configuration for the Django backend.
+
+Run with ``gunicorn -c ../deploy/gunicorn.conf.py backend.wsgi`` from the
+``backend`` directory (see ``gunicorn.service``).
+"""
+
+import logging
+import os
+from pathlib import Path
+
+bind = "0.0.0.0:9090"
+workers = 3
+
+
+def on_starting(server):
+    # Per-worker metric files (and the archive of exited ones) left by the
+    # previous master: a new master starts its counters from zero.
+    # Django is not set up in the master yet, so read the setting's source.
+    directory = os.environ.get("DJANGO_METRICS_DIR")
+    if directory:
+        for path in Path(directory).glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+def post_worker_init(worker):
+    # Each worker renders the portfolio snapshot before taking traffic, so the
+    # first request after a deploy or worker recycle is served from cache.
+    from content.snapshots import warm_portfolio_cache
+
+    try:
+        warm_portfolio_cache()
+    except Exception:  # pragma: no cover - never block a worker from booting
+        logging.getLogger("gunicorn.error").exception("Portfolio cache warmup failed")
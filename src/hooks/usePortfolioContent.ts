@@ -28,6 +28,17 @@ export type SiteSettings = {
   contact_phone: string;
 };
 
+/** `srcset` strings keyed by format ("avif", "webp", "jpeg"). */
+export type ImageSrcset = Partial<Record<"avif" | "webp" | "jpeg", string>> | null;
+
+/** Intrinsic size, dominant colour and inline placeholder for an image. */
+export type ImageMeta = {
+  width: number;
+  height: number;
+  color: string;
+  placeholder: string;
+} | null;
+
 export type AboutHighlight = {
   title: string;
   description: string;
@@ -42,6 +53,8 @@ export type AboutSection = {
   highlight_quote: string;
   highlight_caption: string;
   profile_image: string | null;
+  profile_image_srcset: ImageSrcset;
+  profile_image_meta: ImageMeta;
   highlights: AboutHighlight[];
 };
 
@@ -49,6 +62,8 @@ export type SkillItem = {
   name: string;
   description: string;
   logo: string | null;
+  logo_srcset: ImageSrcset;
+  logo_meta: ImageMeta;
   logo_url: string;
   order: number;
 };
@@ -68,6 +83,8 @@ export type ProjectTech = {
 
 export type ProjectImage = {
   image: string;
+  image_srcset: ImageSrcset;
+  image_meta: ImageMeta;
   caption: string;
 };
 
@@ -76,6 +93,8 @@ export type Project = {
   subtitle: string;
   description: string;
   cover_image: string | null;
+  cover_image_srcset: ImageSrcset;
+  cover_image_meta: ImageMeta;
   gradient_start: string;
   gradient_end: string;
   live_url: string;
@@ -89,6 +108,9 @@ export type Testimonial = {
   author_name: string;
   author_role: string;
   quote: string;
+  avatar: string | null;
+  avatar_srcset: ImageSrcset;
+  avatar_meta: ImageMeta;
   order: number;
 };
 